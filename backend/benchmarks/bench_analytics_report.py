@@ -0,0 +1,175 @@
+"""
+Benchmark do relatório de kg por material/período/cidade
+
+Compara, para o mesmo intervalo de datas:
+    - varredura: agrega pickup_request_items JOIN pickup_requests JOIN addresses
+      a cada consulta (o único caminho antes dos rollups)
+    - rollups: lê pickup_rollups (totais diários) e agrega semanas/meses com NumPy
+
+Os dois caminhos precisam gerar o mesmo relatório. Cria usuários, endereços,
+materiais e coletas próprios no banco da DATABASE_URL (com os rollups
+atualizados pelo PickupRollupService) e os remove ao final; use um banco de
+desenvolvimento.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_analytics_report --pickups 100000 --days 365
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select
+
+from src.database.async_connection import AsyncSessionLocal, async_engine
+from src.database.connection import create_database
+from src.models import models
+from src.services.pickup_analytics import PickupRollupService, aggregate_report, rollup_source_select
+
+STATUSES = ("PENDENTE", "ACEITA", "COLETADA", "ENTREGUE", "CANCELADA")
+BATCH = 2000
+
+
+async def _seed(pickups: int, days: int, cities: int, materials: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    tag = uuid.uuid4().hex[:8]
+    producer_id = models.generate_uuid()
+    address_rows = [
+        {"id": models.generate_uuid(), "user_id": producer_id, "city": f"bench-{tag}-{index}"}
+        for index in range(cities)
+    ]
+    material_rows = [{"id": models.generate_uuid(), "type": f"bench-{tag}-{index}"} for index in range(materials)]
+    start = datetime(2025, 1, 1, 8, 0)
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(models.User), [
+            {"id": producer_id, "name": "bench", "email": f"bench-{tag}@bench.local", "password": "-", "role": "PRODUTOR"}
+        ])
+        await session.execute(insert(models.Address), address_rows)
+        await session.execute(insert(models.RecyclableMaterial), material_rows)
+        await session.commit()
+
+        pickup_ids = []
+        for offset in range(0, pickups, BATCH):
+            pickup_rows, item_rows = [], []
+            for _ in range(min(BATCH, pickups - offset)):
+                pickup_id = models.generate_uuid()
+                pickup_rows.append({
+                    "id": pickup_id,
+                    "producer_id": producer_id,
+                    "address_id": rng.choice(address_rows)["id"],
+                    "scheduled_time": start + timedelta(days=rng.randrange(days), hours=rng.randrange(10)),
+                    "status": rng.choice(STATUSES),
+                    "created_at": start,
+                })
+                for material in rng.sample(material_rows, 2):
+                    item_rows.append({
+                        "id": models.generate_uuid(),
+                        "request_id": pickup_id,
+                        "material_id": material["id"],
+                        "quantity": rng.randint(1, 10),
+                        "weight_kg": round(rng.uniform(0.5, 30), 2),
+                    })
+            await session.execute(insert(models.PickupRequest), pickup_rows)
+            await session.execute(insert(models.PickupRequestItem), item_rows)
+            ids = [row["id"] for row in pickup_rows]
+            await PickupRollupService(session).add_pickups(ids)
+            await session.commit()
+            pickup_ids += ids
+
+    return {
+        "producer_id": producer_id,
+        "pickup_ids": pickup_ids,
+        "address_ids": [row["id"] for row in address_rows],
+        "material_ids": [row["id"] for row in material_rows],
+    }
+
+
+async def _cleanup(seeded: dict):
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(models.PickupRollup).where(models.PickupRollup.material_id.in_(seeded["material_ids"])))
+        for offset in range(0, len(seeded["pickup_ids"]), BATCH):
+            chunk = seeded["pickup_ids"][offset:offset + BATCH]
+            await session.execute(delete(models.PickupRequestItem).where(models.PickupRequestItem.request_id.in_(chunk)))
+            await session.execute(delete(models.PickupRequest).where(models.PickupRequest.id.in_(chunk)))
+        await session.execute(delete(models.RecyclableMaterial).where(models.RecyclableMaterial.id.in_(seeded["material_ids"])))
+        await session.execute(delete(models.Address).where(models.Address.id.in_(seeded["address_ids"])))
+        await session.execute(delete(models.User).where(models.User.id == seeded["producer_id"]))
+        await session.commit()
+
+
+async def _scan_report(start: date, end: date, material_ids: list[str], granularity: str):
+    pickup = models.PickupRequest
+    day = func.date(func.coalesce(pickup.scheduled_time, pickup.created_at))
+    source = rollup_source_select(
+        pickup.status == "ENTREGUE",
+        day >= start.isoformat(),
+        day <= end.isoformat(),
+        models.PickupRequestItem.material_id.in_(material_ids),
+    ).subquery()
+    stmt = (
+        select(
+            source.c.bucket_date, source.c.material_id, models.RecyclableMaterial.type, source.c.city,
+            source.c.item_count, source.c.quantity, source.c.weight_kg,
+        )
+        .outerjoin(models.RecyclableMaterial, models.RecyclableMaterial.id == source.c.material_id)
+    )
+    async with AsyncSessionLocal() as session:
+        rows = (await session.execute(stmt)).all()
+    return aggregate_report(rows, granularity)
+
+
+async def _rollup_report(start: date, end: date, material_ids: list[str], granularity: str):
+    async with AsyncSessionLocal() as session:
+        rows = [
+            row for row in await PickupRollupService(session).load(start, end, ["ENTREGUE"])
+            if row.material_id in material_ids
+        ]
+    return aggregate_report(rows, granularity)
+
+
+async def _timeit(function, repeat: int, *args) -> tuple[float, list]:
+    samples, result = [], None
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        result = await function(*args)
+        samples.append((time.perf_counter() - begin) * 1000)
+    return statistics.median(samples), result
+
+
+async def main(pickups: int, days: int, cities: int, materials: int, repeat: int, seed: int):
+    create_database()
+    begin = time.perf_counter()
+    seeded = await _seed(pickups, days, cities, materials, seed)
+    print(
+        f"dialeto={async_engine.dialect.name} coletas={pickups} itens={pickups * 2} dias={days} "
+        f"cidades={cities} materiais={materials} (seed em {time.perf_counter() - begin:.1f} s)"
+    )
+
+    start, end = date(2025, 1, 1), date(2025, 1, 1) + timedelta(days=days - 1)
+    try:
+        print(f"{'granularidade':>13} {'varredura':>11} {'rollups':>9} {'ganho':>7} {'linhas':>7}")
+        for granularity in ("day", "week", "month"):
+            scan_ms, scan = await _timeit(_scan_report, repeat, start, end, seeded["material_ids"], granularity)
+            rollup_ms, rollup = await _timeit(_rollup_report, repeat, start, end, seeded["material_ids"], granularity)
+            assert scan == rollup, "relatórios diferentes"
+            print(f"{granularity:>13} {scan_ms:9.1f}ms {rollup_ms:7.1f}ms {scan_ms / rollup_ms:6.1f}x {len(rollup):>7}")
+    finally:
+        await _cleanup(seeded)
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pickups", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--cities", type=int, default=10)
+    parser.add_argument("--materials", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(main(args.pickups, args.days, args.cities, args.materials, args.repeat, args.seed))
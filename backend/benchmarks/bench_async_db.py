@@ -0,0 +1,75 @@
+"""
+Benchmark de concorrência: sessão síncrona vs. AsyncSession dentro do event loop
+
+Dispara N corrotinas concorrentes que executam uma query cada. Com a sessão
+síncrona a query bloqueia o event loop e as corrotinas rodam em série; com a
+AsyncSession o loop continua livre enquanto o banco responde.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_async_db --requests 200 --concurrency 20
+    python -m benchmarks.bench_async_db --sleep-ms 10   # PostgreSQL: simula latência com pg_sleep
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from src.database.connection import SessionLocal, engine
+from src.database.async_connection import AsyncSessionLocal, async_engine
+
+
+def _query(sleep_ms: int):
+    if sleep_ms and engine.dialect.name == "postgresql":
+        return text(f"SELECT pg_sleep({sleep_ms / 1000})")
+    return text("SELECT 1")
+
+
+async def _run(worker, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await worker()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - start
+
+
+async def main(total: int, concurrency: int, sleep_ms: int):
+    query = _query(sleep_ms)
+
+    async def sync_worker():
+        # Padrão antigo: sessão síncrona chamada direto de uma rota async
+        with SessionLocal() as session:
+            session.execute(query)
+
+    async def async_worker():
+        async with AsyncSessionLocal() as session:
+            await session.execute(query)
+
+    # Aquece os dois pools antes de medir
+    await sync_worker()
+    await async_worker()
+
+    results = {
+        "sync Session": await _run(sync_worker, total, concurrency),
+        "AsyncSession": await _run(async_worker, total, concurrency),
+    }
+
+    print(f"dialeto={engine.dialect.name} requisições={total} concorrência={concurrency} sleep_ms={sleep_ms}")
+    for name, elapsed in results.items():
+        print(f"{name:>14}: {elapsed * 1000:9.1f} ms total  {total / elapsed:9.1f} req/s")
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--sleep-ms", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.sleep_ms))
@@ -0,0 +1,145 @@
+"""
+Benchmark de memória do export do histórico de coletas
+
+Para cada tamanho, exporta as N primeiras coletas (2 itens cada) pelos caminhos:
+    - materializar: carrega as coletas como objetos do ORM (selectinload dos
+      itens), valida com PickupRequestOut e serializa o JSON inteiro de uma vez
+    - stream_export: cursor no servidor (yield_per) gerando CSV/NDJSON em pedaços,
+      como as rotas /export
+
+Mede tempo e pico de memória alocada em Python (tracemalloc). No stream_export
+o pico deve ficar estável com o aumento de N. Cria usuário, endereço, material e
+coletas próprios no banco da DATABASE_URL e os remove ao final; use um banco de
+desenvolvimento.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_history_export --sizes 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import selectinload
+
+from src.database.async_connection import AsyncSessionLocal, async_engine
+from src.database.connection import create_database
+from src.models import models
+from src.schemas.residue_schema import PickupRequestOut
+from src.services.history_export import pickup_export_select, stream_export
+
+BATCH = 2000
+START = datetime(2020, 1, 1)
+
+
+async def _seed(pickups: int) -> dict:
+    tag = uuid.uuid4().hex[:8]
+    producer_id, address_id, material_id = models.generate_uuid(), models.generate_uuid(), models.generate_uuid()
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(models.User), [
+            {"id": producer_id, "name": "bench", "email": f"bench-{tag}@bench.local", "password": "-", "role": "PRODUTOR"}
+        ])
+        await session.execute(insert(models.Address), [{"id": address_id, "user_id": producer_id, "city": f"bench-{tag}"}])
+        await session.execute(insert(models.RecyclableMaterial), [{"id": material_id, "type": f"bench-{tag}"}])
+
+        pickup_ids = []
+        for offset in range(0, pickups, BATCH):
+            pickup_rows, item_rows = [], []
+            for index in range(offset, min(offset + BATCH, pickups)):
+                pickup_id = models.generate_uuid()
+                pickup_rows.append({
+                    "id": pickup_id,
+                    "producer_id": producer_id,
+                    "address_id": address_id,
+                    "scheduled_time": START + timedelta(seconds=index),
+                    "status": "ENTREGUE",
+                    "created_at": START + timedelta(seconds=index),
+                })
+                item_rows += [
+                    {"id": models.generate_uuid(), "request_id": pickup_id, "material_id": material_id, "quantity": 2, "weight_kg": 3.5},
+                    {"id": models.generate_uuid(), "request_id": pickup_id, "material_id": material_id, "quantity": 1, "weight_kg": 0.75},
+                ]
+            await session.execute(insert(models.PickupRequest), pickup_rows)
+            await session.execute(insert(models.PickupRequestItem), item_rows)
+            pickup_ids += [row["id"] for row in pickup_rows]
+        await session.commit()
+
+    return {"producer_id": producer_id, "address_id": address_id, "material_id": material_id, "pickup_ids": pickup_ids}
+
+
+async def _cleanup(seeded: dict):
+    async with AsyncSessionLocal() as session:
+        for offset in range(0, len(seeded["pickup_ids"]), BATCH):
+            chunk = seeded["pickup_ids"][offset:offset + BATCH]
+            await session.execute(delete(models.PickupRequestItem).where(models.PickupRequestItem.request_id.in_(chunk)))
+            await session.execute(delete(models.PickupRequest).where(models.PickupRequest.id.in_(chunk)))
+        await session.execute(delete(models.RecyclableMaterial).where(models.RecyclableMaterial.id == seeded["material_id"]))
+        await session.execute(delete(models.Address).where(models.Address.id == seeded["address_id"]))
+        await session.execute(delete(models.User).where(models.User.id == seeded["producer_id"]))
+        await session.commit()
+
+
+async def _materialize(producer_id: str, until: datetime) -> int:
+    stmt = (
+        select(models.PickupRequest)
+        .options(selectinload(models.PickupRequest.items))
+        .where(models.PickupRequest.producer_id == producer_id, models.PickupRequest.created_at < until)
+        .order_by(models.PickupRequest.created_at, models.PickupRequest.id)
+    )
+    async with AsyncSessionLocal() as session:
+        pickups = (await session.execute(stmt)).scalars().all()
+        adapter = TypeAdapter(list[PickupRequestOut])
+        return len(adapter.dump_json(adapter.validate_python(pickups, from_attributes=True)))
+
+
+async def _stream(producer_id: str, until: datetime, export_format: str) -> int:
+    stmt = pickup_export_select(START, until).where(models.PickupRequest.producer_id == producer_id)
+    written = 0
+    async for chunk in stream_export(stmt, export_format):
+        written += len(chunk)
+    return written
+
+
+async def _measure(function, *args) -> tuple[float, float, int]:
+    tracemalloc.start()
+    begin = time.perf_counter()
+    written = await function(*args)
+    elapsed = time.perf_counter() - begin
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 2**20, written
+
+
+async def main(sizes: list[int]):
+    create_database()
+    begin = time.perf_counter()
+    seeded = await _seed(max(sizes))
+    print(f"dialeto={async_engine.dialect.name} coletas={max(sizes)} (seed em {time.perf_counter() - begin:.1f} s)")
+
+    try:
+        print(f"{'coletas':>8} {'caminho':>14} {'tempo':>10} {'pico':>10} {'bytes':>12}")
+        for size in sizes:
+            until = START + timedelta(seconds=size)
+            for name, function, args in (
+                ("materializar", _materialize, (seeded["producer_id"], until)),
+                ("stream csv", _stream, (seeded["producer_id"], until, "csv")),
+                ("stream ndjson", _stream, (seeded["producer_id"], until, "ndjson")),
+            ):
+                elapsed, peak, written = await _measure(function, *args)
+                print(f"{size:>8} {name:>14} {elapsed:8.0f}ms {peak:8.1f}MB {written:>12}")
+    finally:
+        await _cleanup(seeded)
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes))
@@ -0,0 +1,119 @@
+"""
+Microbenchmark de serialização das respostas no envelope ReturnTrueData
+
+Serializa N coletas (PickupRequest com 2 itens cada, objetos do ORM em memória)
+pelos caminhos:
+    - atual: model_validate por item, ReturnTrueData, revalidação do
+      response_model pelo FastAPI (serialize_response) e JSONResponse da stdlib
+    - EnvelopeSerializer: uma validação por atributos e dump_json do pydantic-core
+    - FastJSONResponse: dict já pronto serializado com orjson (ou stdlib)
+
+Não usa banco nem servidor; mede só CPU de serialização.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_json_response --sizes 10 1000 10000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.models import models
+from src.schemas import residue_schema, return_schema
+from src.utils import json_providers
+from src.utils.json_providers import EnvelopeSerializer, FastJSONResponse
+
+RESPONSE_MODEL = return_schema.ReturnTrueData[list[residue_schema.PickupRequestOut]]
+_response_field = create_model_field(name="response", type_=RESPONSE_MODEL, mode="serialization")
+_serializer = EnvelopeSerializer(residue_schema.PickupRequestOut)
+
+
+def _build_pickups(count: int) -> list[models.PickupRequest]:
+    base = datetime(2030, 1, 1, 8, 0)
+    pickups = []
+    for index in range(count):
+        pickup = models.PickupRequest(
+            id=models.generate_uuid(),
+            producer_id=models.generate_uuid(),
+            address_id=models.generate_uuid(),
+            scheduled_time=base + timedelta(minutes=index),
+            status="PENDENTE",
+        )
+        pickup.items = [
+            models.PickupRequestItem(
+                id=models.generate_uuid(),
+                material_id=models.generate_uuid(),
+                quantity=3,
+                weight_kg=Decimal("12.50"),
+            )
+            for _ in range(2)
+        ]
+        pickups.append(pickup)
+    return pickups
+
+
+def _current_path(pickups) -> bytes:
+    content = return_schema.ReturnTrueData(
+        data=[residue_schema.PickupRequestOut.model_validate(pickup) for pickup in pickups]
+    )
+    validated = asyncio.run(serialize_response(field=_response_field, response_content=content, is_coroutine=True))
+    return JSONResponse(validated).body
+
+
+def _envelope_path(pickups) -> bytes:
+    return _serializer.response(pickups).body
+
+
+def _fast_response_path(payload) -> bytes:
+    return FastJSONResponse(payload).body
+
+
+def _stdlib_response_path(payload) -> bytes:
+    return JSONResponse(payload).body
+
+
+def _timeit(function, argument, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(sizes: list[int], repeat: int):
+    print(f"orjson={'sim' if json_providers.JSON_USE_ORJSON else 'não'} repetições={repeat} (mediana, ms)")
+    print(f"{'itens':>7} {'atual':>10} {'envelope':>10} {'ganho':>7} {'FastJSONResp.':>12} {'JSONResponse':>12} {'bytes':>10}")
+    for size in sizes:
+        pickups = _build_pickups(size)
+
+        # Os dois caminhos precisam gerar o mesmo JSON
+        expected = json.loads(_current_path(pickups))
+        assert json.loads(_envelope_path(pickups)) == expected, "saídas diferentes"
+        payload = jsonable_encoder(expected)
+
+        current_ms = _timeit(_current_path, pickups, repeat)
+        envelope_ms = _timeit(_envelope_path, pickups, repeat)
+        fast_ms = _timeit(_fast_response_path, payload, repeat)
+        stdlib_ms = _timeit(_stdlib_response_path, payload, repeat)
+        print(
+            f"{size:>7} {current_ms:10.2f} {envelope_ms:10.2f} {current_ms / envelope_ms:6.1f}x "
+            f"{fast_ms:12.2f} {stdlib_ms:12.2f} {len(_envelope_path(pickups)):>10}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
@@ -0,0 +1,123 @@
+"""
+Benchmark de contenção: vários coletores aceitando a mesma coleta ao mesmo tempo
+
+Para cada coleta, dispara --collectors aceites concorrentes e compara:
+    - compare-and-set: PickupTransitionService.accept (UPDATE ... WHERE status = 'PENDENTE' RETURNING)
+    - load-then-save: lê a coleta, confere o status em Python e salva
+
+O esperado é exatamente um vencedor por coleta. No load-then-save, aceites
+que leram PENDENTE antes do primeiro commit também "vencem" e criam
+Collections duplicadas (lost update).
+
+Cria usuários e coletas próprios no banco da DATABASE_URL e os remove ao final;
+use um banco de desenvolvimento.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_pickup_contention --pickups 50 --collectors 20
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import delete, func, insert, select
+
+from src.database.async_connection import AsyncSessionLocal, async_engine
+from src.database.connection import create_database
+from src.models import models
+from src.services.pickup_transitions import PickupTransitionService, TransitionConflict
+
+
+async def _seed(pickups: int, collectors: int) -> tuple[list[str], list[str], list[str]]:
+    tag = uuid.uuid4().hex[:8]
+    users = [
+        {"id": models.generate_uuid(), "name": "bench", "email": f"bench-{tag}-{index}@bench.local",
+         "password": "-", "role": "COLETOR" if index else "PRODUTOR"}
+        for index in range(collectors + 1)
+    ]
+    pickup_ids = [models.generate_uuid() for _ in range(pickups)]
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(models.User), users)
+        await session.commit()
+    return [user["id"] for user in users], users[0]["id"], pickup_ids
+
+
+async def _reset_pickups(producer_id: str, pickup_ids: list[str]):
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(models.Collection).where(models.Collection.request_id.in_(pickup_ids)))
+        await session.execute(delete(models.PickupRequest).where(models.PickupRequest.id.in_(pickup_ids)))
+        await session.execute(insert(models.PickupRequest), [
+            {"id": pickup_id, "producer_id": producer_id, "status": "PENDENTE"} for pickup_id in pickup_ids
+        ])
+        await session.commit()
+
+
+async def _accept_cas(pickup_id: str, collector_id: str) -> bool:
+    async with AsyncSessionLocal() as session:
+        try:
+            await PickupTransitionService(session).accept(pickup_id, collector_id)
+            return True
+        except TransitionConflict:
+            return False
+
+
+async def _accept_load_then_save(pickup_id: str, collector_id: str) -> bool:
+    async with AsyncSessionLocal() as session:
+        pickup = await session.get(models.PickupRequest, pickup_id)
+        if pickup.status != "PENDENTE":
+            return False
+        await asyncio.sleep(0)  # ponto de troca, como a latência entre leitura e escrita de uma requisição real
+        pickup.status = "ACEITA"
+        session.add(models.Collection(request_id=pickup_id, collector_id=collector_id))
+        await session.commit()
+        return True
+
+
+async def _run(accept, pickup_ids: list[str], collector_ids: list[str]) -> tuple[float, int, int]:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        accept(pickup_id, collector_id)
+        for pickup_id in pickup_ids
+        for collector_id in collector_ids
+    ), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    errors = sum(1 for result in results if isinstance(result, Exception))
+
+    async with AsyncSessionLocal() as session:
+        collections = (await session.execute(
+            select(func.count()).select_from(models.Collection).where(models.Collection.request_id.in_(pickup_ids))
+        )).scalar_one()
+    return elapsed, collections, errors
+
+
+async def main(pickups: int, collectors: int):
+    create_database()
+    user_ids, producer_id, pickup_ids = await _seed(pickups, collectors)
+    collector_ids = user_ids[1:]
+    attempts = pickups * collectors
+
+    print(f"dialeto={async_engine.dialect.name} coletas={pickups} coletores por coleta={collectors} aceites={attempts}")
+    try:
+        for name, accept in (("compare-and-set", _accept_cas), ("load-then-save", _accept_load_then_save)):
+            await _reset_pickups(producer_id, pickup_ids)
+            elapsed, collections, errors = await _run(accept, pickup_ids, collector_ids)
+            print(
+                f"{name:>16}: {elapsed * 1000:9.1f} ms  {attempts / elapsed:8.1f} aceites/s  "
+                f"collections={collections} (esperado {pickups})  duplicadas={collections - pickups}  erros={errors}"
+            )
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(models.Collection).where(models.Collection.request_id.in_(pickup_ids)))
+            await session.execute(delete(models.PickupRequest).where(models.PickupRequest.id.in_(pickup_ids)))
+            await session.execute(delete(models.User).where(models.User.id.in_(user_ids)))
+            await session.commit()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pickups", type=int, default=50)
+    parser.add_argument("--collectors", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.pickups, args.collectors))
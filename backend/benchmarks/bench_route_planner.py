@@ -0,0 +1,67 @@
+"""
+Benchmark do planejador de rotas (src/services/route_planner.py)
+
+Mede, para várias quantidades de paradas, o tempo da matriz de distâncias,
+do vizinho mais próximo e do 2-opt, e o ganho do 2-opt sobre a rota gulosa.
+Não usa banco de dados.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_route_planner
+    python -m benchmarks.bench_route_planner --stops 50 100 200 400 --repeat 20
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.services import route_planner
+
+# Região metropolitana de Teresina, onde as paradas são sorteadas
+CENTER = (-5.09, -42.80)
+SPREAD_DEGREES = 0.15
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run(stop_counts: list[int], repeat: int, seed: int):
+    rng = np.random.default_rng(seed)
+    print(f"{'paradas':>8} {'matriz ms':>10} {'vizinho ms':>11} {'2-opt ms':>9} {'total ms':>9} {'p95 ms':>8} {'ganho 2-opt':>12}")
+
+    for n in stop_counts:
+        matrix_ms, nn_ms, opt_ms, totals, gains = [], [], [], [], []
+        for _ in range(repeat):
+            stops = np.column_stack([
+                rng.uniform(CENTER[0] - SPREAD_DEGREES, CENTER[0] + SPREAD_DEGREES, n),
+                rng.uniform(CENTER[1] - SPREAD_DEGREES, CENTER[1] + SPREAD_DEGREES, n),
+            ])
+            coordinates = np.vstack([[CENTER], stops, [CENTER]])
+
+            distances, t_matrix = _timed(route_planner.distance_matrix_km, coordinates)
+            nn_path, t_nn = _timed(route_planner.nearest_neighbour_path, distances, 0, n + 1)
+            path, t_opt = _timed(route_planner.two_opt, distances, nn_path)
+
+            nn_km = route_planner.path_length(distances, nn_path)
+            matrix_ms.append(t_matrix)
+            nn_ms.append(t_nn)
+            opt_ms.append(t_opt)
+            totals.append(t_matrix + t_nn + t_opt)
+            gains.append(1 - route_planner.path_length(distances, path) / nn_km if nn_km else 0.0)
+
+        print(
+            f"{n:>8} {np.mean(matrix_ms):>10.2f} {np.mean(nn_ms):>11.2f} {np.mean(opt_ms):>9.2f} "
+            f"{np.mean(totals):>9.2f} {np.percentile(totals, 95):>8.2f} {np.mean(gains) * 100:>11.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stops", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    run(args.stops, args.repeat, args.seed)
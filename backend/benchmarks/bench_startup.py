@@ -0,0 +1,107 @@
+"""
+Benchmark de inicialização da API
+
+Mede, em processos novos:
+    - import: tempo de `import main` (rotas, models, engines)
+    - pronto: do início do processo uvicorn até o primeiro 200 em /health/live
+    - 1ª req. banco: primeira requisição que consulta o banco (login com usuário inexistente)
+    - 1º openapi: primeira geração de /openapi.json
+
+Compara o modo de desenvolvimento (migrações no startup, sem pré-conexão do
+pool) com o modo de produção (schema aplicado antes por manage.py migrate,
+pool pré-conectado no lifespan). Usa a DATABASE_URL configurada.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_startup --runs 5
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+SCENARIOS = {
+    "dev (auto-migrate, sem warm-up)": {"DB_AUTO_MIGRATE": "true", "DB_POOL_WARMUP": "0"},
+    "produção (migrate antes, warm-up)": {"DB_AUTO_MIGRATE": "false", "DB_POOL_WARMUP": "5"},
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _measure_import(env: dict) -> float:
+    code = "import time; start = time.perf_counter(); import main; print(time.perf_counter() - start)"
+    output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1]) * 1000
+
+
+def _timed_request(client: httpx.Client, method: str, path: str, **kwargs) -> float:
+    start = time.perf_counter()
+    client.request(method, path, **kwargs)
+    return (time.perf_counter() - start) * 1000
+
+
+def _measure_server(env: dict, timeout: float) -> tuple[float, float, float]:
+    port = _free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", "1", "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=10) as client:
+            while True:
+                if time.perf_counter() - start > timeout:
+                    raise TimeoutError("API não respondeu a tempo")
+                try:
+                    if client.get("/health/live").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.01)
+            ready_ms = (time.perf_counter() - start) * 1000
+
+            first_db_ms = _timed_request(
+                client, "POST", "/auth/login", json={"email": "ninguem@bench.local", "password": "Invalida1!"}
+            )
+            first_openapi_ms = _timed_request(client, "GET", "/openapi.json")
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return ready_ms, first_db_ms, first_openapi_ms
+
+
+def main(runs: int, timeout: float):
+    # Garante o schema antes, como no deploy de produção
+    subprocess.run([sys.executable, "manage.py", "migrate"], check=True, stdout=subprocess.DEVNULL)
+
+    print(f"execuções por cenário={runs} (mediana, ms)")
+    print(f"{'cenário':>36} {'import':>9} {'pronto':>9} {'1ª req. banco':>14} {'1º openapi':>11}")
+    for name, overrides in SCENARIOS.items():
+        env = {**os.environ, **overrides}
+        imports, ready, first_db, first_openapi = [], [], [], []
+        for _ in range(runs):
+            imports.append(_measure_import(env))
+            ready_ms, first_db_ms, first_openapi_ms = _measure_server(env, timeout)
+            ready.append(ready_ms)
+            first_db.append(first_db_ms)
+            first_openapi.append(first_openapi_ms)
+        print(
+            f"{name:>36} {statistics.median(imports):9.1f} {statistics.median(ready):9.1f} "
+            f"{statistics.median(first_db):14.1f} {statistics.median(first_openapi):11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60, help="Tempo máximo para a API ficar pronta (s)")
+    args = parser.parse_args()
+    main(args.runs, args.timeout)
@@ -0,0 +1,93 @@
+"""
+Benchmark de chave primária: uuid4 x uuid7 (e UUID nativo no PostgreSQL)
+
+Para cada variante, cria uma tabela temporária só com a chave primária e um
+payload pequeno, insere N linhas em lotes e mede:
+    - tempo total de INSERT
+    - tamanho do índice da chave primária ao final (dbstat no SQLite,
+      pg_relation_size no PostgreSQL)
+
+Variantes:
+    - texto uuid4: String(36) com uuid4, o formato antigo dos IDs
+    - texto uuid7: String(36) com uuid7, ordenado pelo instante de criação
+    - uuid7 nativo: coluna uuid (16 bytes), só no PostgreSQL
+
+Com uuid4 cada INSERT cai numa página aleatória do índice (splits e páginas
+meio vazias); com uuid7 as escritas vão para o fim do índice. As tabelas são
+criadas e removidas no banco da DATABASE_URL; use um banco de desenvolvimento.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_uuid_keys --rows 200000
+"""
+
+import argparse
+import time
+import uuid
+
+from sqlalchemy import Column, MetaData, String, Table, Uuid, insert, text
+
+from src.database.connection import engine
+from src.utils.uuid_providers import uuid7
+
+BATCH = 5000
+
+
+def _variants() -> list[tuple[str, object, object]]:
+    variants = [
+        ("texto uuid4", String(36), lambda: str(uuid.uuid4())),
+        ("texto uuid7", String(36), uuid7),
+    ]
+    if engine.dialect.name == "postgresql":
+        variants.append(("uuid7 nativo", Uuid(as_uuid=False), uuid7))
+    return variants
+
+
+def _index_bytes(connection, table: Table) -> int:
+    if engine.dialect.name == "postgresql":
+        return connection.execute(
+            text("SELECT pg_relation_size(:index)"), {"index": f"{table.name}_pkey"}
+        ).scalar_one()
+    # SQLite: a chave primária em texto vira o índice sqlite_autoindex_<tabela>_1
+    return connection.execute(
+        text("SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name = :index"),
+        {"index": f"sqlite_autoindex_{table.name}_1"},
+    ).scalar_one()
+
+
+def _run(name: str, column_type, generate, rows: int) -> tuple[float, int]:
+    table = Table(
+        f"bench_uuid_{name.replace(' ', '_')}",
+        MetaData(),
+        Column("id", column_type, primary_key=True),
+        Column("payload", String(32)),
+    )
+    table.drop(engine, checkfirst=True)
+    table.create(engine)
+    try:
+        begin = time.perf_counter()
+        for offset in range(0, rows, BATCH):
+            batch = [{"id": generate(), "payload": "x" * 32} for _ in range(min(BATCH, rows - offset))]
+            with engine.begin() as connection:
+                connection.execute(insert(table), batch)
+        elapsed = time.perf_counter() - begin
+
+        with engine.begin() as connection:
+            return elapsed, _index_bytes(connection, table)
+    finally:
+        table.drop(engine)
+
+
+def main(rows: int):
+    print(f"dialeto={engine.dialect.name} linhas={rows}")
+    print(f"{'variante':>14} {'tempo':>10} {'linhas/s':>10} {'índice PK':>12}")
+    for name, column_type, generate in _variants():
+        elapsed, index_bytes = _run(name, column_type, generate, rows)
+        print(f"{name:>14} {elapsed * 1000:8.0f}ms {rows / elapsed:10.0f} {index_bytes / 2**20:10.1f}MB")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+    main(args.rows)
@@ -0,0 +1,370 @@
+"""
+Teste de carga ponta a ponta da API (auth e resíduos)
+
+Sobe `uvicorn main:app` em uma porta livre (ou usa --base-url de um servidor
+já em execução), cria usuários, endereços, materiais e coletas e então roda,
+um cenário por vez, --requests requisições com --concurrency clientes:
+
+    signup, login, refresh, list_materials, register_pickup, my_pickups
+
+Para cada cenário mostra vazão (req/s), latência p50/p95/p99, erros e queries
+por requisição (lidas do header Server-Timing, então o servidor precisa de
+SERVER_TIMING_ENABLED=true). Cada cliente virtual usa o próprio usuário: o
+refresh troca o refresh token a cada chamada.
+
+Baselines: --save-baseline grava o resultado em JSON; --baseline compara com
+um resultado salvo e termina com código 1 se algum cenário piorar além de
+--max-regression (p95 ou vazão), passar a fazer mais queries ou tiver mais erros.
+Variações de p95 menores que --min-p95-delta-ms são ignoradas: em rotas de
+poucos milissegundos, 15% fica dentro do ruído entre duas execuções.
+
+Endereços e materiais são criados direto no banco (a API não tem rota de
+endereços), então o servidor precisa usar a mesma DATABASE_URL deste script
+(--database-url vale para os dois). Os dados não são removidos; use um banco
+de desenvolvimento.
+
+Uso (a partir de backend/):
+    python -m benchmarks.load_api --requests 500 --concurrency 20 --save-baseline benchmarks/baselines/main.json
+    python -m benchmarks.load_api --requests 500 --concurrency 20 --baseline benchmarks/baselines/main.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+PASSWORD = "Bench1!pass"
+SCENARIOS = ("signup", "login", "refresh", "list_materials", "register_pickup", "my_pickups")
+_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+@dataclass
+class VirtualUser:
+    """Usuário de um cliente virtual (tokens atualizados pelo cenário de refresh)"""
+    id: str
+    email: str
+    access_token: str
+    refresh_token: str
+    address_id: str | None = None
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+@dataclass
+class Sample:
+    seconds: float
+    status_code: int
+    queries: int | None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _start_server(workers: int, timeout: float, log_path: str | None) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    log = open(log_path, "w") if log_path else subprocess.DEVNULL
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env={**os.environ, "SERVER_TIMING_ENABLED": "true"}, stdout=log, stderr=log,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    with httpx.Client(base_url=base_url, timeout=10) as client:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn terminou com código {process.returncode} (veja --server-log)")
+            if time.perf_counter() - start > timeout:
+                process.terminate()
+                raise TimeoutError("API não respondeu a tempo")
+            try:
+                if client.get("/health/live").status_code == 200:
+                    return process, base_url
+            except httpx.TransportError:
+                time.sleep(0.05)
+
+
+def _new_email(tag: str) -> str:
+    return f"load-{tag}-{uuid.uuid4().hex[:10]}@bench.local"
+
+
+async def _signup(client: httpx.AsyncClient, email: str) -> httpx.Response:
+    return await client.post("/auth/signup", json={"name": "load", "email": email, "password": PASSWORD, "role": "PRODUTOR"})
+
+
+async def _create_user(client: httpx.AsyncClient, tag: str) -> VirtualUser:
+    email = _new_email(tag)
+    (await _signup(client, email)).raise_for_status()
+    response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    response.raise_for_status()
+    tokens = response.json()["data"]
+    me = await client.get("/auth/me", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    return VirtualUser(me.json()["data"]["id"], email, tokens["access_token"], tokens["refresh_token"])
+
+
+def _seed_database(users: list[VirtualUser], materials: int, tag: str) -> list[str]:
+    # Importado aqui para que --database-url já esteja no ambiente
+    from sqlalchemy import insert
+
+    from src.database.connection import SessionLocal
+    from src.models import models
+
+    material_rows = [
+        {"id": models.generate_uuid(), "type": f"load-{tag}-{index}", "reward_per_kg": 1, "reward_per_unit": 0}
+        for index in range(materials)
+    ]
+    address_rows = [
+        {"id": models.generate_uuid(), "user_id": user.id, "city": "Teresina", "state": "PI", "latitude": -5.09, "longitude": -42.80}
+        for user in users
+    ]
+    with SessionLocal() as session:
+        session.execute(insert(models.RecyclableMaterial), material_rows)
+        session.execute(insert(models.Address), address_rows)
+        session.commit()
+
+    for user, address in zip(users, address_rows):
+        user.address_id = address["id"]
+    return [row["id"] for row in material_rows]
+
+
+def _pickup_body(user: VirtualUser, material_ids: list[str], index: int) -> dict:
+    return {
+        "address_id": user.address_id,
+        "scheduled_time": f"2030-01-{index % 28 + 1:02d}T10:00:00",
+        "items": [
+            {"material_id": material_ids[index % len(material_ids)], "quantity": 2, "weight_kg": 3.5},
+            {"material_id": material_ids[(index + 1) % len(material_ids)], "quantity": 1, "weight_kg": 1.25},
+        ],
+    }
+
+
+async def _seed(client: httpx.AsyncClient, users: int, materials: int, pickups_per_user: int, tag: str) -> tuple[list[VirtualUser], list[str]]:
+    semaphore = asyncio.Semaphore(16)
+
+    async def create():
+        async with semaphore:
+            return await _create_user(client, tag)
+
+    virtual_users = await asyncio.gather(*(create() for _ in range(users)))
+    material_ids = await asyncio.to_thread(_seed_database, virtual_users, materials, tag)
+
+    async def register_history(user: VirtualUser):
+        async with semaphore:
+            for offset in range(0, pickups_per_user, 100):
+                body = {"pickups": [_pickup_body(user, material_ids, index) for index in range(offset, min(offset + 100, pickups_per_user))]}
+                (await client.post("/residue/register_pickups", json=body, headers=user.headers)).raise_for_status()
+
+    await asyncio.gather(*(register_history(user) for user in virtual_users))
+    return list(virtual_users), material_ids
+
+
+async def _call(scenario: str, client: httpx.AsyncClient, user: VirtualUser, material_ids: list[str], index: int, tag: str) -> httpx.Response:
+    if scenario == "signup":
+        return await _signup(client, _new_email(tag))
+    if scenario in ("login", "refresh"):
+        # Login e refresh gravam um novo refresh token; o anterior deixa de valer
+        if scenario == "login":
+            response = await client.post("/auth/login", json={"email": user.email, "password": PASSWORD})
+        else:
+            response = await client.post("/auth/refresh-token", json={"refresh_token": user.refresh_token})
+        if response.status_code == 200:
+            tokens = response.json()["data"]
+            user.access_token, user.refresh_token = tokens["access_token"], tokens["refresh_token"]
+        return response
+    if scenario == "list_materials":
+        return await client.get("/residue/list_materials", headers=user.headers)
+    if scenario == "register_pickup":
+        return await client.post("/residue/register_pickup", json=_pickup_body(user, material_ids, index), headers=user.headers)
+    if scenario == "my_pickups":
+        return await client.get("/residue/my_pickups", params={"limit": 50}, headers=user.headers)
+    raise ValueError(f"Cenário desconhecido: {scenario}")
+
+
+async def _run_scenario(
+    scenario: str, client: httpx.AsyncClient, users: list[VirtualUser], material_ids: list[str],
+    requests: int, concurrency: int, tag: str,
+) -> tuple[list[Sample], float]:
+    samples: list[Sample] = []
+    counter = iter(range(requests))
+
+    async def worker(user: VirtualUser):
+        for index in counter:
+            start = time.perf_counter()
+            response = await _call(scenario, client, user, material_ids, index, tag)
+            elapsed = time.perf_counter() - start
+            match = _QUERIES.search(response.headers.get("server-timing", ""))
+            samples.append(Sample(elapsed, response.status_code, int(match.group(1)) if match else None))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(users[index % len(users)]) for index in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+def _summary(samples: list[Sample], elapsed: float) -> dict:
+    latencies = [sample.seconds * 1000 for sample in samples]
+    queries = [sample.queries for sample in samples if sample.queries is not None]
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for sample in samples if sample.status_code >= 400),
+        "throughput": len(samples) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 0.50),
+        "p95_ms": _percentile(latencies, 0.95),
+        "p99_ms": _percentile(latencies, 0.99),
+        "mean_ms": statistics.mean(latencies) if latencies else 0.0,
+        "queries": statistics.mean(queries) if queries else None,
+    }
+
+
+def _print_results(results: dict):
+    print(f"{'cenário':>16} {'req':>6} {'erros':>6} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8}")
+    for scenario, result in results.items():
+        queries = "-" if result["queries"] is None else f"{result['queries']:.1f}"
+        print(
+            f"{scenario:>16} {result['requests']:>6} {result['errors']:>6} {result['throughput']:8.1f} "
+            f"{result['p50_ms']:6.1f}ms {result['p95_ms']:6.1f}ms {result['p99_ms']:6.1f}ms {queries:>8}"
+        )
+
+
+def _compare(results: dict, baseline: dict, max_regression: float, min_p95_delta_ms: float) -> list[str]:
+    """Imprime a variação de cada cenário em relação ao baseline e retorna as regressões"""
+    regressions = []
+    print(
+        f"\ncomparação com o baseline de {baseline['meta']['created_at']} "
+        f"(limite {max_regression:.0%}, p95 a partir de +{min_p95_delta_ms:.1f}ms)"
+    )
+    print(f"{'cenário':>16} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>12}")
+    for scenario, result in results.items():
+        old = baseline["results"].get(scenario)
+        if old is None:
+            continue
+
+        def change(key: str) -> float:
+            return (result[key] - old[key]) / old[key] if old[key] else 0.0
+
+        queries = "-"
+        if result["queries"] is not None and old["queries"] is not None:
+            queries = f"{old['queries']:.1f}->{result['queries']:.1f}"
+            if round(result["queries"], 1) > round(old["queries"], 1):
+                regressions.append(f"{scenario}: queries por requisição {queries}")
+        if result["errors"] > old["errors"]:
+            regressions.append(f"{scenario}: erros {old['errors']} -> {result['errors']}")
+        if change("p95_ms") > max_regression and result["p95_ms"] - old["p95_ms"] >= min_p95_delta_ms:
+            regressions.append(f"{scenario}: p95 {old['p95_ms']:.1f}ms -> {result['p95_ms']:.1f}ms")
+        if -change("throughput") > max_regression:
+            regressions.append(f"{scenario}: vazão {old['throughput']:.1f} -> {result['throughput']:.1f} req/s")
+
+        print(
+            f"{scenario:>16} {change('throughput'):+9.1%} {change('p50_ms'):+9.1%} "
+            f"{change('p95_ms'):+9.1%} {change('p99_ms'):+9.1%} {queries:>12}"
+        )
+    return regressions
+
+
+async def _load(base_url: str, args) -> dict:
+    tag = uuid.uuid4().hex[:6]
+    limits = httpx.Limits(max_connections=args.concurrency + 16, max_keepalive_connections=args.concurrency + 16)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        begin = time.perf_counter()
+        users, material_ids = await _seed(client, max(args.users, args.concurrency), args.materials, args.pickups_per_user, tag)
+        print(
+            f"usuários={len(users)} materiais={len(material_ids)} coletas por usuário={args.pickups_per_user} "
+            f"(seed em {time.perf_counter() - begin:.1f} s)"
+        )
+
+        results = {}
+        for scenario in args.scenarios:
+            if args.warmup:
+                await _run_scenario(scenario, client, users, material_ids, args.warmup, args.concurrency, tag)
+            samples, elapsed = await _run_scenario(scenario, client, users, material_ids, args.requests, args.concurrency, tag)
+            results[scenario] = _summary(samples, elapsed)
+        return results
+
+
+def main(args) -> int:
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    process = None
+    base_url = args.base_url
+    if base_url is None:
+        process, base_url = _start_server(args.workers, args.timeout, args.server_log)
+    try:
+        results = asyncio.run(_load(base_url, args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    from sqlalchemy.engine import make_url
+    meta = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "dialect": make_url(os.environ.get("DATABASE_URL", "sqlite://")).get_backend_name(),
+        "workers": args.workers if process is not None else None,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "python": platform.python_version(),
+    }
+    print(
+        f"dialeto={meta['dialect']} workers={meta['workers'] or 'externo'} "
+        f"concorrência={args.concurrency} requisições por cenário={args.requests}"
+    )
+    _print_results(results)
+
+    if args.save_baseline:
+        path = Path(args.save_baseline)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+        print(f"\nbaseline salvo em {path}")
+
+    if args.baseline:
+        regressions = _compare(results, json.loads(Path(args.baseline).read_text()), args.max_regression, args.min_p95_delta_ms)
+        if regressions:
+            print("\nregressões:\n  " + "\n  ".join(regressions))
+            return 1
+        print("\nsem regressões")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=None, help="Usa um servidor já em execução em vez de subir o uvicorn")
+    parser.add_argument("--database-url", default=None, help="DATABASE_URL do servidor e do seed (padrão: a do ambiente)")
+    parser.add_argument("--workers", type=int, default=1, help="Workers do uvicorn iniciado pelo script")
+    parser.add_argument("--server-log", default=None, help="Arquivo para a saída do uvicorn")
+    parser.add_argument("--timeout", type=float, default=60, help="Tempo máximo para a API ficar pronta (s)")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="Requisições medidas por cenário")
+    parser.add_argument("--warmup", type=int, default=20, help="Requisições descartadas antes de cada cenário")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--users", type=int, default=20, help="Usuários criados (no mínimo um por cliente virtual)")
+    parser.add_argument("--materials", type=int, default=8)
+    parser.add_argument("--pickups-per-user", type=int, default=100, help="Coletas já existentes de cada usuário")
+    parser.add_argument("--save-baseline", default=None, help="Grava o resultado em JSON neste caminho")
+    parser.add_argument("--baseline", default=None, help="Compara com um resultado salvo por --save-baseline")
+    parser.add_argument("--max-regression", type=float, default=0.15, help="Piora relativa tolerada no p95 e na vazão")
+    parser.add_argument("--min-p95-delta-ms", type=float, default=2.0, help="Piora absoluta mínima do p95 para contar como regressão (ms)")
+    sys.exit(main(parser.parse_args()))
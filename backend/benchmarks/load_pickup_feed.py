@@ -0,0 +1,186 @@
+"""
+Teste de carga do feed de coletas (/collector/feed) com milhares de conexões ociosas
+
+Abre --connections WebSockets contra um servidor já em execução, deixa as
+conexões ociosas por --idle-seconds e então cria --events coletas pela API.
+Mede o tempo para abrir as conexões e a latência de entrega (da resposta do
+POST até a mensagem chegar em cada conexão), além de mensagens perdidas.
+
+O servidor precisa usar a mesma DATABASE_URL deste script (o endereço da
+coleta é criado direto no banco, pois a API não tem rota de endereços) e,
+para o resultado valer, um único worker: o broadcaster é por processo.
+
+Uso (a partir de backend/, com a API rodando em outro terminal):
+    uvicorn main:app --port 8000 --workers 1
+    python -m benchmarks.load_pickup_feed --connections 2000 --events 20
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import statistics
+import time
+import uuid
+
+import httpx
+from websockets.asyncio.client import connect
+
+from src.database.connection import SessionLocal
+from src.models import models
+
+PASSWORD = "Bench1!pass"
+LATITUDE, LONGITUDE = -5.0892, -42.8019
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _raise_fd_limit(connections: int):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = min(hard, connections + 1024)
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+
+async def _login(client: httpx.AsyncClient, role: str) -> tuple[str, str]:
+    email = f"feed-{uuid.uuid4().hex[:10]}@bench.local"
+    await client.post("/auth/signup", json={"name": "bench", "email": email, "password": PASSWORD, "role": role})
+    response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    response.raise_for_status()
+    token = response.json()["data"]["access_token"]
+    me = await client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+    return token, me.json()["data"]["id"]
+
+
+def _create_address(user_id: str) -> str:
+    with SessionLocal() as session:
+        address = models.Address(user_id=user_id, city="Teresina", state="PI", latitude=LATITUDE, longitude=LONGITUDE)
+        session.add(address)
+        session.commit()
+        return address.id
+
+
+class FeedClient:
+    """Conexão ociosa que só registra quando cada coleta chegou"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.received: dict[str, float] = {}
+        self.closed_code: int | None = None
+        self._socket = None
+        self._task: asyncio.Task | None = None
+
+    async def open(self):
+        self._socket = await connect(self.url, open_timeout=30, ping_interval=None, max_queue=None)
+        self._task = asyncio.create_task(self._listen())
+
+    async def _listen(self):
+        try:
+            async for raw in self._socket:
+                message = json.loads(raw)
+                if message["type"] == "pickup_created":
+                    self.received[message["data"]["id"]] = time.perf_counter()
+        except Exception:
+            pass
+        finally:
+            self.closed_code = self._socket.close_code
+
+    async def close(self):
+        await self._socket.close()
+        if self._task:
+            await self._task
+
+
+async def main(base_url: str, connections: int, events: int, idle_seconds: float, area_fraction: float, open_concurrency: int):
+    _raise_fd_limit(connections)
+    ws_base = base_url.replace("http", "ws", 1) + "/collector/feed"
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as http:
+        collector_token, _ = await _login(http, "COLETOR")
+        producer_token, producer_id = await _login(http, "PRODUTOR")
+        address_id = _create_address(producer_id)
+
+        filtered = int(connections * area_fraction)
+        urls = [
+            f"{ws_base}?token={collector_token}"
+            + (f"&latitude={LATITUDE}&longitude={LONGITUDE}&radius_km=5" if index < filtered else "")
+            for index in range(connections)
+        ]
+        clients = [FeedClient(url) for url in urls]
+
+        semaphore = asyncio.Semaphore(open_concurrency)
+        open_times: list[float] = []
+
+        async def open_one(client: FeedClient):
+            async with semaphore:
+                start = time.perf_counter()
+                await client.open()
+                open_times.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(open_one(client) for client in clients), return_exceptions=True)
+        open_elapsed = time.perf_counter() - start
+        failed_opens = sum(1 for result in results if isinstance(result, Exception))
+        print(
+            f"conexões={connections} (com área: {filtered}) abertas em {open_elapsed:.2f} s  falhas={failed_opens}  "
+            f"p50={_percentile(open_times, 0.5):.1f} ms  p95={_percentile(open_times, 0.95):.1f} ms"
+        )
+
+        await asyncio.sleep(idle_seconds)
+
+        sent: dict[str, float] = {}
+        headers = {"Authorization": f"Bearer {producer_token}"}
+        for _ in range(events):
+            before = set(clients[0].received)
+            response = await http.post("/residue/register_pickup", headers=headers, json={
+                "address_id": address_id,
+                "scheduled_time": "2030-01-01T10:00:00",
+                "items": [],
+            })
+            response.raise_for_status()
+            sent_at = time.perf_counter()
+            # O POST não retorna o ID; ele é descoberto pela primeira conexão que recebe a mensagem
+            for _ in range(200):
+                new = set(clients[0].received) - before
+                if new:
+                    sent[new.pop()] = sent_at
+                    break
+                await asyncio.sleep(0.005)
+
+        await asyncio.sleep(1)
+
+    open_clients = [client for client, result in zip(clients, results) if not isinstance(result, Exception)]
+    latencies = [
+        (client.received[pickup_id] - sent_at) * 1000
+        for client in open_clients
+        for pickup_id, sent_at in sent.items()
+        if pickup_id in client.received
+    ]
+    expected = len(open_clients) * len(sent)
+    dropped = sum(1 for client in open_clients if client.closed_code is not None)
+
+    print(f"eventos={events} identificados={len(sent)} entregas={len(latencies)}/{expected}  conexões derrubadas={dropped}")
+    if latencies:
+        print(
+            f"latência de entrega: p50={_percentile(latencies, 0.5):.1f} ms  p95={_percentile(latencies, 0.95):.1f} ms  "
+            f"p99={_percentile(latencies, 0.99):.1f} ms  max={max(latencies):.1f} ms  média={statistics.mean(latencies):.1f} ms"
+        )
+
+    await asyncio.gather(*(client.close() for client in open_clients), return_exceptions=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--idle-seconds", type=float, default=5)
+    parser.add_argument("--area-fraction", type=float, default=0.5, help="Fração das conexões com filtro de área")
+    parser.add_argument("--open-concurrency", type=int, default=200, help="Conexões abertas em paralelo")
+    args = parser.parse_args()
+    asyncio.run(main(args.base_url, args.connections, args.events, args.idle_seconds, args.area_fraction, args.open_concurrency))
@@ -14,17 +14,49 @@
         [...]
     def log_warn(*args):
         [...]
+
+    Backend de logging:
+        As funções log_* não escrevem no stdout: o registro vai para uma fila
+        (QueueHandler) e uma thread em segundo plano (QueueListener) formata e
+        escreve, então as rotas nunca bloqueiam no terminal ou no coletor de logs.
+        A fila é esvaziada no encerramento do processo (atexit) ou em flush().
+
+        Formato (LOG_FORMAT):
+            - json: uma linha JSON por log ({"ts", "level", "system", "message", ...campos})
+            - text: [SYSTEM] [INFO] mensagem, colorido se o terminal suportar
+            - auto (padrão): text em terminal interativo, json caso contrário (Docker, arquivos)
+
+        LOG_LEVEL define o nível mínimo (DEBUG, INFO, OK, WARN, ERROR; padrão INFO).
+        Campos extras podem ser passados por keyword: log_warn("msg", route="/x");
+        exc_info=True anexa o traceback da exceção sendo tratada (campo "exc").
 """
 
-import sys
+import atexit
+import json
+import logging
 import os
+import queue
+import sys
+import threading
+import traceback
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
-from colorama import Fore, Style, init
+from colorama import Fore, Style
 
 SYSTEM_NAME = "SYSTEM"
 
+# Nível entre INFO e WARNING para as mensagens de sucesso
+OK = 25
+logging.addLevelName(OK, "OK")
+
+_LEVEL_NAMES = {"DEBUG": logging.DEBUG, "INFO": logging.INFO, "OK": OK, "WARN": logging.WARNING, "WARNING": logging.WARNING, "ERROR": logging.ERROR}
+_TAGS = {logging.INFO: "INFO", OK: "OK", logging.WARNING: "WARN", logging.ERROR: "ERROR"}
+_COLORS = {logging.INFO: Fore.CYAN, OK: Fore.GREEN, logging.WARNING: Fore.YELLOW, logging.ERROR: Fore.RED}
+
+
 def _supportsColor() -> bool:
-    
+
     if not sys.stdout.isatty():
         return False
     if os.environ.get('TERM') in ('xterm', 'xterm-256color', 'screen', 'screen-256color'):
@@ -41,39 +73,113 @@ def _supportsColor() -> bool:
     return False
 
 
-def _systemNameTag() -> str:
-    if _supportsColor():
-        return f"{Fore.BLUE}[{SYSTEM_NAME}]{Style.RESET_ALL}"
-    return f"[{SYSTEM_NAME}]"
+# Capacidades do terminal detectadas uma única vez, na importação
+_COLOR = _supportsColor()
+_INTERACTIVE = sys.stdout.isatty()
+
+
+def _log_format() -> str:
+    value = os.getenv("LOG_FORMAT", "auto").strip().lower()
+    if value not in ("auto", "json", "text"):
+        raise ValueError(f"LOG_FORMAT inválido: {value}. Use auto, json ou text")
+    if value == "auto":
+        return "text" if _INTERACTIVE else "json"
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro, com os campos extras passados às funções log_*"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": _TAGS.get(record.levelno, record.levelname),
+            "system": SYSTEM_NAME,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Formato original: [SYSTEM] [INFO] mensagem, com cores quando suportadas"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        tag = _TAGS.get(record.levelno, record.levelname)
+        if _COLOR:
+            line = f"{Fore.BLUE}[{SYSTEM_NAME}]{Style.RESET_ALL} {_COLORS.get(record.levelno, '')}[{tag}]{Style.RESET_ALL} {record.getMessage()}"
+        else:
+            line = f"[{SYSTEM_NAME}] [{tag}] {record.getMessage()}"
+        fields = dict(getattr(record, "fields", None) or {})
+        exc = fields.pop("exc", None)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if exc:
+            line += "\n" + exc
+        return line
+
+
+def _build_logger() -> tuple[logging.Logger, QueueListener]:
+    records: queue.SimpleQueue = queue.SimpleQueue()
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if _log_format() == "json" else TextFormatter())
+    listener = QueueListener(records, stream, respect_handler_level=False)
+
+    logger = logging.getLogger("dbg")
+    logger.handlers.clear()
+    logger.addHandler(QueueHandler(records))
+    logger.setLevel(_LEVEL_NAMES.get(os.getenv("LOG_LEVEL", "INFO").strip().upper(), logging.INFO))
+    logger.propagate = False
+    return logger, listener
+
+
+_logger, _listener = _build_logger()
+_listener.start()
+
+# flush() para e reinicia o listener: o lock serializa chamadas concorrentes e
+# _listener_running indica se a thread de escrita está ativa (False após o encerramento)
+_listener_lock = threading.Lock()
+_listener_running = True
+
+
+def flush():
+    """Aguarda a thread de escrita esvaziar a fila (chamado automaticamente no encerramento)"""
+    with _listener_lock:
+        if not _listener_running:
+            return
+        _listener.stop()
+        _listener.start()
+
+
+def _shutdown():
+    global _listener_running
+    with _listener_lock:
+        if _listener_running:
+            _listener.stop()
+            _listener_running = False
+
 
-def _okTag() -> str:
-    if _supportsColor():
-        return f"{Fore.GREEN}[OK]{Style.RESET_ALL}"
-    return "[OK]"
+atexit.register(_shutdown)
 
-def _infoTag() -> str:
-    if _supportsColor():
-        return f"{Fore.CYAN}[INFO]{Style.RESET_ALL}"
-    return "[INFO]"
 
-def _errorTag() -> str:
-    if _supportsColor():
-        return f"{Fore.RED}[ERROR]{Style.RESET_ALL}"
-    return "[ERROR]"
+def _log(level: int, args: tuple, fields: dict):
+    if not _logger.isEnabledFor(level):
+        return
+    # O traceback é formatado aqui porque o QueueHandler descarta exc_info antes de enfileirar
+    if fields.pop("exc_info", False):
+        fields["exc"] = traceback.format_exc().rstrip()
+    _logger.log(level, " ".join(str(arg) for arg in args), extra={"fields": fields})
 
-def _warnTag() -> str:
-    if _supportsColor():
-        return f"{Fore.YELLOW}[WARN]{Style.RESET_ALL}"
-    return "[WARN]"
 
-def log_ok(*args):
-    print(_systemNameTag(), _okTag(), *args)
+def log_ok(*args, **fields):
+    _log(OK, args, fields)
 
-def log_info(*args):
-    print(_systemNameTag(), _infoTag(), *args)
+def log_info(*args, **fields):
+    _log(logging.INFO, args, fields)
 
-def log_error(*args):
-    print(_systemNameTag(), _errorTag(), *args)
+def log_error(*args, **fields):
+    _log(logging.ERROR, args, fields)
 
-def log_warn(*args):
-    print(_systemNameTag(), _warnTag(), *args)
\ No newline at end of file
+def log_warn(*args, **fields):
+    _log(logging.WARNING, args, fields)
@@ -1,14 +1,49 @@
 
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import Depends, FastAPI, HTTPException, Request, status
-from src.database.connection import create_database
+from fastapi.concurrency import run_in_threadpool
+from src.database.connection import DATABASE_URL, create_database, dispose_engines, engine_settings, warm_up_pool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from src.database.async_connection import async_engine
 from src.schemas import return_schema
-from src.routes import auth_router, residue_router
+from src.utils import hash_providers
+from src.utils.json_providers import FastJSONResponse
+from src.middlewares.request_metrics import RequestMetricsMiddleware, request_metrics
+from src.services.pickup_feed import pickup_feed
+from src.services.cluster_events import cluster_events
+from src.services.reward_pipeline import reward_worker
+from src.routes import auth_router, residue_router, health_router, collector_router, wallet_router, review_router, pickup_router, metrics_router, analytics_router, export_router
 
-app = FastAPI()
-create_database()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Inicialização e encerramento de cada worker
+
+    Em produção o schema não é criado aqui (use `python manage.py migrate` antes
+    de subir a API); o worker só abre as conexões do pool e, no PostgreSQL, o
+    LISTEN dos eventos entre workers, além da gravação periódica das métricas
+    em METRICS_MULTIPROC_DIR. No encerramento, as recompensas
+    enfileiradas são processadas antes de fechar os pools.
+    """
+    if engine_settings.auto_migrate:
+        await run_in_threadpool(create_database)
+    await warm_up_pool(engine_settings.pool_warmup)
+    await cluster_events.start(DATABASE_URL, async_engine)
+    metrics_snapshots = asyncio.create_task(request_metrics.run_snapshots())
+    yield
+    metrics_snapshots.cancel()
+    await asyncio.gather(metrics_snapshots, return_exceptions=True)
+    await cluster_events.stop()
+    pickup_feed.close_all()
+    await reward_worker.stop()
+    await dispose_engines()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,11 +51,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
+# Mais externo: mede também o CORS e os exception handlers
+app.add_middleware(RequestMetricsMiddleware)
 
 #routers
 app.include_router(auth_router.router)
 app.include_router(residue_router.router)
+app.include_router(collector_router.router)
+app.include_router(pickup_router.router)
+app.include_router(wallet_router.router)
+app.include_router(review_router.router)
+app.include_router(analytics_router.router)
+app.include_router(export_router.router)
+app.include_router(health_router.router)
+app.include_router(metrics_router.router)
 
 
 #handlers
@@ -43,3 +89,14 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 
     return JSONResponse(status_code=exc.status_code, content=dict(response))
 
+
+@app.exception_handler(hash_providers.HashExecutorBusy)
+async def hash_executor_busy_handler(request: Request, exc: hash_providers.HashExecutorBusy):
+
+    response = return_schema.ReturnError(errors=["Servidor ocupado, tente novamente em instantes."])
+
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=dict(response),
+        headers={"Retry-After": "1"},
+    )
@@ -0,0 +1,244 @@
+"""
+Comandos de manutenção do backend
+
+Uso (a partir de backend/):
+    python manage.py migrate               # cria as tabelas ou aplica as migrações pendentes
+    python manage.py migrate --status      # lista as migrações e se já foram aplicadas
+    python manage.py revoke-legacy-tokens  # remove refresh tokens ainda armazenados como bcrypt
+    python manage.py wallet-checkpoint     # grava checkpoints do extrato das carteiras
+    python manage.py wallet-reconcile      # confere o saldo das carteiras contra o extrato
+    python manage.py rewards-backfill      # gera recompensas de coletas entregues ainda sem recompensa
+    python manage.py ratings-rebuild       # recalcula o resumo de avaliações de todos os usuários
+    python manage.py analytics-rebuild     # recalcula os rollups de coletas (relatórios de analytics)
+    python manage.py seed --pickups 1000000  # gera dados sintéticos em volume (ou --size 2GB)
+"""
+
+import argparse
+import asyncio
+import time
+
+import dbg
+
+
+def cmd_migrate(args):
+    from src.database import migrate
+    from src.database.connection import engine
+
+    if args.status:
+        for version, description, applied in migrate.status(engine):
+            dbg.log_info(f"{version:04d} [{'x' if applied else ' '}] {description}")
+        return
+
+    applied = migrate.upgrade(engine)
+    if applied:
+        dbg.log_ok(f"Migrações aplicadas: {', '.join(map(str, applied))}")
+    else:
+        dbg.log_ok(f"Banco já está na versão {migrate.latest_version()}")
+
+
+def cmd_revoke_legacy_tokens(args):
+    from src.database.connection import SessionLocal
+    from src.database.repository import user_repo
+
+    with SessionLocal() as session:
+        revoked = user_repo.User(session).revoke_legacy_refresh_tokens()
+    dbg.log_ok(f"Refresh tokens bcrypt removidos: {revoked}")
+
+
+def cmd_wallet_checkpoint(args):
+    from src.database.async_connection import AsyncSessionLocal, async_engine
+    from src.services.wallet_service import WalletService
+
+    async def run():
+        try:
+            async with AsyncSessionLocal() as session:
+                return await WalletService(session).checkpoint(args.lag_seconds)
+        finally:
+            await async_engine.dispose()
+
+    created = asyncio.run(run())
+    dbg.log_ok(f"Checkpoints de carteira criados: {created}")
+
+
+def cmd_wallet_reconcile(args):
+    from src.database.async_connection import AsyncSessionLocal, async_engine
+    from src.services.wallet_service import WalletService
+
+    async def run():
+        try:
+            async with AsyncSessionLocal() as session:
+                return await WalletService(session).reconcile()
+        finally:
+            await async_engine.dispose()
+
+    mismatches = asyncio.run(run())
+    for item in mismatches:
+        dbg.log_warn(f"Carteira {item.wallet_id}: saldo {item.balance}, extrato {item.expected_balance}")
+    if mismatches:
+        dbg.log_error(f"Carteiras inconsistentes: {len(mismatches)}")
+        raise SystemExit(1)
+    dbg.log_ok("Todas as carteiras conferem com o extrato")
+
+
+def cmd_rewards_backfill(args):
+    from src.database.async_connection import AsyncSessionLocal, async_engine
+    from src.services import reward_pipeline
+
+    async def run():
+        total = 0
+        after = None
+        try:
+            while True:
+                async with AsyncSessionLocal() as session:
+                    pending = await reward_pipeline.pending_collections(session, args.batch_size, after)
+                    if not pending:
+                        break
+                    total += await reward_pipeline.process_collections(session, [row[0] for row in pending])
+                # coletas que não geram recompensa (ex.: sem produtor) ficam para trás do cursor
+                collection_id, delivered_at = pending[-1]
+                after = (delivered_at, collection_id)
+        finally:
+            await async_engine.dispose()
+        return total
+
+    total = asyncio.run(run())
+    dbg.log_ok(f"Recompensas geradas: {total}")
+
+
+def cmd_ratings_rebuild(args):
+    from src.database.async_connection import AsyncSessionLocal, async_engine
+    from src.database.repository import review_repo
+
+    async def run():
+        try:
+            async with AsyncSessionLocal() as session:
+                return await review_repo.AsyncReviewRepo(session).rebuild_summaries()
+        finally:
+            await async_engine.dispose()
+
+    rebuilt = asyncio.run(run())
+    dbg.log_ok(f"Resumos de avaliações recalculados: {rebuilt}")
+
+
+def cmd_analytics_rebuild(args):
+    from src.database.async_connection import AsyncSessionLocal, async_engine
+    from src.services.pickup_analytics import PickupRollupService
+
+    async def run():
+        try:
+            async with AsyncSessionLocal() as session:
+                return await PickupRollupService(session).rebuild()
+        finally:
+            await async_engine.dispose()
+
+    rows = asyncio.run(run())
+    dbg.log_ok(f"Rollups de coletas recalculados: {rows} linhas")
+
+
+def cmd_seed(args):
+    from src.database import seed
+    from src.database.async_connection import AsyncSessionLocal, async_engine
+    from src.database.connection import DATABASE_URL, create_database, engine
+    from src.services.pickup_analytics import PickupRollupService
+    from src.utils.hash_providers import generate_hash
+
+    try:
+        plan = seed.SeedPlan.build(
+            args.seed, pickups=args.pickups, size=args.size, users=args.users, days=args.days,
+            password_hash=generate_hash(seed.SEED_PASSWORD),
+        )
+    except ValueError as e:
+        dbg.log_error(str(e))
+        raise SystemExit(1)
+    workers = args.workers or seed.default_workers(DATABASE_URL)
+    create_database()
+    with engine.connect() as connection:
+        if seed.already_seeded(connection, plan):
+            dbg.log_error(f"A seed {plan.seed} já foi gerada neste banco; use outra --seed para somar dados")
+            raise SystemExit(1)
+    engine.dispose()
+
+    dbg.log_info(
+        f"Gerando {plan.users} usuários e {plan.pickups} coletas (seed {plan.seed}, {workers} workers, "
+        f"{'COPY' if seed.uses_copy(DATABASE_URL) else 'executemany'})",
+        estimated_gb=round(plan.pickups * plan.estimated_bytes_per_pickup() / 2**30, 2),
+    )
+    start = time.perf_counter()
+    last_log = start
+
+    def progress(rows: int, done: int, total: int):
+        nonlocal last_log
+        now = time.perf_counter()
+        if now - last_log >= 5 or done == total:
+            last_log = now
+            dbg.log_info(f"Blocos {done}/{total}: {rows} linhas ({rows / (now - start):.0f} linhas/s)")
+
+    counts = seed.seed_database(DATABASE_URL, plan, workers, progress)
+
+    async def rebuild_rollups():
+        try:
+            async with AsyncSessionLocal() as session:
+                return await PickupRollupService(session).rebuild()
+        finally:
+            await async_engine.dispose()
+
+    rollups = asyncio.run(rebuild_rollups())
+    for table, rows in counts.items():
+        dbg.log_info(f"{table}: {rows} linhas")
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as connection:
+            size = seed.postgres_table_bytes(connection, list(counts) + ["pickup_rollups"])
+        dbg.log_info(f"Tamanho das tabelas geradas: {size / 2**30:.2f} GB")
+    dbg.log_ok(
+        f"Dados gerados em {time.perf_counter() - start:.1f} s ({rollups} linhas de rollups); "
+        f"senha de todos os usuários: {seed.SEED_PASSWORD}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comandos de manutenção do Recicla Aí")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Aplica as migrações pendentes do banco")
+    migrate_parser.add_argument("--status", action="store_true", help="Apenas lista as migrações")
+    migrate_parser.set_defaults(func=cmd_migrate)
+
+    revoke_parser = subparsers.add_parser("revoke-legacy-tokens", help="Remove refresh tokens bcrypt antigos")
+    revoke_parser.set_defaults(func=cmd_revoke_legacy_tokens)
+
+    checkpoint_parser = subparsers.add_parser("wallet-checkpoint", help="Grava checkpoints do extrato das carteiras")
+    checkpoint_parser.add_argument(
+        "--lag-seconds", type=int, default=None,
+        help="Ignora transações mais recentes que isso (padrão: WALLET_CHECKPOINT_LAG_SECONDS)"
+    )
+    checkpoint_parser.set_defaults(func=cmd_wallet_checkpoint)
+
+    reconcile_parser = subparsers.add_parser("wallet-reconcile", help="Confere saldos contra o extrato")
+    reconcile_parser.set_defaults(func=cmd_wallet_reconcile)
+
+    rewards_parser = subparsers.add_parser("rewards-backfill", help="Gera recompensas de coletas entregues pendentes")
+    rewards_parser.add_argument("--batch-size", type=int, default=500, help="Coletas por transação")
+    rewards_parser.set_defaults(func=cmd_rewards_backfill)
+
+    ratings_parser = subparsers.add_parser("ratings-rebuild", help="Recalcula os resumos de avaliações")
+    ratings_parser.set_defaults(func=cmd_ratings_rebuild)
+
+    analytics_parser = subparsers.add_parser("analytics-rebuild", help="Recalcula os rollups de coletas")
+    analytics_parser.set_defaults(func=cmd_analytics_rebuild)
+
+    seed_parser = subparsers.add_parser("seed", help="Gera dados sintéticos em volume (banco de desenvolvimento)")
+    seed_size = seed_parser.add_mutually_exclusive_group(required=True)
+    seed_size.add_argument("--pickups", type=int, help="Quantidade de coletas (itens, entregas e usuários proporcionais)")
+    seed_size.add_argument("--size", help="Tamanho aproximado no banco, ex.: 500MB, 2GB")
+    seed_parser.add_argument("--users", type=int, default=None, help="Quantidade de usuários (padrão: coletas / 10, mínimo 3)")
+    seed_parser.add_argument("--days", type=int, default=365, help="Período coberto pelas datas geradas")
+    seed_parser.add_argument("--seed", type=int, default=1, help="Mesma seed gera os mesmos dados; use outra para somar dados")
+    seed_parser.add_argument("--workers", type=int, default=None, help="Processos geradores (padrão: CPUs; 1 no SQLite)")
+    seed_parser.set_defaults(func=cmd_seed)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import asyncio
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.schemas import residue_schema
+from src.services.cluster_events import cluster_events
+from src.utils.json_providers import EnvelopeSerializer
+
+# Tempo máximo que um worker serve o catálogo sem recarregar (cobre eventos perdidos entre workers)
+MATERIAL_CATALOG_TTL_SECONDS = float(os.getenv("MATERIAL_CATALOG_TTL_SECONDS", "60"))
+
+_catalog_serializer = EnvelopeSerializer(residue_schema.RecyclableMaterialOut)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Resposta do catálogo já serializada"""
+    version: int
+    etag: str
+    body: bytes
+    loaded_at: float
+
+
+class MaterialCatalog:
+    """
+    Cache versionado do catálogo de materiais recicláveis
+
+    Guarda a resposta de /residue/list_materials já serializada em JSON junto
+    com o ETag. O catálogo só muda quando um ADMIN registra um material, e o
+    repositório chama invalidate() nesse momento (repassado aos outros workers
+    por cluster_events).
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._snapshot: CatalogSnapshot | None = None
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self, snapshot: CatalogSnapshot | None) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.version == self.version
+            and time.monotonic() - snapshot.loaded_at < self.ttl_seconds
+        )
+
+    async def get(self, session: AsyncSession) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot
+
+        async with self._lock:
+            # Outra requisição pode ter recarregado enquanto esperávamos o lock
+            if self._is_fresh(self._snapshot):
+                return self._snapshot
+
+            from src.database.repository import residue_repo
+
+            version = self.version
+            materials = await residue_repo.AsyncResidueRepo(session).get_all_recyclable_materials()
+            body = _catalog_serializer.render(materials)
+            snapshot = CatalogSnapshot(
+                version=version,
+                etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+                body=body,
+                loaded_at=time.monotonic(),
+            )
+            # Só publica se não houve invalidação durante a carga
+            if version == self.version:
+                self._snapshot = snapshot
+            return snapshot
+
+    def invalidate(self, broadcast: bool = True):
+        self.version += 1
+        self._snapshot = None
+        if broadcast:
+            cluster_events.publish("materials")
+
+
+material_catalog = MaterialCatalog(MATERIAL_CATALOG_TTL_SECONDS)
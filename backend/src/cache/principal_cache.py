@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.models import models
+from src.services.cluster_events import cluster_events
+
+# Tempo de vida de cada entrada (0 desativa o cache) e quantidade máxima de usuários em memória
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000"))
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Dados do usuário autenticado necessários para autorizar uma requisição"""
+    id: str
+    name: str
+    email: str
+    role: str
+    is_active: bool
+    created_at: datetime | None
+
+    @classmethod
+    def from_user(cls, user: models.User) -> "Principal":
+        return cls(
+            id=str(user.id),
+            name=user.name,
+            email=user.email,
+            role=user.role,
+            is_active=bool(user.is_active),
+            created_at=user.created_at,
+        )
+
+
+class PrincipalCache:
+    """
+    Cache LRU com TTL dos usuários autenticados, indexado pelo id
+
+    Evita o SELECT em users a cada requisição autenticada. Os repositórios
+    invalidam a entrada sempre que is_active, role ou senha mudam; a
+    invalidação é repassada aos outros workers por cluster_events (sem o
+    PostgreSQL, a mudança aparece nos outros workers em até ttl_seconds).
+
+    Cada usuário tem um contador de geração incrementado por invalidate(): quem
+    carrega do banco lê a geração antes da consulta e a passa para set(), que
+    descarta o resultado se houve invalidação no meio (senão um logout
+    concorrente seria sobrescrito pelo principal antigo por ttl_seconds).
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+        # Gerações por usuário; _epoch muda quando o dicionário é descartado para não crescer sem limite
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def get(self, user_id: str) -> Principal | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, user_id: str) -> tuple[int, int]:
+        """Marca a ser lida antes de carregar o usuário do banco e repassada a set()"""
+        with self._lock:
+            return self._epoch, self._generations.get(str(user_id), 0)
+
+    def set(self, principal: Principal, generation: tuple[int, int] | None = None):
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation is not None and generation != (self._epoch, self._generations.get(principal.id, 0)):
+                return  # invalidado durante a carga: o principal lido pode estar velho
+            self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str, broadcast: bool = True):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+            if len(self._generations) >= 2 * self.max_size:
+                self._generations.clear()
+                self._epoch += 1
+            self._generations[str(user_id)] = self._generations.get(str(user_id), 0) + 1
+        if broadcast:
+            cluster_events.publish("principal", user_id=str(user_id))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+principal_cache = PrincipalCache(AUTH_CACHE_MAX_SIZE, AUTH_CACHE_TTL_SECONDS)
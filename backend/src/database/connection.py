@@ -5,24 +5,68 @@ from contextlib import contextmanager
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
+import dbg
+
+from src.database.settings import EngineSettings
+from src.database.pool_metrics import InstrumentedQueuePool, instrument_engine, pool_metrics
+from src.database.query_metrics import instrument_queries
+
+# Caminho explícito: evita a busca do .env pela pilha de chamadas e diretórios pais
+BASE_DIR = Path(__file__).resolve().parents[2]
+load_dotenv(BASE_DIR / ".env")
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL não está configurada no .env")
 
-engine = create_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine_settings = EngineSettings.from_env()
+engine_kwargs = engine_settings.engine_kwargs(DATABASE_URL)
+if "pool_size" in engine_kwargs:
+    engine_kwargs["poolclass"] = InstrumentedQueuePool
 
-# Importa Base dos models
-from src.models.models import Base
+engine = create_engine(DATABASE_URL, **engine_kwargs)
+instrument_engine(engine)
+instrument_queries(engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 def create_database():
-    """Cria todas as tabelas no banco de dados"""
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created!")
+    """Cria as tabelas ou aplica as migrações pendentes (ver src/database/migrate.py)"""
+    from src.database import migrate
+
+    applied = migrate.upgrade(engine)
+    if applied:
+        dbg.log_ok("Migrações aplicadas", versions=applied)
+    else:
+        dbg.log_info("Schema do banco já está atualizado")
+
+
+async def warm_up_pool(connections: int):
+    """
+    Abre conexões no pool assíncrono antes da primeira requisição
+
+    As conexões são abertas em paralelo e devolvidas ao pool, de modo que as
+    primeiras requisições não pagam o handshake com o banco.
+    """
+    import asyncio
+    from sqlalchemy import text
+    from src.database.async_connection import async_engine
+
+    async def connect_one():
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    if connections > 0:
+        await asyncio.gather(*(connect_one() for _ in range(connections)))
+
+
+async def dispose_engines():
+    """Fecha as conexões dos pools (encerramento do worker)"""
+    from src.database.async_connection import async_engine
+
+    await async_engine.dispose()
+    engine.dispose()
 
 
 def get_db():
@@ -31,4 +75,23 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_pool_metrics() -> dict:
+    """Retorna as métricas de uso do pool de conexões junto com a configuração atual"""
+    metrics = pool_metrics.snapshot()
+    from src.database.async_connection import async_engine
+
+    metrics.update(
+        profile=engine_settings.profile,
+        pool_class=type(async_engine.pool).__name__,
+        pool_status=async_engine.pool.status(),
+        sync_pool_status=engine.pool.status(),
+    )
+    if "pool_size" in engine_kwargs:
+        metrics.update(
+            pool_size=engine_settings.pool_size,
+            max_overflow=engine_settings.max_overflow,
+        )
+    return metrics
@@ -0,0 +1,21 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# insert() com suporte a ON CONFLICT para cada dialeto usado pelo projeto
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def dialect_insert(session: AsyncSession, table):
+    """
+    Retorna o insert() do dialeto da sessão, que aceita on_conflict_do_nothing/on_conflict_do_update
+
+    Uso:
+        stmt = dialect_insert(session, models.Wallet).values(...).on_conflict_do_nothing(index_elements=["user_id"])
+    """
+    name = session.bind.dialect.name
+    if name not in _INSERTS:
+        raise NotImplementedError(f"Upsert não suportado para o dialeto {name}")
+    return _INSERTS[name](table)
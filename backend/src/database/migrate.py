@@ -0,0 +1,90 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, TIMESTAMP, inspect, select
+from sqlalchemy.engine import Engine
+
+from src.database.migrations import MIGRATIONS
+from src.models.models import Base
+
+# Versão do schema original, anterior ao controle de migrações
+BASELINE_VERSION = 1
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200)),
+    Column("applied_at", TIMESTAMP),
+)
+
+
+def latest_version() -> int:
+    return max([BASELINE_VERSION] + [migration.VERSION for migration in MIGRATIONS])
+
+
+def current_version(engine: Engine) -> int | None:
+    """Versão aplicada no banco; None se o banco ainda não tem tabelas"""
+    inspector = inspect(engine)
+    if not inspector.has_table(schema_migrations.name):
+        return BASELINE_VERSION if inspector.has_table("users") else None
+
+    with engine.connect() as connection:
+        versions = connection.execute(select(schema_migrations.c.version)).scalars().all()
+    return max(versions, default=BASELINE_VERSION)
+
+
+def _record(connection, version: int, description: str):
+    connection.execute(schema_migrations.insert().values(
+        version=version,
+        description=description,
+        applied_at=datetime.now(),
+    ))
+
+
+def upgrade(engine: Engine) -> list[int]:
+    """
+    Leva o banco para a versão mais recente do schema
+
+    Banco vazio: cria todas as tabelas a partir dos models e marca todas as
+    migrações como aplicadas. Banco existente: aplica, em ordem e cada uma em
+    sua própria transação, as migrações com versão maior que a atual.
+
+    Returns:
+        Versões aplicadas nesta execução
+    """
+    version = current_version(engine)
+
+    if version is None:
+        with engine.begin() as connection:
+            Base.metadata.create_all(bind=connection)
+            _metadata.create_all(bind=connection)
+            _record(connection, BASELINE_VERSION, "Schema inicial")
+            for migration in MIGRATIONS:
+                _record(connection, migration.VERSION, migration.DESCRIPTION)
+        return [BASELINE_VERSION] + [migration.VERSION for migration in MIGRATIONS]
+
+    with engine.begin() as connection:
+        if not inspect(connection).has_table(schema_migrations.name):
+            _metadata.create_all(bind=connection)
+            _record(connection, BASELINE_VERSION, "Schema inicial")
+
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda migration: migration.VERSION):
+        if migration.VERSION <= version:
+            continue
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            _record(connection, migration.VERSION, migration.DESCRIPTION)
+        applied.append(migration.VERSION)
+    return applied
+
+
+def status(engine: Engine) -> list[tuple[int, str, bool]]:
+    """Lista (versão, descrição, aplicada) de todas as migrações conhecidas"""
+    version = current_version(engine) or 0
+    return [(BASELINE_VERSION, "Schema inicial", version >= BASELINE_VERSION)] + [
+        (migration.VERSION, migration.DESCRIPTION, migration.VERSION <= version)
+        for migration in sorted(MIGRATIONS, key=lambda migration: migration.VERSION)
+    ]
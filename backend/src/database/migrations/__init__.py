@@ -0,0 +1,20 @@
+from src.database.migrations import (
+    m0002_fk_indexes,
+    m0003_wallet_ledger,
+    m0004_reward_pipeline,
+    m0005_rating_summaries,
+    m0006_pickup_rollups,
+    m0007_export_indexes,
+    m0008_native_uuid,
+)
+
+# Migrações em ordem de versão. A versão 1 é o schema original criado por create_all.
+MIGRATIONS = [
+    m0002_fk_indexes,
+    m0003_wallet_ledger,
+    m0004_reward_pipeline,
+    m0005_rating_summaries,
+    m0006_pickup_rollups,
+    m0007_export_indexes,
+    m0008_native_uuid,
+]
@@ -0,0 +1,28 @@
+from sqlalchemy import text
+
+VERSION = 2
+DESCRIPTION = "Índices nas chaves estrangeiras e índices compostos de acesso frequente"
+
+# (nome do índice, tabela, colunas) - devem bater com os Index/index=True de models.py
+INDEXES = [
+    ("ix_addresses_user_id", "addresses", "user_id"),
+    ("ix_pickup_requests_address_id", "pickup_requests", "address_id"),
+    ("ix_pickup_requests_producer_id_created_at", "pickup_requests", "producer_id, created_at"),
+    ("ix_pickup_requests_status_scheduled_time", "pickup_requests", "status, scheduled_time"),
+    ("ix_pickup_request_items_request_id", "pickup_request_items", "request_id"),
+    ("ix_pickup_request_items_material_id", "pickup_request_items", "material_id"),
+    ("ix_collections_request_id", "collections", "request_id"),
+    ("ix_collections_collector_id", "collections", "collector_id"),
+    ("ix_collections_destination_cooperative_id", "collections", "destination_cooperative_id"),
+    ("ix_rewards_user_id", "rewards", "user_id"),
+    ("ix_rewards_collection_id", "rewards", "collection_id"),
+    ("ix_wallet_user_id", "wallet", "user_id"),
+    ("ix_wallet_transactions_wallet_id_created_at", "wallet_transactions", "wallet_id, created_at"),
+    ("ix_reviews_reviewer_id", "reviews", "reviewer_id"),
+    ("ix_reviews_reviewed_user_id", "reviews", "reviewed_user_id"),
+]
+
+
+def upgrade(connection):
+    for name, table, columns in INDEXES:
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, DECIMAL, ForeignKey, Index, MetaData, String, Table, TIMESTAMP, text
+from sqlalchemy.sql import func
+
+VERSION = 3
+DESCRIPTION = "Carteira única por usuário e checkpoints do extrato"
+
+_metadata = MetaData()
+
+# Apenas a chave primária, para resolver a chave estrangeira
+Table("wallet", _metadata, Column("id", String(36), primary_key=True))
+
+# Cópia congelada da tabela no momento desta migração
+wallet_checkpoints = Table(
+    "wallet_checkpoints",
+    _metadata,
+    Column("id", String(36), primary_key=True),
+    Column("wallet_id", String(36), ForeignKey("wallet.id"), nullable=False),
+    Column("balance", DECIMAL(12, 2), nullable=False),
+    Column("as_of", TIMESTAMP, nullable=False),
+    Column("created_at", TIMESTAMP, server_default=func.now()),
+    Index("ix_wallet_checkpoints_wallet_id_as_of", "wallet_id", "as_of"),
+)
+
+
+def upgrade(connection):
+    connection.execute(text("DROP INDEX IF EXISTS ix_wallet_user_id"))
+    connection.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_wallet_user_id ON wallet (user_id)"))
+    _metadata.create_all(bind=connection, tables=[wallet_checkpoints])
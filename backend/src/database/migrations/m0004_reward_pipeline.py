@@ -0,0 +1,14 @@
+from sqlalchemy import text
+
+VERSION = 4
+DESCRIPTION = "Valores de recompensa por material e recompensa única por coleta"
+
+
+def upgrade(connection):
+    for column in ("reward_per_kg", "reward_per_unit"):
+        connection.execute(text(
+            f"ALTER TABLE recyclable_materials ADD COLUMN {column} DECIMAL(10, 2) NOT NULL DEFAULT 0"
+        ))
+    connection.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_rewards_collection_id_user_id ON rewards (collection_id, user_id)"
+    ))
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table, TIMESTAMP, text
+from sqlalchemy.sql import func
+
+VERSION = 5
+DESCRIPTION = "Resumo das avaliações por usuário"
+
+_metadata = MetaData()
+
+# Apenas a chave primária, para resolver a chave estrangeira
+Table("users", _metadata, Column("id", String(36), primary_key=True))
+
+
+def _counter(name):
+    return Column(name, Integer, nullable=False, default=0, server_default="0")
+
+
+# Cópia congelada da tabela no momento desta migração
+rating_summaries = Table(
+    "rating_summaries",
+    _metadata,
+    Column("user_id", String(36), ForeignKey("users.id"), primary_key=True),
+    _counter("review_count"),
+    _counter("rating_sum"),
+    *[_counter(f"rating_{rating}") for rating in range(1, 6)],
+    Column("updated_at", TIMESTAMP, server_default=func.now()),
+)
+
+
+def upgrade(connection):
+    _metadata.create_all(bind=connection, tables=[rating_summaries])
+    histogram = ", ".join(
+        f"SUM(CASE WHEN rating = {rating} THEN 1 ELSE 0 END)" for rating in range(1, 6)
+    )
+    connection.execute(text(
+        "INSERT INTO rating_summaries "
+        "(user_id, review_count, rating_sum, rating_1, rating_2, rating_3, rating_4, rating_5) "
+        f"SELECT reviewed_user_id, COUNT(*), SUM(rating), {histogram} "
+        "FROM reviews WHERE reviewed_user_id IS NOT NULL AND rating IS NOT NULL "
+        "GROUP BY reviewed_user_id"
+    ))
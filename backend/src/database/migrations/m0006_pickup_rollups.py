@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Date, DECIMAL, Integer, MetaData, String, Table, text
+
+VERSION = 6
+DESCRIPTION = "Totais diários de coletas por material, cidade e status (analytics)"
+
+_metadata = MetaData()
+
+
+def _counter(name):
+    return Column(name, Integer, nullable=False, default=0, server_default="0")
+
+
+# Cópia congelada da tabela no momento desta migração
+pickup_rollups = Table(
+    "pickup_rollups",
+    _metadata,
+    Column("bucket_date", Date, primary_key=True),
+    Column("material_id", String(36), primary_key=True),
+    Column("city", String(100), primary_key=True),
+    Column("status", String(20), primary_key=True),
+    _counter("item_count"),
+    _counter("quantity"),
+    Column("weight_kg", DECIMAL(14, 2), nullable=False, default=0, server_default="0"),
+)
+
+
+def upgrade(connection):
+    _metadata.create_all(bind=connection, tables=[pickup_rollups])
+    connection.execute(text(
+        "INSERT INTO pickup_rollups (bucket_date, material_id, city, status, item_count, quantity, weight_kg) "
+        "SELECT date(COALESCE(p.scheduled_time, p.created_at)), COALESCE(i.material_id, ''), COALESCE(a.city, ''), "
+        "p.status, COUNT(i.id), COALESCE(SUM(i.quantity), 0), COALESCE(SUM(i.weight_kg), 0) "
+        "FROM pickup_request_items i "
+        "JOIN pickup_requests p ON p.id = i.request_id "
+        "LEFT JOIN addresses a ON a.id = p.address_id "
+        "WHERE p.status IS NOT NULL AND COALESCE(p.scheduled_time, p.created_at) IS NOT NULL "
+        "GROUP BY 1, 2, 3, 4"
+    ))
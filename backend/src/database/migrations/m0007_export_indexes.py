@@ -0,0 +1,15 @@
+from sqlalchemy import text
+
+VERSION = 7
+DESCRIPTION = "Índices por data para o export do histórico de coletas e entregas"
+
+# (nome do índice, tabela, colunas) - devem bater com os Index de models.py
+INDEXES = [
+    ("ix_pickup_requests_created_at_id", "pickup_requests", "created_at, id"),
+    ("ix_collections_delivered_at_id", "collections", "delivered_at, id"),
+]
+
+
+def upgrade(connection):
+    for name, table, columns in INDEXES:
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
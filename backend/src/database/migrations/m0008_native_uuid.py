@@ -0,0 +1,68 @@
+from sqlalchemy import inspect, text
+
+VERSION = 8
+DESCRIPTION = "Chaves primárias e estrangeiras como UUID nativo no PostgreSQL"
+
+# (tabela, coluna) de todas as chaves em UUID no momento desta migração
+UUID_COLUMNS = [
+    ("recyclable_materials", "id"),
+    ("users", "id"),
+    ("addresses", "id"),
+    ("addresses", "user_id"),
+    ("rating_summaries", "user_id"),
+    ("reviews", "id"),
+    ("reviews", "reviewer_id"),
+    ("reviews", "reviewed_user_id"),
+    ("wallet", "id"),
+    ("wallet", "user_id"),
+    ("pickup_requests", "id"),
+    ("pickup_requests", "producer_id"),
+    ("pickup_requests", "address_id"),
+    ("wallet_checkpoints", "id"),
+    ("wallet_checkpoints", "wallet_id"),
+    ("wallet_transactions", "id"),
+    ("wallet_transactions", "wallet_id"),
+    ("collections", "id"),
+    ("collections", "request_id"),
+    ("collections", "collector_id"),
+    ("collections", "destination_cooperative_id"),
+    ("pickup_request_items", "id"),
+    ("pickup_request_items", "request_id"),
+    ("pickup_request_items", "material_id"),
+    ("rewards", "id"),
+    ("rewards", "user_id"),
+    ("rewards", "collection_id"),
+]
+
+
+def upgrade(connection):
+    # No SQLite a coluna continua texto (mesmo armazenamento de antes)
+    if connection.dialect.name != "postgresql":
+        return
+
+    inspector = inspect(connection)
+    columns = set(UUID_COLUMNS)
+    tables = sorted({table for table, _ in UUID_COLUMNS})
+
+    # O tipo das duas pontas de uma FK precisa ser igual: remove as FKs envolvidas,
+    # converte as colunas e recria as FKs com o mesmo nome e ON DELETE
+    foreign_keys = [
+        (table, fk)
+        for table in tables
+        for fk in inspector.get_foreign_keys(table)
+        if any((table, column) in columns for column in fk["constrained_columns"])
+    ]
+    for table, fk in foreign_keys:
+        connection.execute(text(f'ALTER TABLE {table} DROP CONSTRAINT "{fk["name"]}"'))
+
+    for table, column in UUID_COLUMNS:
+        connection.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE uuid USING {column}::uuid"))
+
+    for table, fk in foreign_keys:
+        ondelete = fk.get("options", {}).get("ondelete")
+        connection.execute(text(
+            f'ALTER TABLE {table} ADD CONSTRAINT "{fk["name"]}" '
+            f'FOREIGN KEY ({", ".join(fk["constrained_columns"])}) '
+            f'REFERENCES {fk["referred_table"]} ({", ".join(fk["referred_columns"])})'
+            + (f" ON DELETE {ondelete}" if ondelete else "")
+        ))
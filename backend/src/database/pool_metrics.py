@@ -0,0 +1,115 @@
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """
+    Contadores de uso do pool de conexões
+
+    Permite dimensionar pool_size/max_overflow de acordo com a quantidade de
+    workers do uvicorn: se wait_count cresce ou peak_checked_out encosta em
+    pool_size + max_overflow, o pool está pequeno para a carga.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.checked_out = 0
+            self.peak_checked_out = 0
+            self.wait_count = 0
+            self.wait_time_total = 0.0
+            self.wait_time_max = 0.0
+            self.timeouts = 0
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_checkout(self):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def record_checkin(self):
+        with self._lock:
+            self.checkins += 1
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "wait_count": self.wait_count,
+                "wait_time_total_seconds": round(self.wait_time_total, 6),
+                "wait_time_max_seconds": round(self.wait_time_max, 6),
+                "timeouts": self.timeouts,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+# Esperas menores que isso são apenas o custo de pegar uma conexão livre
+_WAIT_THRESHOLD_SECONDS = 0.001
+
+
+class _WaitTimingMixin:
+    """Mede o tempo de espera por uma conexão livre no pool"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        elapsed = time.perf_counter() - start
+        if elapsed >= _WAIT_THRESHOLD_SECONDS:
+            pool_metrics.record_wait(elapsed)
+        return connection
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    """QueuePool da engine síncrona com medição de espera"""
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool da engine assíncrona com medição de espera"""
+
+
+def instrument_engine(engine: Engine):
+    """Registra os eventos de pool que alimentam pool_metrics"""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        pool_metrics.record_connect()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_metrics.record_checkout()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        pool_metrics.record_checkin()
@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Execuções do mesmo statement numa única requisição a partir das quais ela é marcada como N+1
+QUERY_N_PLUS_ONE_THRESHOLD = int(os.getenv("QUERY_N_PLUS_ONE_THRESHOLD", "10"))
+
+
+class QueryStats:
+    """
+    Queries executadas durante uma requisição
+
+    Os statements são contados pelo texto SQL já parametrizado: a mesma query
+    repetida com parâmetros diferentes (o padrão N+1) soma no mesmo contador.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            self.statements[statement] += 1
+
+    def most_repeated(self) -> tuple[str, int] | None:
+        """Statement mais repetido e quantas vezes rodou, ou None sem queries"""
+        with self._lock:
+            common = self.statements.most_common(1)
+        return common[0] if common else None
+
+    def n_plus_one(self, threshold: int = QUERY_N_PLUS_ONE_THRESHOLD) -> tuple[str, int] | None:
+        """Statement repetido ao menos threshold vezes (suspeita de N+1), ou None"""
+        repeated = self.most_repeated()
+        if threshold > 0 and repeated and repeated[1] >= threshold:
+            return repeated
+        return None
+
+
+# Estatísticas da requisição atual (definidas pelo RequestMetricsMiddleware)
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+class _BackgroundQueries:
+    """Queries executadas fora de requisições (workers, lifespan, comandos)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.seconds = 0.0
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+
+
+background_queries = _BackgroundQueries()
+
+
+def instrument_queries(engine: Engine):
+    """Registra os eventos de execução que medem tempo e quantidade de queries"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = current_query_stats.get()
+        if stats is None:
+            background_queries.record(elapsed)
+        else:
+            stats.record(statement, elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start"):
+            connection.info["query_start"].pop()
@@ -0,0 +1,63 @@
+import dbg
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models import models
+
+
+class AsyncCollectionRepo:
+    """Consultas de coletas (Collection) usadas pelas rotas dos coletores"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_accepted_stops(self, collector_id: str) -> list:
+        """
+        Coletas aceitas pelo coletor e ainda não coletadas, com as coordenadas do endereço
+
+        Returns:
+            Linhas com pickup_id, address_id, city, latitude, longitude e scheduled_time
+        """
+        try:
+            result = await self.db.execute(
+                select(
+                    models.PickupRequest.id.label("pickup_id"),
+                    models.PickupRequest.address_id,
+                    models.PickupRequest.scheduled_time,
+                    models.Address.city,
+                    models.Address.latitude,
+                    models.Address.longitude,
+                )
+                .select_from(models.Collection)
+                .join(models.PickupRequest, models.PickupRequest.id == models.Collection.request_id)
+                .outerjoin(models.Address, models.Address.id == models.PickupRequest.address_id)
+                .where(
+                    models.Collection.collector_id == collector_id,
+                    models.Collection.delivered_at.is_(None),
+                    models.PickupRequest.status == "ACEITA",
+                )
+                .order_by(models.PickupRequest.scheduled_time)
+            )
+            return list(result.all())
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            raise
+
+    async def get_cooperative_location(self, cooperative_id: str) -> tuple[float, float] | None:
+        """Latitude e longitude do primeiro endereço com coordenadas da cooperativa"""
+        try:
+            result = await self.db.execute(
+                select(models.Address.latitude, models.Address.longitude)
+                .join(models.User, models.User.id == models.Address.user_id)
+                .where(
+                    models.User.id == cooperative_id,
+                    models.User.role == "COOPERATIVA",
+                    models.Address.latitude.is_not(None),
+                    models.Address.longitude.is_not(None),
+                )
+                .limit(1)
+            )
+            row = result.first()
+            return (float(row.latitude), float(row.longitude)) if row else None
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            raise
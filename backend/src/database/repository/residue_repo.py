@@ -1,8 +1,14 @@
-import logging
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+import dbg
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, and_, select, insert
 from src.schemas import residue_schema as prs
 from src.models import models
+from src.cache.material_catalog import material_catalog
+from src.services.spatial_index import pending_pickup_index
+from src.services.pickup_feed import pickup_feed
+from src.services.cluster_events import cluster_events
+from src.services.pickup_analytics import PickupRollupService
 from datetime import datetime
 
 
@@ -15,14 +21,17 @@ class ResidueRepo:
         try:
             db_material = models.RecyclableMaterial(
                 type=material.type,
-                description=material.description
+                description=material.description,
+                reward_per_kg=material.reward_per_kg,
+                reward_per_unit=material.reward_per_unit
             )
             self.db.add(db_material)
             self.db.commit()
             self.db.refresh(db_material)
+            material_catalog.invalidate()
             return db_material
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             self.db.rollback()
             raise
     
@@ -35,7 +44,8 @@ class ResidueRepo:
                 producer_id=producer_id,
                 address_id=pickup_request.address_id,
                 scheduled_time=pickup_request.scheduled_time,
-                status="PENDENTE"
+                status="PENDENTE",
+                created_at=datetime.now()
             )
             self.db.add(db_pickup_request)
             self.db.flush()  # To get the ID before committing
@@ -56,7 +66,7 @@ class ResidueRepo:
 
             return db_pickup_request
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             self.db.rollback()
             raise
 
@@ -64,7 +74,54 @@ class ResidueRepo:
         try:
             return self.db.query(models.PickupRequest).filter(models.PickupRequest.producer_id == producer_id).all()
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
+            self.db.rollback()
+            raise
+
+    def get_pickup_requests_page(
+        self,
+        producer_id: str,
+        limit: int,
+        cursor: tuple[datetime, str] | None = None
+    ) -> tuple[list[models.PickupRequest], bool]:
+        """
+        Lista as coletas do produtor com paginação por cursor (keyset)
+
+        Os itens são carregados junto com as coletas via selectinload,
+        totalizando duas queries por página independente do tamanho do histórico.
+        A ordenação é (created_at, id) decrescente; o cursor é a chave do último
+        item da página anterior.
+
+        Returns:
+            Tupla (coletas da página, existe próxima página)
+        """
+        try:
+            query = (
+                self.db.query(models.PickupRequest)
+                .options(selectinload(models.PickupRequest.items))
+                .filter(models.PickupRequest.producer_id == producer_id)
+            )
+
+            if cursor:
+                created_at, pickup_id = cursor
+                query = query.filter(
+                    or_(
+                        models.PickupRequest.created_at < created_at,
+                        and_(
+                            models.PickupRequest.created_at == created_at,
+                            models.PickupRequest.id < pickup_id
+                        )
+                    )
+                )
+
+            pickups = (
+                query.order_by(models.PickupRequest.created_at.desc(), models.PickupRequest.id.desc())
+                .limit(limit + 1)
+                .all()
+            )
+            return pickups[:limit], len(pickups) > limit
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
             self.db.rollback()
             raise
 
@@ -72,6 +129,230 @@ class ResidueRepo:
         try:
             return self.db.query(models.PickupRequestItem).filter(models.PickupRequestItem.request_id == pickup_request_id).all()
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             self.db.rollback()
             raise
+
+
+class AsyncResidueRepo:
+    """Versão assíncrona do ResidueRepo, usada pelas rotas com AsyncSession"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def register_recyclable_material(self, material: prs.RecyclableMaterial) -> models.RecyclableMaterial:
+        try:
+            db_material = models.RecyclableMaterial(
+                type=material.type,
+                description=material.description,
+                reward_per_kg=material.reward_per_kg,
+                reward_per_unit=material.reward_per_unit
+            )
+            self.db.add(db_material)
+            await self.db.commit()
+            await self.db.refresh(db_material)
+            material_catalog.invalidate()
+            return db_material
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            raise
+
+    async def get_all_recyclable_materials(self) -> list[models.RecyclableMaterial]:
+        result = await self.db.execute(select(models.RecyclableMaterial))
+        return list(result.scalars().all())
+
+    async def create_pickup_request(self, pickup_request: prs.PickupRequest, producer_id: str) -> models.PickupRequest:
+        try:
+            db_pickup_request = models.PickupRequest(
+                producer_id=producer_id,
+                address_id=pickup_request.address_id,
+                scheduled_time=pickup_request.scheduled_time,
+                status="PENDENTE",
+                created_at=datetime.now(),
+                items=[
+                    models.PickupRequestItem(
+                        material_id=item.material_id,
+                        quantity=item.quantity,
+                        weight_kg=item.weight_kg
+                    )
+                    for item in pickup_request.items
+                ]
+            )
+            self.db.add(db_pickup_request)
+            await self.db.flush()
+            await PickupRollupService(self.db).add_pickups([db_pickup_request.id])
+            await self.db.commit()
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            raise
+
+        await self._notify_pickups_created([db_pickup_request.id])
+        return db_pickup_request
+
+    async def _notify_pickups_created(self, pickup_ids: list[str]):
+        """
+        Atualiza o índice espacial e o feed dos coletores depois do commit
+
+        Os outros workers recebem as coletas por cluster_events. A coleta já
+        está gravada: uma falha aqui é só registrada no log e não falha a
+        requisição (o índice é recarregado do banco periodicamente).
+        """
+        cluster_events.publish("pickups_created", ids=[str(pickup_id) for pickup_id in pickup_ids])
+        try:
+            points = await pending_pickup_index.on_pickups_created(
+                self.db, pickup_ids, load_points=pickup_feed.has_subscribers
+            )
+            pickup_feed.publish_created(points)
+        except Exception as error:
+            dbg.log_error(f"Falha ao publicar coletas criadas: {error}", pickups=len(pickup_ids))
+
+    async def get_pickup_reference_ids(
+        self,
+        producer_id: str,
+        address_ids: set[str],
+        material_ids: set[str]
+    ) -> tuple[set[str], set[str]]:
+        """
+        Busca, em uma query por tabela, quais endereços do produtor e quais materiais existem
+
+        Returns:
+            Tupla (IDs de endereços do produtor encontrados, IDs de materiais encontrados)
+        """
+        found_addresses = set()
+        found_materials = set()
+
+        if address_ids:
+            result = await self.db.execute(
+                select(models.Address.id).where(
+                    models.Address.id.in_(address_ids),
+                    models.Address.user_id == producer_id
+                )
+            )
+            found_addresses = {str(address_id) for address_id in result.scalars().all()}
+
+        if material_ids:
+            result = await self.db.execute(
+                select(models.RecyclableMaterial.id).where(models.RecyclableMaterial.id.in_(material_ids))
+            )
+            found_materials = {str(material_id) for material_id in result.scalars().all()}
+
+        return found_addresses, found_materials
+
+    async def create_pickup_requests_bulk(
+        self,
+        pickup_requests: list[prs.PickupRequest],
+        producer_id: str
+    ) -> list[str]:
+        """
+        Cria várias coletas e seus itens em uma única transação
+
+        Os IDs são gerados na aplicação, então as coletas e os itens são inseridos
+        com um INSERT multi-linha (executemany) por tabela, sem flush/refresh por coleta.
+
+        Returns:
+            IDs das coletas criadas, na mesma ordem de pickup_requests
+        """
+        try:
+            now = datetime.now()
+            pickup_rows = []
+            item_rows = []
+
+            for pickup_request in pickup_requests:
+                pickup_id = models.generate_uuid()
+                pickup_rows.append({
+                    "id": pickup_id,
+                    "producer_id": producer_id,
+                    "address_id": pickup_request.address_id,
+                    "scheduled_time": pickup_request.scheduled_time,
+                    "status": "PENDENTE",
+                    "created_at": now,
+                })
+                for item in pickup_request.items:
+                    item_rows.append({
+                        "id": models.generate_uuid(),
+                        "request_id": pickup_id,
+                        "material_id": item.material_id,
+                        "quantity": item.quantity,
+                        "weight_kg": item.weight_kg,
+                    })
+
+            if pickup_rows:
+                await self.db.execute(insert(models.PickupRequest), pickup_rows)
+            if item_rows:
+                await self.db.execute(insert(models.PickupRequestItem), item_rows)
+                await PickupRollupService(self.db).add_pickups([row["id"] for row in pickup_rows])
+            await self.db.commit()
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            raise
+
+        pickup_ids = [row["id"] for row in pickup_rows]
+        await self._notify_pickups_created(pickup_ids)
+        return pickup_ids
+
+    async def get_pickup_requests_page(
+        self,
+        producer_id: str,
+        limit: int,
+        cursor: tuple[datetime, str] | None = None
+    ) -> tuple[list[models.PickupRequest], bool]:
+        """
+        Versão assíncrona de ResidueRepo.get_pickup_requests_page
+
+        Returns:
+            Tupla (coletas da página, existe próxima página)
+        """
+        try:
+            stmt = (
+                select(models.PickupRequest)
+                .options(selectinload(models.PickupRequest.items))
+                .where(models.PickupRequest.producer_id == producer_id)
+            )
+
+            if cursor:
+                created_at, pickup_id = cursor
+                stmt = stmt.where(
+                    or_(
+                        models.PickupRequest.created_at < created_at,
+                        and_(
+                            models.PickupRequest.created_at == created_at,
+                            models.PickupRequest.id < pickup_id
+                        )
+                    )
+                )
+
+            stmt = (
+                stmt.order_by(models.PickupRequest.created_at.desc(), models.PickupRequest.id.desc())
+                .limit(limit + 1)
+            )
+            pickups = list((await self.db.execute(stmt)).scalars().all())
+            return pickups[:limit], len(pickups) > limit
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            raise
+
+    async def get_pickup_requests_by_producer(self, producer_id: str) -> list[models.PickupRequest]:
+        try:
+            result = await self.db.execute(
+                select(models.PickupRequest).where(models.PickupRequest.producer_id == producer_id)
+            )
+            return list(result.scalars().all())
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            raise
+
+    async def get_pickup_request_items(self, pickup_request_id: str) -> list[models.PickupRequestItem]:
+        try:
+            result = await self.db.execute(
+                select(models.PickupRequestItem).where(models.PickupRequestItem.request_id == pickup_request_id)
+            )
+            return list(result.scalars().all())
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            raise
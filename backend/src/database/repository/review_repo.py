@@ -0,0 +1,128 @@
+import dbg
+from datetime import datetime
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.dialects import dialect_insert
+from src.models import models
+
+RATING_VALUES = range(1, 6)
+
+
+def _histogram_column(rating: int):
+    return getattr(models.RatingSummary, f"rating_{rating}")
+
+
+class AsyncReviewRepo:
+    """
+    Avaliações (Review) e o resumo de reputação de cada usuário (RatingSummary)
+
+    O resumo guarda quantidade, soma e histograma de notas por usuário avaliado
+    e é atualizado na mesma transação em que a avaliação é inserida, então ler a
+    média nunca precisa agregar a tabela reviews.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def user_exists(self, user_id: str) -> bool:
+        result = await self.db.execute(select(models.User.id).where(models.User.id == user_id))
+        return result.scalar_one_or_none() is not None
+
+    async def create_review(
+        self,
+        reviewer_id: str,
+        reviewed_user_id: str,
+        rating: int,
+        comment: str | None
+    ) -> tuple[models.Review, models.RatingSummary]:
+        """
+        Insere a avaliação e incrementa o resumo do usuário avaliado (upsert atômico)
+
+        Returns:
+            Tupla (avaliação criada, resumo atualizado)
+        """
+        try:
+            now = datetime.now()
+            review = models.Review(
+                reviewer_id=reviewer_id,
+                reviewed_user_id=reviewed_user_id,
+                rating=rating,
+                comment=comment,
+                created_at=now
+            )
+            self.db.add(review)
+
+            table = models.RatingSummary
+            stmt = dialect_insert(self.db, table).values(
+                user_id=reviewed_user_id,
+                review_count=1,
+                rating_sum=rating,
+                updated_at=now,
+                **{f"rating_{value}": int(value == rating) for value in RATING_VALUES}
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={
+                    "review_count": table.review_count + 1,
+                    "rating_sum": table.rating_sum + rating,
+                    f"rating_{rating}": _histogram_column(rating) + 1,
+                    "updated_at": now,
+                }
+            ).returning(table)
+            summary = (await self.db.execute(
+                select(table).from_statement(stmt).execution_options(populate_existing=True)
+            )).scalar_one()
+
+            await self.db.commit()
+            return review, summary
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            raise
+
+    async def get_summary(self, user_id: str) -> models.RatingSummary | None:
+        return await self.db.get(models.RatingSummary, user_id)
+
+    async def rebuild_summaries(self) -> int:
+        """
+        Recalcula todos os resumos a partir da tabela reviews, em uma transação
+
+        Avaliações inseridas durante a reconstrução podem não ser contadas; rode
+        em um momento de pouco movimento.
+
+        Returns:
+            Quantidade de usuários com resumo
+        """
+        try:
+            await self.db.execute(delete(models.RatingSummary))
+            await self.db.execute(rebuild_rating_summaries_stmt())
+            await self.db.commit()
+            result = await self.db.execute(select(func.count()).select_from(models.RatingSummary))
+            return result.scalar_one()
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            raise
+
+
+def rebuild_rating_summaries_stmt():
+    """INSERT ... SELECT que agrega reviews por usuário avaliado em rating_summaries"""
+    histogram = [
+        func.sum(case((models.Review.rating == value, 1), else_=0))
+        for value in RATING_VALUES
+    ]
+    aggregated = (
+        select(
+            models.Review.reviewed_user_id,
+            func.count(),
+            func.sum(models.Review.rating),
+            *histogram,
+            func.now(),
+        )
+        .where(models.Review.reviewed_user_id.is_not(None), models.Review.rating.is_not(None))
+        .group_by(models.Review.reviewed_user_id)
+    )
+    return insert(models.RatingSummary).from_select(
+        ["user_id", "review_count", "rating_sum", *[f"rating_{value}" for value in RATING_VALUES], "updated_at"],
+        aggregated
+    )
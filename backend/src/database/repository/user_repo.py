@@ -1,6 +1,7 @@
-import logging
-from sqlalchemy import or_
+import dbg
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.schemas import user_schema
 from src.models import models
 import uuid
@@ -8,6 +9,8 @@ from datetime import datetime
 
 from src.utils import token_providers
 from src.utils import hash_providers
+from src.utils import digest_providers
+from src.cache.principal_cache import principal_cache
 
 class User:
 
@@ -37,7 +40,7 @@ class User:
             self.db.refresh(db_user)
             return db_user
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             self.db.rollback()
             return None
 
@@ -46,7 +49,7 @@ class User:
             user = self.db.query(models.User).filter(models.User.id == user_id).first()
             return user
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             return None
 
     def verify_token(self, user_id: str):
@@ -54,7 +57,7 @@ class User:
             user = self.db.query(models.User).filter(models.User.id == user_id).first()
             return user.is_active
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             return None
 
     def invalidate_token(self, user_id: str):
@@ -62,9 +65,10 @@ class User:
             user = self.db.query(models.User).filter(models.User.id == user_id).first()
             user.is_active = False
             self.db.commit()
+            principal_cache.invalidate(user_id)
             return True
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             self.db.rollback()
             return None
 
@@ -73,7 +77,7 @@ class User:
             user = self.db.query(models.User).filter(models.User.email == email).first()
             return user
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             return None
 
     def activate_user(self, user_id):
@@ -82,11 +86,12 @@ class User:
             if user:
                 user.is_active = True
                 self.db.commit()
+                principal_cache.invalidate(user_id)
                 self.db.refresh(user)
                 return True
             return False
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             self.db.rollback()
             return None
         
@@ -95,7 +100,7 @@ class User:
             user = self.db.query(models.User).filter(models.User.id == user_id).first()
             return user
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             return None
         
     def save_refresh_token(self, user_id: str, refresh_token: str):
@@ -109,7 +114,7 @@ class User:
                 return True
             return False
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             self.db.rollback()
             return None
         
@@ -124,10 +129,14 @@ class User:
             if not user or not user.refresh_token:
                 return False
             
+            # Hash bcrypt do formato antigo: aceito até o token ser rotacionado
+            if digest_providers.is_legacy_hash(user.refresh_token):
+                return hash_providers.verify_hash(refresh_token, user.refresh_token)
+
             # ✅ Compara os hashes, não os tokens em texto plano
-            return hash_providers.verify_hash(refresh_token, user.refresh_token)
+            return token_providers.verify_token_hash(refresh_token, user.refresh_token)
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             return False
     
 
@@ -141,7 +150,7 @@ class User:
                 return True
             return False
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             self.db.rollback()
             return None
 
@@ -150,9 +159,10 @@ class User:
             user = self.db.query(models.User).filter(models.User.id == user_id).first()
             user.is_active = False
             self.db.commit()
+            principal_cache.invalidate(user_id)
             return user
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             self.db.rollback()
             return None
 
@@ -161,10 +171,199 @@ class User:
             user = self.db.query(models.User).filter(models.User.id == user_id).first()
             user.password = user_password
             self.db.commit()
+            principal_cache.invalidate(user_id)
             return user
         except Exception as error:
-            logging.error(f"Error: {error}")
+            dbg.log_error(f"Error: {error}")
             self.db.rollback()
             return None
     
-   
\ No newline at end of file
+   
+
+    def revoke_legacy_refresh_tokens(self) -> int:
+        """
+        Remove os refresh tokens ainda armazenados como hash bcrypt
+
+        Os hashes antigos são substituídos pelo digest HMAC no próximo login ou
+        refresh. Depois de REFRESH_TOKEN_EXPIRES_DAYS todos os que restarem
+        pertencem a tokens expirados e podem ser limpos com este método.
+
+        Returns:
+            Quantidade de usuários afetados
+        """
+        try:
+            updated = (
+                self.db.query(models.User)
+                .filter(models.User.refresh_token.like("$2%"))
+                .update({models.User.refresh_token: None}, synchronize_session=False)
+            )
+            self.db.commit()
+            return updated
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            self.db.rollback()
+            raise
+
+class AsyncUser:
+    """Versão assíncrona do repositório User, usada pelas rotas com AsyncSession"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _get_by_id(self, user_id: str) -> models.User | None:
+        result = await self.db.execute(select(models.User).where(models.User.id == user_id))
+        return result.scalars().first()
+
+    async def create_user(self, user: user_schema.UserSignUp) -> models.User | None:
+        result = await self.db.execute(select(models.User.id).where(models.User.email == user.email))
+        if result.first():
+            return None
+
+        try:
+
+            db_user = models.User(
+                name=user.name,
+                email=user.email,
+                password=user.password,
+                created_at=datetime.now(),
+                is_active=False,
+                role=user.role,
+            )
+
+            self.db.add(db_user)
+            await self.db.commit()
+            return db_user
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            return None
+
+    async def verify_user_id(self, user_id):
+        try:
+            return await self._get_by_id(user_id)
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            return None
+
+    async def verify_token(self, user_id: str):
+        try:
+            user = await self._get_by_id(user_id)
+            return user.is_active
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            return None
+
+    async def invalidate_token(self, user_id: str):
+        try:
+            user = await self._get_by_id(user_id)
+            user.is_active = False
+            await self.db.commit()
+            principal_cache.invalidate(user_id)
+            return True
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            return None
+
+    async def get_user_by_email(self, email: str):
+        try:
+            result = await self.db.execute(select(models.User).where(models.User.email == email))
+            return result.scalars().first()
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            return None
+
+    async def activate_user(self, user_id):
+        try:
+            user = await self._get_by_id(user_id)
+            if user:
+                user.is_active = True
+                await self.db.commit()
+                principal_cache.invalidate(user_id)
+                return True
+            return False
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            return None
+
+    async def get_user_by_id(self, user_id: str):
+        try:
+            return await self._get_by_id(user_id)
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            return None
+
+    async def save_refresh_token(self, user_id: str, refresh_token: str):
+        try:
+            user = await self._get_by_id(user_id)
+            if user:
+                # ✅ Armazena o HASH do token, não o token em si
+                user.refresh_token = token_providers.hash_token(refresh_token)
+                await self.db.commit()
+                return True
+            return False
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            return None
+
+    async def verify_refresh_token(self, user_id: str, refresh_token: str) -> bool:
+        """
+        Verifica se o refresh token do usuário é válido
+
+        Compara o hash do token fornecido com o hash armazenado
+        """
+        try:
+            user = await self._get_by_id(user_id)
+            if not user or not user.refresh_token:
+                return False
+            stored_hash = user.refresh_token
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            return False
+
+        # Hash bcrypt do formato antigo: aceito até o token ser rotacionado
+        if digest_providers.is_legacy_hash(stored_hash):
+            return await hash_providers.verify_hash_async(refresh_token, stored_hash)
+
+        # ✅ Compara os hashes, não os tokens em texto plano
+        return token_providers.verify_token_hash(refresh_token, stored_hash)
+
+    async def revoke_refresh_token(self, user_id: str) -> bool:
+        """Remove o refresh token do usuário (logout)"""
+        try:
+            user = await self._get_by_id(user_id)
+            if user:
+                user.refresh_token = None
+                await self.db.commit()
+                return True
+            return False
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            return None
+
+    async def deactivate_user(self, user_id: str) -> models.User | None:
+        try:
+            user = await self._get_by_id(user_id)
+            user.is_active = False
+            await self.db.commit()
+            principal_cache.invalidate(user_id)
+            return user
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            return None
+
+    async def change_password(self, user_id, user_password):
+        try:
+            user = await self._get_by_id(user_id)
+            user.password = user_password
+            await self.db.commit()
+            principal_cache.invalidate(user_id)
+            return user
+        except Exception as error:
+            dbg.log_error(f"Error: {error}")
+            await self.db.rollback()
+            return None
@@ -0,0 +1,387 @@
+"""
+Gerador de dados sintéticos em volume (usuários, coletas, carteiras)
+
+Os dados são gerados em blocos de SEED_BLOCK_SIZE entidades. Cada bloco tem
+seu próprio gerador aleatório, derivado de (seed, tipo, bloco), e os IDs são
+derivados de (seed, tipo, índice): qualquer processo gera qualquer bloco sem
+conversar com os outros, as chaves estrangeiras são calculadas a partir dos
+índices e a mesma seed gera os mesmos dados com qualquer número de workers.
+
+As colunas e a ordem delas vêm da metadata de models.py. No PostgreSQL as
+linhas são enviadas com COPY FROM STDIN (psycopg 3); nos demais bancos, com
+executemany em lotes. Cada bloco é gravado em uma transação.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from src.models import models
+
+# Entidades (usuários ou coletas) por bloco; também é a unidade de trabalho dos workers
+SEED_BLOCK_SIZE = 2000
+
+# Linhas por executemany fora do PostgreSQL
+EXECUTEMANY_BATCH = 1000
+
+SEED_PASSWORD = "Seed1!pass"
+
+CITIES = (
+    ("Teresina", "PI", -5.0892, -42.8019),
+    ("Parnaíba", "PI", -2.9055, -41.7734),
+    ("Fortaleza", "CE", -3.7319, -38.5267),
+    ("São Luís", "MA", -2.5307, -44.3068),
+    ("Recife", "PE", -8.0476, -34.8770),
+    ("Salvador", "BA", -12.9777, -38.5016),
+)
+
+MATERIALS = (
+    ("PET", "Garrafas e embalagens PET", "1.20", "0.05"),
+    ("Papelão", "Caixas e papelão ondulado", "0.60", "0"),
+    ("Papel", "Papel branco e misto", "0.45", "0"),
+    ("Vidro", "Garrafas e potes de vidro", "0.20", "0.10"),
+    ("Alumínio", "Latas de alumínio", "5.50", "0.03"),
+    ("Aço", "Latas de aço e sucata leve", "0.80", "0"),
+    ("Eletrônicos", "Pequenos eletrônicos", "2.00", "1.50"),
+    ("Óleo de cozinha", "Óleo usado (litros)", "1.00", "0"),
+)
+
+# (status, peso) das coletas geradas
+PICKUP_STATUS_WEIGHTS = (("PENDENTE", 15), ("ACEITA", 8), ("COLETADA", 7), ("ENTREGUE", 60), ("CANCELADA", 10))
+
+# Um produtor, um coletor e uma cooperativa
+SEED_MIN_USERS = 3
+
+# Ordem de gravação dentro de cada bloco (respeita as chaves estrangeiras)
+USER_TABLES = ("users", "addresses", "wallet", "wallet_transactions")
+PICKUP_TABLES = ("pickup_requests", "pickup_request_items", "collections")
+
+CENT = Decimal("0.01")
+
+
+def table_columns(table_name: str) -> list[str]:
+    return [column.name for column in models.Base.metadata.tables[table_name].columns]
+
+
+def _parse_size(value: str) -> int:
+    """'500MB', '2GB', '1.5G' -> bytes"""
+    units = {"K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+    text = value.strip().upper().removesuffix("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(float(text))
+
+
+@dataclass(frozen=True)
+class SeedPlan:
+    """
+    Quantidades e parâmetros de uma geração
+
+    Os usuários ficam em faixas contíguas de índice por papel (produtores,
+    coletores, cooperativas, admins), então o papel e os IDs relacionados são
+    calculados a partir do índice. Cada usuário tem um endereço e uma carteira.
+    """
+
+    seed: int
+    users: int
+    pickups: int
+    days: int = 365
+    end: datetime = datetime(2026, 1, 1)
+    password_hash: str = ""
+
+    @classmethod
+    def build(cls, seed: int, pickups: int | None = None, size: str | None = None, users: int | None = None, **kwargs) -> "SeedPlan":
+        """Plano a partir da quantidade de coletas ou do tamanho aproximado (ex.: '2GB')"""
+        if (pickups is None) == (size is None):
+            raise ValueError("Informe a quantidade de coletas ou o tamanho alvo (apenas um dos dois)")
+        if size is not None:
+            sample = cls(seed=seed, users=SEED_BLOCK_SIZE, pickups=SEED_BLOCK_SIZE, **kwargs)
+            pickups = max(1, int(_parse_size(size) / sample.estimated_bytes_per_pickup()))
+        users = users or max(100, pickups // 10)
+        if users < SEED_MIN_USERS:
+            raise ValueError(f"São necessários pelo menos {SEED_MIN_USERS} usuários (produtor, coletor e cooperativa)")
+        return cls(seed=seed, users=users, pickups=pickups, **kwargs)
+
+    # As faixas somam exatamente self.users: coletores e cooperativas têm pelo
+    # menos um usuário e os produtores ficam com o restante (~80%)
+    @property
+    def producers(self) -> int:
+        return self.users - self.collectors - self.cooperatives - self.admins
+
+    @property
+    def collectors(self) -> int:
+        return max(1, self.users * 15 // 100)
+
+    @property
+    def cooperatives(self) -> int:
+        return max(1, self.users - self.users * 80 // 100 - self.users * 15 // 100 - self.admins)
+
+    @property
+    def admins(self) -> int:
+        return self.users // 100
+
+    def role(self, user_index: int) -> str:
+        if user_index < self.producers:
+            return "PRODUTOR"
+        if user_index < self.producers + self.collectors:
+            return "COLETOR"
+        if user_index < self.producers + self.collectors + self.cooperatives:
+            return "COOPERATIVA"
+        return "ADMIN"
+
+    def blocks(self, count: int) -> range:
+        return range((count + SEED_BLOCK_SIZE - 1) // SEED_BLOCK_SIZE)
+
+    def estimated_bytes_per_pickup(self) -> float:
+        """
+        Bytes em disco por coleta (incluindo itens, coleta, usuários e carteiras na mesma proporção)
+
+        Mede o texto de um bloco de amostra e aplica um fator para cabeçalhos
+        de linha e índices; é uma estimativa, confira o tamanho real no final.
+        """
+        def text_bytes(tables: dict) -> int:
+            return sum(len(str(value)) + 1 for rows in tables.values() for row in rows for value in row)
+
+        sample = SeedPlan(seed=self.seed, users=SEED_BLOCK_SIZE * 10, pickups=SEED_BLOCK_SIZE * 10)
+        per_user = text_bytes(generate_user_block(sample, 0)) / SEED_BLOCK_SIZE
+        per_pickup = text_bytes(generate_pickup_block(sample, 0)) / SEED_BLOCK_SIZE
+        return (per_pickup + per_user / 10) * 2.5
+
+
+def _uuid(seed: int, kind: str, index: int) -> str:
+    digest = hashlib.blake2b(f"{seed}:{kind}:{index}".encode(), digest_size=16).digest()
+    return str(uuid.UUID(bytes=digest, version=4))
+
+
+def _rng(seed: int, kind: str, block: int) -> random.Random:
+    return random.Random(f"{seed}:{kind}:{block}")
+
+
+def _money(value: float) -> Decimal:
+    return Decimal(str(value)).quantize(CENT)
+
+
+def material_rows(plan: SeedPlan) -> list[tuple]:
+    """Catálogo fixo de materiais (IDs derivados da seed)"""
+    return [
+        (_uuid(plan.seed, "material", index), name, description, Decimal(per_kg), Decimal(per_unit))
+        for index, (name, description, per_kg, per_unit) in enumerate(MATERIALS)
+    ]
+
+
+def already_seeded(connection, plan: SeedPlan) -> bool:
+    """True se esta seed já foi gravada no banco (os IDs se repetiriam)"""
+    table = models.RecyclableMaterial.__table__
+    return connection.execute(
+        table.select().where(table.c.id == _uuid(plan.seed, "material", 0))
+    ).first() is not None
+
+
+def generate_user_block(plan: SeedPlan, block: int) -> dict[str, list[tuple]]:
+    """Usuários do bloco com endereço, carteira e extrato (saldo = créditos - débitos)"""
+    rng = _rng(plan.seed, "users", block)
+    start = block * SEED_BLOCK_SIZE
+    tables = {name: [] for name in USER_TABLES}
+    first_day = plan.end - timedelta(days=plan.days)
+
+    for index in range(start, min(start + SEED_BLOCK_SIZE, plan.users)):
+        user_id = _uuid(plan.seed, "user", index)
+        created_at = first_day + timedelta(seconds=rng.randrange(plan.days * 86400))
+        tables["users"].append((
+            user_id, f"Usuário {index}", f"seed{plan.seed}.{index}@seed.local", plan.password_hash,
+            plan.role(index), True, None, created_at,
+        ))
+
+        city, state, latitude, longitude = CITIES[rng.randrange(len(CITIES))]
+        tables["addresses"].append((
+            _uuid(plan.seed, "address", index), user_id, f"Rua {rng.randrange(1, 500)}", str(rng.randrange(1, 3000)),
+            city, state, f"{rng.randrange(10000, 99999)}-{rng.randrange(1000):03d}",
+            Decimal(f"{latitude + rng.uniform(-0.08, 0.08):.8f}"), Decimal(f"{longitude + rng.uniform(-0.08, 0.08):.8f}"),
+        ))
+
+        wallet_id = _uuid(plan.seed, "wallet", index)
+        balance = Decimal(0)
+        moment = created_at
+        for sequence in range(rng.randrange(7)):
+            moment += timedelta(seconds=rng.randrange(1, 30 * 86400))
+            if balance > 0 and rng.random() < 0.3:
+                amount, kind = _money(rng.uniform(0.01, float(balance))), "DEBITO"
+                balance -= amount
+            else:
+                amount, kind = _money(rng.uniform(0.5, 60)), "CREDITO"
+                balance += amount
+            tables["wallet_transactions"].append((
+                _uuid(plan.seed, "wallet_transaction", index * 8 + sequence), wallet_id, amount, kind,
+                "Saque" if kind == "DEBITO" else "Recompensa", moment,
+            ))
+        tables["wallet"].append((wallet_id, user_id, balance))
+
+    return tables
+
+
+def generate_pickup_block(plan: SeedPlan, block: int) -> dict[str, list[tuple]]:
+    """Coletas do bloco com itens e, a partir de ACEITA, a Collection correspondente"""
+    rng = _rng(plan.seed, "pickups", block)
+    start = block * SEED_BLOCK_SIZE
+    tables = {name: [] for name in PICKUP_TABLES}
+    first_day = plan.end - timedelta(days=plan.days)
+    statuses, weights = zip(*PICKUP_STATUS_WEIGHTS)
+    material_ids = [_uuid(plan.seed, "material", index) for index in range(len(MATERIALS))]
+    collectors_start = plan.producers
+    cooperatives_start = plan.producers + plan.collectors
+
+    for index in range(start, min(start + SEED_BLOCK_SIZE, plan.pickups)):
+        pickup_id = _uuid(plan.seed, "pickup", index)
+        producer = rng.randrange(plan.producers)
+        created_at = first_day + timedelta(seconds=rng.randrange(plan.days * 86400))
+        scheduled_time = created_at + timedelta(hours=rng.randrange(2, 24 * 7))
+        status = rng.choices(statuses, weights)[0]
+        tables["pickup_requests"].append((
+            pickup_id, _uuid(plan.seed, "user", producer), _uuid(plan.seed, "address", producer),
+            scheduled_time, status, created_at,
+        ))
+
+        for sequence in range(rng.randrange(1, 5)):
+            tables["pickup_request_items"].append((
+                _uuid(plan.seed, "item", index * 4 + sequence), pickup_id, rng.choice(material_ids),
+                _money(rng.uniform(0.1, 50)), rng.randrange(1, 21),
+            ))
+
+        if status in ("ACEITA", "COLETADA", "ENTREGUE"):
+            collected_at = scheduled_time + timedelta(minutes=rng.randrange(-60, 180)) if status != "ACEITA" else None
+            delivered = status == "ENTREGUE"
+            tables["collections"].append((
+                _uuid(plan.seed, "collection", index), pickup_id,
+                _uuid(plan.seed, "user", collectors_start + rng.randrange(plan.collectors)),
+                collected_at,
+                collected_at + timedelta(hours=rng.randrange(1, 48)) if delivered else None,
+                _uuid(plan.seed, "user", cooperatives_start + rng.randrange(plan.cooperatives)) if delivered else None,
+            ))
+
+    return tables
+
+
+class _CopyWriter:
+    """Grava com COPY FROM STDIN numa conexão psycopg 3"""
+
+    def __init__(self, database_url: str):
+        import psycopg
+
+        conninfo = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        # autocommit: cada bloco transaction() é um BEGIN/COMMIT explícito
+        self.connection = psycopg.connect(conninfo, autocommit=True)
+
+    def write(self, tables: dict[str, list[tuple]]):
+        with self.connection.transaction(), self.connection.cursor() as cursor:
+            for name, rows in tables.items():
+                if not rows:
+                    continue
+                with cursor.copy(f"COPY {name} ({', '.join(table_columns(name))}) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+
+    def close(self):
+        self.connection.close()
+
+
+class _ExecutemanyWriter:
+    """Grava com INSERT em lotes (executemany) pela engine do SQLAlchemy"""
+
+    def __init__(self, database_url: str):
+        self.engine = create_engine(database_url)
+
+    def write(self, tables: dict[str, list[tuple]]):
+        with self.engine.begin() as connection:
+            for name, rows in tables.items():
+                table = models.Base.metadata.tables[name]
+                columns = table_columns(name)
+                for offset in range(0, len(rows), EXECUTEMANY_BATCH):
+                    chunk = rows[offset:offset + EXECUTEMANY_BATCH]
+                    connection.execute(table.insert(), [dict(zip(columns, row)) for row in chunk])
+
+    def close(self):
+        self.engine.dispose()
+
+
+def uses_copy(database_url: str) -> bool:
+    url = make_url(database_url)
+    return url.get_backend_name() == "postgresql" and url.get_driver_name() in ("psycopg", "psycopg2")
+
+
+def _open_writer(database_url: str):
+    return _CopyWriter(database_url) if uses_copy(database_url) else _ExecutemanyWriter(database_url)
+
+
+_writer = None
+
+
+def _init_worker(database_url: str):
+    global _writer
+    _writer = _open_writer(database_url)
+
+
+def _run_block(task: tuple) -> dict[str, int]:
+    plan, kind, block = task
+    tables = generate_user_block(plan, block) if kind == "users" else generate_pickup_block(plan, block)
+    _writer.write(tables)
+    return {name: len(rows) for name, rows in tables.items()}
+
+
+def seed_database(database_url: str, plan: SeedPlan, workers: int, progress=None) -> dict[str, int]:
+    """
+    Gera e grava os dados do plano; retorna as linhas gravadas por tabela
+
+    Os materiais são gravados primeiro, depois todos os blocos de usuários e
+    então os de coletas (que referenciam usuários e endereços). Os blocos de
+    cada fase são distribuídos entre processos (spawn, cada um com a própria
+    conexão). progress(linhas_gravadas, blocos_feitos, blocos_total) é chamada
+    a cada bloco concluído.
+    """
+    counts = {"recyclable_materials": len(MATERIALS)}
+    writer = _open_writer(database_url)
+    try:
+        writer.write({"recyclable_materials": material_rows(plan)})
+    finally:
+        writer.close()
+
+    phases = [
+        [(plan, "users", block) for block in plan.blocks(plan.users)],
+        [(plan, "pickups", block) for block in plan.blocks(plan.pickups)],
+    ]
+    total_blocks = sum(len(tasks) for tasks in phases)
+    done = 0
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers, initializer=_init_worker, initargs=(database_url,)) as pool:
+        for tasks in phases:
+            for written in pool.imap_unordered(_run_block, tasks):
+                for name, rows in written.items():
+                    counts[name] = counts.get(name, 0) + rows
+                done += 1
+                if progress:
+                    progress(sum(counts.values()), done, total_blocks)
+    return counts
+
+
+def postgres_table_bytes(connection, tables) -> int:
+    """Tamanho em disco das tabelas (dados, TOAST e índices) no PostgreSQL"""
+    return sum(
+        connection.execute(text("SELECT pg_total_relation_size(CAST(:name AS regclass))"), {"name": name}).scalar_one()
+        for name in tables
+    )
+
+
+def default_workers(database_url: str) -> int:
+    """Um processo por CPU no PostgreSQL; SQLite aceita um único escritor por vez"""
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return 1
+    return os.cpu_count() or 1
+
@@ -0,0 +1,111 @@
+import os
+from dataclasses import dataclass
+
+
+# Perfis de engine: valores padrão que podem ser sobrescritos individualmente por variáveis de ambiente
+_PROFILES = {
+    "development": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": 3600,
+        "pool_pre_ping": False,
+        "statement_timeout_ms": 0,
+        "echo": "false",
+        "auto_migrate": True,
+        "pool_warmup": 1,
+    },
+    "production": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 10,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 30000,
+        "echo": "false",
+        "auto_migrate": False,
+        "pool_warmup": 5,
+    },
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class EngineSettings:
+    """
+    Configuração da engine do SQLAlchemy
+
+    Variáveis de ambiente:
+        DB_PROFILE: development | production (padrão: development)
+        DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE: inteiros
+        DB_POOL_PRE_PING: true | false
+        DB_STATEMENT_TIMEOUT_MS: timeout por statement no PostgreSQL (0 desativa)
+        DB_ECHO: false | true | debug
+        DB_AUTO_MIGRATE: aplica as migrações ao iniciar a API (produção: false, use manage.py migrate)
+        DB_POOL_WARMUP: conexões abertas no pool ao iniciar cada worker
+    """
+    profile: str
+    pool_size: int
+    max_overflow: int
+    pool_timeout: int
+    pool_recycle: int
+    pool_pre_ping: bool
+    statement_timeout_ms: int
+    echo: bool | str
+    auto_migrate: bool
+    pool_warmup: int
+
+    @classmethod
+    def from_env(cls) -> "EngineSettings":
+        profile = os.getenv("DB_PROFILE", "development").strip().lower()
+        if profile not in _PROFILES:
+            raise ValueError(f"DB_PROFILE inválido: {profile}. Use um de: {', '.join(_PROFILES)}")
+        defaults = _PROFILES[profile]
+
+        echo = os.getenv("DB_ECHO", defaults["echo"]).strip().lower()
+        if echo not in ("false", "true", "debug"):
+            raise ValueError(f"DB_ECHO inválido: {echo}. Use false, true ou debug")
+
+        return cls(
+            profile=profile,
+            pool_size=_env_int("DB_POOL_SIZE", defaults["pool_size"]),
+            max_overflow=_env_int("DB_MAX_OVERFLOW", defaults["max_overflow"]),
+            pool_timeout=_env_int("DB_POOL_TIMEOUT", defaults["pool_timeout"]),
+            pool_recycle=_env_int("DB_POOL_RECYCLE", defaults["pool_recycle"]),
+            pool_pre_ping=_env_bool("DB_POOL_PRE_PING", defaults["pool_pre_ping"]),
+            statement_timeout_ms=_env_int("DB_STATEMENT_TIMEOUT_MS", defaults["statement_timeout_ms"]),
+            echo={"false": False, "true": True, "debug": "debug"}[echo],
+            auto_migrate=_env_bool("DB_AUTO_MIGRATE", defaults["auto_migrate"]),
+            pool_warmup=_env_int("DB_POOL_WARMUP", defaults["pool_warmup"]),
+        )
+
+    def engine_kwargs(self, database_url: str) -> dict:
+        """Argumentos para create_engine de acordo com o dialeto da URL"""
+        kwargs = {"echo": self.echo, "pool_pre_ping": self.pool_pre_ping}
+
+        # SQLite em memória usa SingletonThreadPool, que não aceita as opções de pool
+        if database_url.startswith("sqlite") and ":memory:" in database_url:
+            return kwargs
+
+        kwargs.update(
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+        )
+
+        if database_url.startswith("postgresql") and self.statement_timeout_ms > 0:
+            kwargs["connect_args"] = {"options": f"-c statement_timeout={self.statement_timeout_ms}"}
+
+        return kwargs
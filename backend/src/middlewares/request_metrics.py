@@ -0,0 +1,282 @@
+import asyncio
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+import dbg
+from src.database.query_metrics import QueryStats, background_queries, current_query_stats
+
+# Envia o header Server-Timing (tempo total e do banco) em todas as respostas
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+
+# Limites dos buckets dos histogramas
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Rótulo das requisições que não casaram com nenhuma rota (evita um rótulo por URL)
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Diretório compartilhado pelos workers: cada um grava ali um snapshot das suas métricas
+# e o /metrics soma todos (vazio = métricas só do worker que atendeu o scrape)
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+# Intervalo entre as gravações do snapshot de cada worker
+METRICS_SNAPSHOT_SECONDS = float(os.getenv("METRICS_SNAPSHOT_SECONDS", "5"))
+
+
+class Histogram:
+    """Histograma com buckets fixos no formato do Prometheus (contagens acumuladas na exportação)"""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, counts: list[int], total: float, count: int):
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.sum += total
+        self.count += count
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class RequestMetrics:
+    """
+    Métricas por rota: latência, status, queries e tempo de banco
+
+    As rotas são identificadas pelo template (/pickups/{pickup_id}/accept), não
+    pela URL. As métricas são coletadas por processo; com METRICS_MULTIPROC_DIR,
+    cada worker grava periodicamente um snapshot no diretório e o /metrics soma
+    os snapshots de todos (inclusive de workers já encerrados, para que os
+    contadores nunca diminuam), seja qual for o worker que atendeu o scrape.
+    """
+
+    def __init__(self, multiproc_dir: str = ""):
+        self._lock = threading.Lock()
+        self.multiproc_dir = multiproc_dir
+        # Um arquivo por processo (o pid pode ser reutilizado depois de um restart)
+        self._snapshot_name = f"metrics-{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests: dict[tuple[str, str, int], int] = {}
+            self.latency: dict[tuple[str, str], Histogram] = {}
+            self.queries: dict[tuple[str, str], Histogram] = {}
+            self.db_seconds: dict[tuple[str, str], float] = {}
+            self.n_plus_one: dict[tuple[str, str], int] = {}
+            self._reported: set[tuple[str, str, str]] = set()
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float, stats: QueryStats):
+        key = (method, route)
+        suspect = stats.n_plus_one()
+        with self._lock:
+            self.requests[(method, route, status_code)] = self.requests.get((method, route, status_code), 0) + 1
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            self.queries.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(stats.count)
+            self.db_seconds[key] = self.db_seconds.get(key, 0.0) + stats.seconds
+            first_report = False
+            if suspect:
+                self.n_plus_one[key] = self.n_plus_one.get(key, 0) + 1
+                first_report = (method, route, suspect[0]) not in self._reported
+                self._reported.add((method, route, suspect[0]))
+
+        # Cada statement suspeito é registrado no log uma única vez por rota
+        if first_report:
+            statement, times = suspect
+            dbg.log_warn(
+                f"Possível N+1 em {method} {route}: statement executado {times}x na mesma requisição",
+                route=route, method=method, repetitions=times, statement=statement[:500],
+            )
+
+    def state(self) -> dict:
+        """Contadores do processo em formato JSON (snapshot do METRICS_MULTIPROC_DIR)"""
+        with self._lock:
+            return {
+                "requests": [[*key, count] for key, count in self.requests.items()],
+                "latency": [[*key, h.counts, h.sum, h.count] for key, h in self.latency.items()],
+                "queries": [[*key, h.counts, h.sum, h.count] for key, h in self.queries.items()],
+                "db_seconds": [[*key, seconds] for key, seconds in self.db_seconds.items()],
+                "n_plus_one": [[*key, count] for key, count in self.n_plus_one.items()],
+                "background": [background_queries.count, background_queries.seconds],
+            }
+
+    def write_snapshot(self):
+        if not self.multiproc_dir:
+            return
+        os.makedirs(self.multiproc_dir, exist_ok=True)
+        path = os.path.join(self.multiproc_dir, self._snapshot_name)
+        with open(path + ".tmp", "w") as file:
+            json.dump(self.state(), file)
+        os.replace(path + ".tmp", path)
+
+    def _load_states(self) -> list[dict]:
+        self.write_snapshot()
+        states = []
+        for path in glob.glob(os.path.join(self.multiproc_dir, "metrics-*.json")):
+            try:
+                with open(path) as file:
+                    states.append(json.load(file))
+            except (OSError, ValueError):
+                continue  # snapshot sendo substituído ou removido
+        return states
+
+    async def run_snapshots(self, interval_seconds: float = METRICS_SNAPSHOT_SECONDS):
+        """Grava o snapshot do worker a cada interval_seconds (task do lifespan)"""
+        if not self.multiproc_dir:
+            return
+        try:
+            while True:
+                await asyncio.sleep(interval_seconds)
+                self.write_snapshot()
+        finally:
+            self.write_snapshot()
+
+    def render(self) -> str:
+        """Exporta as métricas no formato texto do Prometheus (versão 0.0.4)"""
+        states = self._load_states() if self.multiproc_dir else [self.state()]
+
+        requests: dict[tuple, int] = {}
+        latency: dict[tuple, Histogram] = {}
+        queries: dict[tuple, Histogram] = {}
+        db_seconds: dict[tuple, float] = {}
+        n_plus_one: dict[tuple, int] = {}
+        background_count, background_seconds = 0, 0.0
+        for state in states:
+            for method, route, status_code, count in state["requests"]:
+                requests[(method, route, status_code)] = requests.get((method, route, status_code), 0) + count
+            for target, buckets, rows in ((latency, LATENCY_BUCKETS, state["latency"]), (queries, QUERY_COUNT_BUCKETS, state["queries"])):
+                for method, route, counts, total, count in rows:
+                    target.setdefault((method, route), Histogram(buckets)).merge(counts, total, count)
+            for method, route, seconds in state["db_seconds"]:
+                db_seconds[(method, route)] = db_seconds.get((method, route), 0.0) + seconds
+            for method, route, count in state["n_plus_one"]:
+                n_plus_one[(method, route)] = n_plus_one.get((method, route), 0) + count
+            background_count += state["background"][0]
+            background_seconds += state["background"][1]
+
+        lines = [
+            "# HELP http_requests_total Requisições atendidas por rota e status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status_code), count in sorted(requests.items()):
+            lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=status_code)}}} {count}")
+
+        self._render_histogram(lines, "http_request_duration_seconds", "Latência das requisições em segundos.", latency)
+        self._render_histogram(lines, "http_request_db_queries", "Queries executadas por requisição.", queries)
+
+        lines += [
+            "# HELP http_request_db_seconds_total Tempo gasto em queries pelas requisições, em segundos.",
+            "# TYPE http_request_db_seconds_total counter",
+        ]
+        for (method, route), seconds in sorted(db_seconds.items()):
+            lines.append(f"http_request_db_seconds_total{{{_labels(method=method, route=route)}}} {_number(seconds)}")
+
+        lines += [
+            "# HELP http_request_n_plus_one_total Requisições que repetiram o mesmo statement ao menos QUERY_N_PLUS_ONE_THRESHOLD vezes.",
+            "# TYPE http_request_n_plus_one_total counter",
+        ]
+        for (method, route), count in sorted(n_plus_one.items()):
+            lines.append(f"http_request_n_plus_one_total{{{_labels(method=method, route=route)}}} {count}")
+
+        lines += [
+            "# HELP db_background_queries_total Queries executadas fora de requisições (workers, lifespan).",
+            "# TYPE db_background_queries_total counter",
+            f"db_background_queries_total {background_count}",
+            "# HELP db_background_seconds_total Tempo das queries executadas fora de requisições, em segundos.",
+            "# TYPE db_background_seconds_total counter",
+            f"db_background_seconds_total {_number(float(background_seconds))}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histogram(lines: list[str], name: str, help_text: str, histograms: dict):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (method, route), histogram in sorted(histograms.items()):
+            labels = _labels(method=method, route=route)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{_number(float(bound))}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {_number(histogram.sum)}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+request_metrics = RequestMetrics(METRICS_MULTIPROC_DIR)
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def server_timing(total_seconds: float, stats: QueryStats) -> str:
+    """Valor do header Server-Timing com o tempo total e o tempo/quantidade de queries"""
+    return (
+        f'app;dur={total_seconds * 1000:.1f}, '
+        f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+    )
+
+
+class RequestMetricsMiddleware:
+    """
+    Middleware ASGI que mede cada requisição HTTP
+
+    Abre um QueryStats no contexto da requisição (os eventos do SQLAlchemy em
+    src/database/query_metrics.py somam nele as queries da sessão síncrona e da
+    assíncrona), mede a latência até o fim do corpo e registra tudo em
+    request_metrics. Com SERVER_TIMING_ENABLED, a resposta leva o header
+    Server-Timing com o tempo até o início da resposta e o tempo de banco.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics, server_timing_enabled: bool = SERVER_TIMING_ENABLED):
+        self.app = app
+        self.metrics = metrics
+        self.server_timing_enabled = server_timing_enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing_enabled:
+                    MutableHeaders(scope=message).append("Server-Timing", server_timing(time.perf_counter() - start, stats))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            self.metrics.observe(scope["method"], _route_template(scope), status_code, time.perf_counter() - start, stats)
@@ -1,24 +1,30 @@
 from sqlalchemy import (
-    Column, Integer, String, Text, DECIMAL, TIMESTAMP, Boolean, 
-    SmallInteger, ForeignKey, CheckConstraint
+    Column, Integer, String, Text, DECIMAL, TIMESTAMP, Boolean, Date,
+    SmallInteger, ForeignKey, CheckConstraint, Index, Uuid
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
-import uuid
+
+from src.utils.uuid_providers import uuid7
 
 Base = declarative_base()
 
+# Chaves primárias e estrangeiras: UUID nativo (16 bytes) no PostgreSQL e texto no SQLite,
+# sempre lidas e gravadas como string com hífens
+UUIDType = Uuid(as_uuid=False).with_variant(String(36), "sqlite")
+
 
 def generate_uuid():
-    return str(uuid.uuid4())
+    # UUID versão 7: ordenado pelo instante de criação (inserts no fim dos índices)
+    return uuid7()
 
 
 class User(Base):
     __tablename__ = 'users'
     
-    id = Column(String(36), primary_key=True, default=generate_uuid)
+    id = Column(UUIDType, primary_key=True, default=generate_uuid)
     name = Column(String(100), nullable=False)
     email = Column(String(150), unique=True, nullable=False)
     password = Column(Text, nullable=False)
@@ -40,12 +46,13 @@ class User(Base):
     wallet = relationship('Wallet', back_populates='user', uselist=False)
     reviews_given = relationship('Review', foreign_keys='Review.reviewer_id', back_populates='reviewer')
     reviews_received = relationship('Review', foreign_keys='Review.reviewed_user_id', back_populates='reviewed_user')
+    rating_summary = relationship('RatingSummary', back_populates='user', uselist=False)
 
 class Address(Base):
     __tablename__ = 'addresses'
     
-    id = Column(String(36), primary_key=True, default=generate_uuid)
-    user_id = Column(String(36), ForeignKey('users.id', ondelete='CASCADE'))
+    id = Column(UUIDType, primary_key=True, default=generate_uuid)
+    user_id = Column(UUIDType, ForeignKey('users.id', ondelete='CASCADE'), index=True)
     street = Column(String(150))
     number = Column(String(20))
     city = Column(String(100))
@@ -62,9 +69,12 @@ class Address(Base):
 class RecyclableMaterial(Base):
     __tablename__ = 'recyclable_materials'
     
-    id = Column(String(36), primary_key=True, default=generate_uuid)
+    id = Column(UUIDType, primary_key=True, default=generate_uuid)
     type = Column(String(50), nullable=False)
     description = Column(Text)
+    # Recompensa paga ao produtor por kg e por unidade entregue (reward_pipeline)
+    reward_per_kg = Column(DECIMAL(10, 2), nullable=False, default=0, server_default='0')
+    reward_per_unit = Column(DECIMAL(10, 2), nullable=False, default=0, server_default='0')
     
     # Relacionamentos
     pickup_request_items = relationship('PickupRequestItem', back_populates='material')
@@ -73,15 +83,20 @@ class RecyclableMaterial(Base):
 class PickupRequest(Base):
     __tablename__ = 'pickup_requests'
     
-    id = Column(String(36), primary_key=True, default=generate_uuid)
-    producer_id = Column(String(36), ForeignKey('users.id'))
-    address_id = Column(String(36), ForeignKey('addresses.id'))
+    id = Column(UUIDType, primary_key=True, default=generate_uuid)
+    producer_id = Column(UUIDType, ForeignKey('users.id'))
+    address_id = Column(UUIDType, ForeignKey('addresses.id'), index=True)
     scheduled_time = Column(TIMESTAMP)
     status = Column(String(20))
     created_at = Column(TIMESTAMP, server_default=func.now())
     
     __table_args__ = (
         CheckConstraint("status IN ('PENDENTE', 'ACEITA', 'COLETADA', 'ENTREGUE', 'CANCELADA')", name='check_pickup_status'),
+        # "minhas coletas" paginado por (created_at, id) e fila de coletas por status/horário
+        Index('ix_pickup_requests_producer_id_created_at', 'producer_id', 'created_at'),
+        Index('ix_pickup_requests_status_scheduled_time', 'status', 'scheduled_time'),
+        # export do histórico em ordem de criação, filtrado por since/until
+        Index('ix_pickup_requests_created_at_id', 'created_at', 'id'),
     )
     
     # Relacionamentos
@@ -94,9 +109,9 @@ class PickupRequest(Base):
 class PickupRequestItem(Base):
     __tablename__ = 'pickup_request_items'
     
-    id = Column(String(36), primary_key=True, default=generate_uuid)
-    request_id = Column(String(36), ForeignKey('pickup_requests.id', ondelete='CASCADE'))
-    material_id = Column(String(36), ForeignKey('recyclable_materials.id'))
+    id = Column(UUIDType, primary_key=True, default=generate_uuid)
+    request_id = Column(UUIDType, ForeignKey('pickup_requests.id', ondelete='CASCADE'), index=True)
+    material_id = Column(UUIDType, ForeignKey('recyclable_materials.id'), index=True)
     weight_kg = Column(DECIMAL(10, 2), default=0)
     quantity = Column(Integer, default=1)
     
@@ -108,12 +123,17 @@ class PickupRequestItem(Base):
 class Collection(Base):
     __tablename__ = 'collections'
     
-    id = Column(String(36), primary_key=True, default=generate_uuid)
-    request_id = Column(String(36), ForeignKey('pickup_requests.id'))
-    collector_id = Column(String(36), ForeignKey('users.id'))
+    id = Column(UUIDType, primary_key=True, default=generate_uuid)
+    request_id = Column(UUIDType, ForeignKey('pickup_requests.id'), index=True)
+    collector_id = Column(UUIDType, ForeignKey('users.id'), index=True)
     collected_at = Column(TIMESTAMP)
     delivered_at = Column(TIMESTAMP)
-    destination_cooperative_id = Column(String(36), ForeignKey('users.id'))
+    destination_cooperative_id = Column(UUIDType, ForeignKey('users.id'), index=True)
+    
+    __table_args__ = (
+        # export das entregas em ordem de entrega, filtrado por since/until
+        Index('ix_collections_delivered_at_id', 'delivered_at', 'id'),
+    )
     
     # Relacionamentos
     request = relationship('PickupRequest', back_populates='collections')
@@ -125,12 +145,17 @@ class Collection(Base):
 class Reward(Base):
     __tablename__ = 'rewards'
     
-    id = Column(String(36), primary_key=True, default=generate_uuid)
-    user_id = Column(String(36), ForeignKey('users.id'))
-    collection_id = Column(String(36), ForeignKey('collections.id'))
+    id = Column(UUIDType, primary_key=True, default=generate_uuid)
+    user_id = Column(UUIDType, ForeignKey('users.id'), index=True)
+    collection_id = Column(UUIDType, ForeignKey('collections.id'), index=True)
     amount = Column(DECIMAL(10, 2), nullable=False)
     created_at = Column(TIMESTAMP, server_default=func.now())
     
+    __table_args__ = (
+        # garante uma única recompensa por coleta e usuário (reprocessamento idempotente)
+        Index('ux_rewards_collection_id_user_id', 'collection_id', 'user_id', unique=True),
+    )
+    
     # Relacionamentos
     user = relationship('User', back_populates='rewards')
     collection = relationship('Collection', back_populates='rewards')
@@ -139,20 +164,21 @@ class Reward(Base):
 class Wallet(Base):
     __tablename__ = 'wallet'
     
-    id = Column(String(36), primary_key=True, default=generate_uuid)
-    user_id = Column(String(36), ForeignKey('users.id'))
-    balance = Column(DECIMAL(10, 2), default=0)
+    id = Column(UUIDType, primary_key=True, default=generate_uuid)
+    user_id = Column(UUIDType, ForeignKey('users.id'), index=True, unique=True)
+    balance = Column(DECIMAL(10, 2), default=0)  # Mantido incrementalmente pelo wallet_service
     
     # Relacionamentos
     user = relationship('User', back_populates='wallet')
     transactions = relationship('WalletTransaction', back_populates='wallet')
+    checkpoints = relationship('WalletCheckpoint', back_populates='wallet')
 
 
 class WalletTransaction(Base):
     __tablename__ = 'wallet_transactions'
     
-    id = Column(String(36), primary_key=True, default=generate_uuid)
-    wallet_id = Column(String(36), ForeignKey('wallet.id'))
+    id = Column(UUIDType, primary_key=True, default=generate_uuid)
+    wallet_id = Column(UUIDType, ForeignKey('wallet.id'))
     amount = Column(DECIMAL(10, 2))
     type = Column(String(20))
     description = Column(Text)
@@ -160,18 +186,37 @@ class WalletTransaction(Base):
     
     __table_args__ = (
         CheckConstraint("type IN ('CREDITO', 'DEBITO')", name='check_transaction_type'),
+        # extrato da carteira em ordem cronológica
+        Index('ix_wallet_transactions_wallet_id_created_at', 'wallet_id', 'created_at'),
     )
     
     # Relacionamentos
     wallet = relationship('Wallet', back_populates='transactions')
 
 
+class WalletCheckpoint(Base):
+    __tablename__ = 'wallet_checkpoints'
+    
+    id = Column(UUIDType, primary_key=True, default=generate_uuid)
+    wallet_id = Column(UUIDType, ForeignKey('wallet.id'), nullable=False)
+    balance = Column(DECIMAL(12, 2), nullable=False)  # Saldo do extrato até as_of (inclusive)
+    as_of = Column(TIMESTAMP, nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    
+    __table_args__ = (
+        Index('ix_wallet_checkpoints_wallet_id_as_of', 'wallet_id', 'as_of'),
+    )
+    
+    # Relacionamentos
+    wallet = relationship('Wallet', back_populates='checkpoints')
+
+
 class Review(Base):
     __tablename__ = 'reviews'
     
-    id = Column(String(36), primary_key=True, default=generate_uuid)
-    reviewer_id = Column(String(36), ForeignKey('users.id'))
-    reviewed_user_id = Column(String(36), ForeignKey('users.id'))
+    id = Column(UUIDType, primary_key=True, default=generate_uuid)
+    reviewer_id = Column(UUIDType, ForeignKey('users.id'), index=True)
+    reviewed_user_id = Column(UUIDType, ForeignKey('users.id'), index=True)
     rating = Column(Integer)
     comment = Column(Text)
     created_at = Column(TIMESTAMP, server_default=func.now())
@@ -183,3 +228,35 @@ class Review(Base):
     # Relacionamentos
     reviewer = relationship('User', foreign_keys=[reviewer_id], back_populates='reviews_given')
     reviewed_user = relationship('User', foreign_keys=[reviewed_user_id], back_populates='reviews_received')
+
+
+class RatingSummary(Base):
+    __tablename__ = 'rating_summaries'
+    
+    # Agregado das avaliações recebidas, atualizado a cada Review inserida (review_repo)
+    user_id = Column(UUIDType, ForeignKey('users.id'), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_sum = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_1 = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_2 = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_3 = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_4 = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_5 = Column(Integer, nullable=False, default=0, server_default='0')
+    updated_at = Column(TIMESTAMP, server_default=func.now())
+    
+    # Relacionamentos
+    user = relationship('User', back_populates='rating_summary')
+
+
+class PickupRollup(Base):
+    __tablename__ = 'pickup_rollups'
+    
+    # Totais diários dos itens de coleta por material, cidade e status (pickup_analytics).
+    # Cada item conta no status atual da coleta; transições movem os totais entre status.
+    bucket_date = Column(Date, primary_key=True)  # dia de scheduled_time (ou created_at)
+    material_id = Column(String(36), primary_key=True)  # '' para itens sem material
+    city = Column(String(100), primary_key=True)  # '' para endereços sem cidade
+    status = Column(String(20), primary_key=True)
+    item_count = Column(Integer, nullable=False, default=0, server_default='0')
+    quantity = Column(Integer, nullable=False, default=0, server_default='0')
+    weight_kg = Column(DECIMAL(14, 2), nullable=False, default=0, server_default='0')
@@ -0,0 +1,83 @@
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, status, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.async_connection import get_async_db
+from src.routes.utility_router import require_role
+from src.schemas import return_schema, analytics_schema
+from src.cache.principal_cache import Principal
+from src.services.pickup_analytics import PickupRollupService, aggregate_report
+from src.services.pickup_transitions import PICKUP_STATUSES
+
+
+router = APIRouter(prefix="/analytics", tags=["Relatórios"])
+
+
+@router.get(
+    "/materials",
+    status_code=status.HTTP_200_OK,
+    summary="Kg e itens recolhidos por material, período e cidade",
+    response_model=return_schema.ReturnTrueData[analytics_schema.MaterialReportOut],
+    responses = {
+        status.HTTP_400_BAD_REQUEST: {"model": return_schema.ReturnError},
+        status.HTTP_403_FORBIDDEN: {"model": return_schema.ReturnError},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": return_schema.ReturnError},
+    }
+)
+async def materials_report(
+    start: date = Query(..., description="Primeiro dia do intervalo (inclusive)"),
+    end: date = Query(..., description="Último dia do intervalo (inclusive)"),
+    granularity: Literal["day", "week", "month"] = Query(default="week", description="Tamanho do período"),
+    statuses: list[str] = Query(default=["ENTREGUE"], alias="status", description="Status das coletas consideradas"),
+    city: str | None = Query(default=None, description="Filtra por cidade"),
+    material_id: str | None = Query(default=None, description="Filtra por material"),
+    by_city: bool = Query(default=True, description="Separa os totais por cidade"),
+    current_user: Principal = Depends(require_role(["ADMIN", "COOPERATIVA"])),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint de relatório de reciclagem por material e período.
+    Apenas usuários com a função 'ADMIN' ou 'COOPERATIVA' podem acessar este endpoint.
+
+    Lê somente a tabela de rollups diários (pickup_rollups), mantida a cada criação e
+    transição de coleta; semanas e meses são agregados em memória com NumPy. Semanas
+    começam na segunda-feira e os totais de um período parcial cobrem só os dias do intervalo.
+
+    - **start** / **end**: Intervalo de datas (dia agendado da coleta).
+    - **granularity**: day, week ou month.
+    - **status**: Status considerados (padrão ENTREGUE); pode ser repetido.
+    - **city** / **material_id**: Filtros opcionais.
+    - **by_city**: Quando false, soma todas as cidades.
+
+    Retorna as linhas do relatório ou uma mensagem de erro.
+    """
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start deve ser anterior ou igual a end"
+        )
+
+    invalid = sorted(set(statuses) - PICKUP_STATUSES)
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Status inválido: {', '.join(invalid)}"
+        )
+
+    try:
+        rows = await PickupRollupService(session).load(start, end, statuses, city, material_id)
+        report = aggregate_report(rows, granularity, by_city)
+
+        return return_schema.ReturnTrueData(data=analytics_schema.MaterialReportOut(
+            start=start,
+            end=end,
+            granularity=granularity,
+            statuses=statuses,
+            rows=[analytics_schema.MaterialReportRowOut.model_validate(row) for row in report],
+        ))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao gerar relatório: {str(e)}"
+        )
@@ -3,8 +3,8 @@ from fastapi.responses import JSONResponse
 from src.database.repository import user_repo
 from src.routes.utility_router import get_logged_user
 from src.schemas import return_schema, user_schema
-from sqlalchemy.orm import Session
-from src.database.connection import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.async_connection import get_async_db
 from src.utils import hash_providers, token_providers
 
 
@@ -21,9 +21,9 @@ router = APIRouter(prefix="/auth", tags=["Autenticação"])
         status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": return_schema.ReturnError},
     }
 )
-async def signup(user: user_schema.UserSignUp, session: Session = Depends(get_db)):
-    user.password = hash_providers.generate_hash(user.password)
-    user_query = user_repo.User(session).create_user(user)
+async def signup(user: user_schema.UserSignUp, session: AsyncSession = Depends(get_async_db)):
+    user.password = await hash_providers.generate_hash_async(user.password)
+    user_query = await user_repo.AsyncUser(session).create_user(user)
     if not user_query:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -41,14 +41,14 @@ async def signup(user: user_schema.UserSignUp, session: Session = Depends(get_db
         status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": return_schema.ReturnError},
     }
 )
-async def login(user: user_schema.UserLogin, session: Session = Depends(get_db)):
-    user_query = user_repo.User(session).get_user_by_email(user.email)
+async def login(user: user_schema.UserLogin, session: AsyncSession = Depends(get_async_db)):
+    user_query = await user_repo.AsyncUser(session).get_user_by_email(user.email)
     if not user_query:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content=dict(return_schema.ReturnError(errors=["Credenciais inválidas."]))
         )
-    if not hash_providers.verify_hash(user.password, user_query.password):
+    if not await hash_providers.verify_hash_async(user.password, user_query.password):
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content=dict(return_schema.ReturnError(errors=["Credenciais inválidas."]))
@@ -58,8 +58,8 @@ async def login(user: user_schema.UserLogin, session: Session = Depends(get_db))
 
     # Armazena o hash do refresh token no banco
 
-    user_repo.User(session).save_refresh_token(user_query.id, refresh_token)
-    user_repo.User(session).activate_user(user_query.id)
+    await user_repo.AsyncUser(session).save_refresh_token(user_query.id, refresh_token)
+    await user_repo.AsyncUser(session).activate_user(user_query.id)
 
     return return_schema.ReturnTrueData(
         data=user_schema.Token(access_token=access_token, refresh_token=refresh_token, token_type="Bearer", expires_in_minutes=60),
@@ -75,16 +75,16 @@ async def login(user: user_schema.UserLogin, session: Session = Depends(get_db))
         status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": return_schema.ReturnError},
     }
 )
-async def refresh_token(token_data: user_schema.RefreshTokenRequest, session: Session = Depends(get_db)):
+async def refresh_token(token_data: user_schema.RefreshTokenRequest, session: AsyncSession = Depends(get_async_db)):
     user_id = token_providers.verify_refresh_token(token_data.refresh_token)
 
-    if not user_repo.User(session).verify_refresh_token(user_id, token_data.refresh_token):
+    if not await user_repo.AsyncUser(session).verify_refresh_token(user_id, token_data.refresh_token):
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content=dict(return_schema.ReturnError(errors=["Refresh token inválido."]))
         )
     
-    user = user_repo.User(session).get_user_by_id(user_id)
+    user = await user_repo.AsyncUser(session).get_user_by_id(user_id)
     if not user or not user.is_active:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -93,7 +93,7 @@ async def refresh_token(token_data: user_schema.RefreshTokenRequest, session: Se
     access_token = token_providers.create_access_token({"sub": str(user.id)})
     refresh_token = token_providers.create_refresh_token({"sub": str(user.id)})
 
-    user_repo.User(session).save_refresh_token(user.id, refresh_token)
+    await user_repo.AsyncUser(session).save_refresh_token(user.id, refresh_token)
 
     return return_schema.ReturnTrueData(
         data=user_schema.Token(access_token=access_token, refresh_token=refresh_token, token_type="Bearer", expires_in_minutes=60),
@@ -109,7 +109,7 @@ async def refresh_token(token_data: user_schema.RefreshTokenRequest, session: Se
         status.HTTP_401_UNAUTHORIZED: {"model": return_schema.ReturnError},
     }
 )
-async def get_me(session: Session = Depends(get_db), user: user_schema.UserOut = Depends(get_logged_user)):
+async def get_me(session: AsyncSession = Depends(get_async_db), user: user_schema.UserOut = Depends(get_logged_user)):
     return return_schema.ReturnTrueData(
         data=user
     )
@@ -123,6 +123,6 @@ async def get_me(session: Session = Depends(get_db), user: user_schema.UserOut =
         status.HTTP_401_UNAUTHORIZED: {"model": return_schema.ReturnError},
     }
 )
-async def logout(session: Session = Depends(get_db), user: user_schema.UserOut = Depends(get_logged_user)):
-    user_repo.User(session).deactivate_user(user.id)
+async def logout(session: AsyncSession = Depends(get_async_db), user: user_schema.UserOut = Depends(get_logged_user)):
+    await user_repo.AsyncUser(session).deactivate_user(user.id)
     return return_schema.ReturnTrue(message="Logout realizado com sucesso.")
\ No newline at end of file
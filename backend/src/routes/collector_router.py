@@ -0,0 +1,234 @@
+import asyncio
+from fastapi import APIRouter, status, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.async_connection import AsyncSessionLocal, get_async_db
+from src.routes.utility_router import require_role, resolve_principal
+from src.schemas import return_schema, collector_schema
+from src.cache.principal_cache import Principal
+from src.services.spatial_index import pending_pickup_index
+from src.services.pickup_feed import FeedArea, FeedFull, pickup_feed
+from src.utils.json_providers import EnvelopeSerializer
+from src.database.repository import collection_repo
+from src.utils.uuid_providers import UUIDStr
+
+
+router = APIRouter(prefix="/collector", tags=["Coletores"])
+
+nearby_serializer = EnvelopeSerializer(collector_schema.NearbyPickupOut)
+
+# Códigos de fechamento do WebSocket (RFC 6455)
+WS_POLICY_VIOLATION = 1008
+WS_TRY_AGAIN_LATER = 1013
+
+
+@router.get(
+    "/nearby_pickups",
+    status_code=status.HTTP_200_OK,
+    summary="Listar coletas pendentes próximas ao coletor",
+    response_model=return_schema.ReturnTrueData[list[collector_schema.NearbyPickupOut]],
+    responses = {
+        status.HTTP_400_BAD_REQUEST: {"model": return_schema.ReturnError},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": return_schema.ReturnError},
+        status.HTTP_403_FORBIDDEN: {"model": return_schema.ReturnError},
+    }
+)
+async def nearby_pickups(
+    latitude: float = Query(..., ge=-90, le=90, description="Latitude atual do coletor"),
+    longitude: float = Query(..., ge=-180, le=180, description="Longitude atual do coletor"),
+    radius_km: float | None = Query(default=None, gt=0, le=100, description="Raio máximo de busca em km"),
+    limit: int = Query(default=20, ge=1, le=200, description="Quantidade máxima de coletas"),
+    current_user: Principal = Depends(require_role(["COLETOR"])),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint para listar as coletas pendentes mais próximas da posição do coletor.
+    Apenas usuários com a função 'COLETOR' podem acessar este endpoint.
+
+    Sem **radius_km**, retorna as **limit** coletas mais próximas; com **radius_km**,
+    retorna até **limit** coletas dentro do raio. Em ambos os casos, da mais próxima para a mais distante.
+
+    - **latitude** / **longitude**: Posição atual do coletor.
+    - **radius_km**: Raio máximo de busca (opcional).
+    - **limit**: Quantidade máxima de coletas.
+    - **current_user**: Usuário atualmente logado (deve ter função 'COLETOR').
+    - **session**: Sessão do banco de dados.
+
+    Retorna a lista de coletas pendentes com a distância em km ou uma mensagem de erro.
+    """
+    try:
+        if radius_km is None:
+            found = await pending_pickup_index.nearest(session, latitude, longitude, limit)
+        else:
+            found = await pending_pickup_index.within_radius(session, latitude, longitude, radius_km, limit)
+
+        return nearby_serializer.response([
+            {
+                "id": point.pickup_id,
+                "address_id": point.address_id,
+                "city": point.city,
+                "latitude": point.latitude,
+                "longitude": point.longitude,
+                "scheduled_time": point.scheduled_time,
+                "distance_km": round(distance, 3),
+            }
+            for point, distance in found
+        ])
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao buscar coletas próximas: {str(e)}"
+        )
+
+
+@router.get(
+    "/route",
+    status_code=status.HTTP_200_OK,
+    summary="Planejar a rota das coletas aceitas até a cooperativa",
+    response_model=return_schema.ReturnTrueData[collector_schema.RoutePlanOut],
+    responses = {
+        status.HTTP_400_BAD_REQUEST: {"model": return_schema.ReturnError},
+        status.HTTP_404_NOT_FOUND: {"model": return_schema.ReturnError},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": return_schema.ReturnError},
+        status.HTTP_403_FORBIDDEN: {"model": return_schema.ReturnError},
+    }
+)
+async def plan_route(
+    cooperative_id: UUIDStr = Query(..., description="ID da cooperativa de destino"),
+    latitude: float | None = Query(default=None, ge=-90, le=90, description="Latitude inicial do coletor (opcional)"),
+    longitude: float | None = Query(default=None, ge=-180, le=180, description="Longitude inicial do coletor (opcional)"),
+    current_user: Principal = Depends(require_role(["COLETOR"])),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint para ordenar as paradas das coletas aceitas pelo coletor, terminando na cooperativa.
+    Apenas usuários com a função 'COLETOR' podem acessar este endpoint.
+
+    A ordem é calculada por vizinho mais próximo seguido de 2-opt sobre a matriz de distâncias.
+    Sem posição inicial, a rota começa pela parada que resulta no menor percurso.
+
+    - **cooperative_id**: Cooperativa onde os materiais serão entregues.
+    - **latitude** / **longitude**: Posição inicial do coletor (opcional).
+    - **current_user**: Usuário atualmente logado (deve ter função 'COLETOR').
+    - **session**: Sessão do banco de dados.
+
+    Retorna as paradas em ordem com as distâncias de cada trecho ou uma mensagem de erro.
+    """
+    if (latitude is None) != (longitude is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe latitude e longitude juntas"
+        )
+
+    repo = collection_repo.AsyncCollectionRepo(session)
+    try:
+        destination = await repo.get_cooperative_location(cooperative_id)
+        rows = await repo.get_accepted_stops(current_user.id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao planejar rota: {str(e)}"
+        )
+
+    if destination is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cooperativa não encontrada ou sem endereço com coordenadas"
+        )
+
+    # Import tardio: o NumPy só é carregado quando alguma rota é planejada, não na inicialização do worker
+    from src.services import route_planner
+
+    placed = [row for row in rows if row.latitude is not None and row.longitude is not None]
+    unplaced = [str(row.pickup_id) for row in rows if row.latitude is None or row.longitude is None]
+    start = (latitude, longitude) if latitude is not None else None
+
+    plan = route_planner.plan_route(
+        [(float(row.latitude), float(row.longitude)) for row in placed],
+        destination,
+        start
+    )
+
+    stops = [
+        collector_schema.RouteStopOut(
+            order=position + 1,
+            pickup_id=str(placed[index].pickup_id),
+            address_id=str(placed[index].address_id),
+            city=placed[index].city,
+            latitude=float(placed[index].latitude),
+            longitude=float(placed[index].longitude),
+            scheduled_time=placed[index].scheduled_time,
+            leg_km=round(leg, 3),
+        )
+        for position, (index, leg) in enumerate(zip(plan.order, plan.leg_km))
+    ]
+
+    return return_schema.ReturnTrueData(data=collector_schema.RoutePlanOut(
+        stops=stops,
+        destination_latitude=destination[0],
+        destination_longitude=destination[1],
+        destination_leg_km=round(plan.destination_leg_km, 3),
+        total_km=round(plan.total_km, 3),
+        nearest_neighbour_km=round(plan.nearest_neighbour_km, 3),
+        unplaced_pickup_ids=unplaced,
+    ))
+
+
+@router.websocket("/feed")
+async def pickup_feed_socket(
+    websocket: WebSocket,
+    token: str = Query(..., description="Access token (navegadores não enviam o header Authorization no WebSocket)"),
+    latitude: float | None = Query(default=None, ge=-90, le=90),
+    longitude: float | None = Query(default=None, ge=-180, le=180),
+    radius_km: float | None = Query(default=None, gt=0, le=100)
+):
+    """
+    WebSocket que envia ao coletor as coletas pendentes criadas enquanto ele está conectado.
+    Apenas usuários com a função 'COLETOR' podem se conectar.
+
+    Com **latitude**, **longitude** e **radius_km**, só chegam coletas dentro do raio.
+    Mensagens: {"type": "pickup_created", "data": {...}} e {"type": "pickup_removed", "data": {"id", "status"}}.
+
+    A conexão é fechada com o código 1013 se o cliente não acompanhar o ritmo
+    das mensagens; ao reconectar, ele deve recarregar a lista por /collector/nearby_pickups.
+    """
+    # Sessão só durante a autenticação: conexões ociosas não podem segurar conexões do pool
+    async with AsyncSessionLocal() as session:
+        try:
+            principal = await resolve_principal(token, session)
+        except HTTPException:
+            await websocket.close(code=WS_POLICY_VIOLATION)
+            return
+
+    area_params = (latitude, longitude, radius_km)
+    if principal.role != "COLETOR" or (None in area_params and any(param is not None for param in area_params)):
+        await websocket.close(code=WS_POLICY_VIOLATION)
+        return
+
+    area = FeedArea(latitude, longitude, radius_km) if latitude is not None else None
+    try:
+        subscription = pickup_feed.subscribe(principal.id, area)
+    except FeedFull:
+        await websocket.close(code=WS_TRY_AGAIN_LATER)
+        return
+
+    await websocket.accept()
+
+    async def send_messages():
+        while True:
+            message = await subscription.queue.get()
+            if message is None:
+                code = WS_TRY_AGAIN_LATER if subscription.overflowed else 1001
+                await websocket.close(code=code)
+                return
+            await websocket.send_text(message)
+
+    sender = asyncio.create_task(send_messages())
+    try:
+        # O cliente não envia nada; receber só serve para detectar o fechamento da conexão
+        while True:
+            await websocket.receive_text()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        sender.cancel()
+        pickup_feed.unsubscribe(subscription)
@@ -0,0 +1,115 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, status, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from src.routes.utility_router import require_role
+from src.schemas import return_schema
+from src.cache.principal_cache import Principal
+from src.services.history_export import MEDIA_TYPES, collection_export_select, pickup_export_select, stream_export
+from src.services.pickup_transitions import PICKUP_STATUSES
+
+
+router = APIRouter(prefix="/export", tags=["Exportação"])
+
+_EXPORT_RESPONSES = {
+    status.HTTP_200_OK: {"content": {"text/csv": {}, "application/x-ndjson": {}, "application/gzip": {}}},
+    status.HTTP_400_BAD_REQUEST: {"model": return_schema.ReturnError},
+    status.HTTP_403_FORBIDDEN: {"model": return_schema.ReturnError},
+    status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": return_schema.ReturnError},
+}
+
+
+def _check_interval(since: datetime | None, until: datetime | None):
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="since deve ser anterior a until"
+        )
+
+
+def _export_response(name: str, stmt, export_format: str, gzip: bool) -> StreamingResponse:
+    filename = f"{name}-{datetime.now():%Y%m%d-%H%M%S}.{export_format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream_export(stmt, export_format, compress=gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    "/pickups",
+    status_code=status.HTTP_200_OK,
+    summary="Exporta o histórico de coletas e itens (CSV ou NDJSON)",
+    response_class=StreamingResponse,
+    responses=_EXPORT_RESPONSES,
+)
+async def export_pickups(
+    export_format: Literal["csv", "ndjson"] = Query(default="csv", alias="format", description="Formato do arquivo"),
+    since: datetime | None = Query(default=None, description="Coletas criadas a partir deste instante (inclusive)"),
+    until: datetime | None = Query(default=None, description="Coletas criadas antes deste instante"),
+    statuses: list[str] | None = Query(default=None, alias="status", description="Filtra por status; pode ser repetido"),
+    gzip: bool = Query(default=False, description="Comprime o arquivo com gzip"),
+    current_user: Principal = Depends(require_role(["ADMIN", "COOPERATIVA"])),
+):
+    """
+    Endpoint de exportação do histórico de coletas.
+    Apenas usuários com a função 'ADMIN' ou 'COOPERATIVA' podem acessar este endpoint;
+    cooperativas recebem só as coletas entregues para elas.
+
+    O arquivo tem uma linha por item de coleta e é gerado enquanto as linhas são lidas
+    do banco (cursor no servidor), com memória constante independente do tamanho.
+
+    - **format**: csv (padrão) ou ndjson.
+    - **since** / **until**: Intervalo de created_at da coleta.
+    - **status**: Status considerados (padrão todos).
+    - **gzip**: Quando true, o arquivo é enviado comprimido (.gz).
+
+    Retorna o arquivo ou uma mensagem de erro.
+    """
+    _check_interval(since, until)
+
+    invalid = sorted(set(statuses or []) - PICKUP_STATUSES)
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Status inválido: {', '.join(invalid)}"
+        )
+
+    cooperative_id = current_user.id if current_user.role == "COOPERATIVA" else None
+    stmt = pickup_export_select(since, until, statuses, cooperative_id)
+    return _export_response("pickups", stmt, export_format, gzip)
+
+
+@router.get(
+    "/collections",
+    status_code=status.HTTP_200_OK,
+    summary="Exporta as entregas com os totais de itens e kg (CSV ou NDJSON)",
+    response_class=StreamingResponse,
+    responses=_EXPORT_RESPONSES,
+)
+async def export_collections(
+    export_format: Literal["csv", "ndjson"] = Query(default="csv", alias="format", description="Formato do arquivo"),
+    since: datetime | None = Query(default=None, description="Entregas a partir deste instante (inclusive)"),
+    until: datetime | None = Query(default=None, description="Entregas antes deste instante"),
+    gzip: bool = Query(default=False, description="Comprime o arquivo com gzip"),
+    current_user: Principal = Depends(require_role(["ADMIN", "COOPERATIVA"])),
+):
+    """
+    Endpoint de exportação do histórico de entregas.
+    Apenas usuários com a função 'ADMIN' ou 'COOPERATIVA' podem acessar este endpoint;
+    cooperativas recebem só as entregas feitas para elas.
+
+    O arquivo tem uma linha por coleta entregue, com quantidade de itens, unidades e kg.
+
+    - **format**: csv (padrão) ou ndjson.
+    - **since** / **until**: Intervalo de delivered_at.
+    - **gzip**: Quando true, o arquivo é enviado comprimido (.gz).
+
+    Retorna o arquivo ou uma mensagem de erro.
+    """
+    _check_interval(since, until)
+
+    cooperative_id = current_user.id if current_user.role == "COOPERATIVA" else None
+    stmt = collection_export_select(since, until, cooperative_id)
+    return _export_response("collections", stmt, export_format, gzip)
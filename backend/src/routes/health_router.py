@@ -0,0 +1,97 @@
+from fastapi import APIRouter, status, Depends
+from src.database.connection import get_pool_metrics
+from src.routes.utility_router import require_role
+from src.schemas import return_schema
+from src.utils import hash_providers
+from src.cache.principal_cache import Principal
+from src.services.reward_pipeline import reward_worker
+from src.services.pickup_feed import pickup_feed
+from src.services.cluster_events import cluster_events
+
+
+router = APIRouter(prefix="/health", tags=["Saúde"])
+
+
+@router.get(
+    "/live",
+    status_code=status.HTTP_200_OK,
+    summary="Verifica se o worker está no ar",
+    response_model=return_schema.ReturnTrue,
+)
+async def live():
+    """
+    Endpoint sem autenticação e sem acesso ao banco, para healthchecks e para medir o tempo de inicialização.
+    """
+    return return_schema.ReturnTrue()
+
+
+@router.get(
+    "/pool",
+    status_code=status.HTTP_200_OK,
+    summary="Métricas do pool de conexões com o banco de dados",
+    response_model=return_schema.ReturnTrueData[dict],
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": return_schema.ReturnError},
+        status.HTTP_403_FORBIDDEN: {"model": return_schema.ReturnError},
+    }
+)
+async def pool_metrics(current_user: Principal = Depends(require_role(["ADMIN"]))):
+    """
+    Endpoint para consultar as métricas do pool de conexões (checkouts, esperas e timeouts).
+    Apenas usuários com a função 'ADMIN' podem acessar este endpoint.
+    """
+    return return_schema.ReturnTrueData(data=get_pool_metrics())
+
+
+@router.get(
+    "/hashing",
+    status_code=status.HTTP_200_OK,
+    summary="Métricas do executor de hashing de senhas",
+    response_model=return_schema.ReturnTrueData[dict],
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": return_schema.ReturnError},
+        status.HTTP_403_FORBIDDEN: {"model": return_schema.ReturnError},
+    }
+)
+async def hashing_metrics(current_user: Principal = Depends(require_role(["ADMIN"]))):
+    """
+    Endpoint para consultar as métricas do executor de hashing (fila, execuções e rejeições).
+    Apenas usuários com a função 'ADMIN' podem acessar este endpoint.
+    """
+    return return_schema.ReturnTrueData(data=hash_providers.hash_executor.snapshot())
+
+
+@router.get(
+    "/rewards",
+    status_code=status.HTTP_200_OK,
+    summary="Métricas do worker de recompensas",
+    response_model=return_schema.ReturnTrueData[dict],
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": return_schema.ReturnError},
+        status.HTTP_403_FORBIDDEN: {"model": return_schema.ReturnError},
+    }
+)
+async def reward_metrics(current_user: Principal = Depends(require_role(["ADMIN"]))):
+    """
+    Endpoint para consultar as métricas do worker de recompensas (fila, lotes e falhas).
+    Apenas usuários com a função 'ADMIN' podem acessar este endpoint.
+    """
+    return return_schema.ReturnTrueData(data=reward_worker.snapshot())
+
+
+@router.get(
+    "/feed",
+    status_code=status.HTTP_200_OK,
+    summary="Métricas do feed de coletas (WebSocket)",
+    response_model=return_schema.ReturnTrueData[dict],
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": return_schema.ReturnError},
+        status.HTTP_403_FORBIDDEN: {"model": return_schema.ReturnError},
+    }
+)
+async def feed_metrics(current_user: Principal = Depends(require_role(["ADMIN"]))):
+    """
+    Endpoint para consultar as métricas do feed de coletas do worker (assinantes, mensagens, desconexões por lentidão e eventos entre workers).
+    Apenas usuários com a função 'ADMIN' podem acessar este endpoint.
+    """
+    return return_schema.ReturnTrueData(data={**pickup_feed.snapshot(), "cluster_events": cluster_events.snapshot()})
@@ -0,0 +1,36 @@
+import hmac
+import os
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from src.middlewares.request_metrics import request_metrics
+
+
+router = APIRouter(tags=["Saúde"])
+
+# Token exigido no header Authorization do scrape (vazio = /metrics aberto, proteja pela rede)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK,
+    summary="Métricas das requisições no formato do Prometheus",
+    response_class=PlainTextResponse,
+)
+async def metrics(authorization: str | None = Header(default=None)):
+    """
+    Endpoint de scrape do Prometheus com latência, status, queries e tempo de banco por rota.
+
+    Quando METRICS_TOKEN está configurado, exige o header **Authorization: Bearer <METRICS_TOKEN>**.
+    Com METRICS_MULTIPROC_DIR, as métricas somam todos os workers; sem ele, são do worker que atendeu a requisição.
+    """
+    if METRICS_TOKEN and not hmac.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token de métricas inválido"
+        )
+
+    return PlainTextResponse(request_metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,181 @@
+from fastapi import APIRouter, status, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.async_connection import get_async_db
+from src.routes.utility_router import get_logged_user, require_role
+from src.schemas import return_schema, residue_schema
+from src.cache.principal_cache import Principal
+from src.services.pickup_transitions import (
+    PickupTransitionService, PickupNotFound, TransitionConflict, TransitionForbidden, TransitionResult
+)
+from src.services.spatial_index import pending_pickup_index
+from src.services.reward_pipeline import reward_worker
+from src.services.pickup_feed import pickup_feed
+from src.services.cluster_events import cluster_events
+from src.utils.uuid_providers import UUIDStr
+
+
+router = APIRouter(prefix="/pickups", tags=["Coletas"])
+
+TRANSITION_RESPONSES = {
+    status.HTTP_403_FORBIDDEN: {"model": return_schema.ReturnError},
+    status.HTTP_404_NOT_FOUND: {"model": return_schema.ReturnError},
+    status.HTTP_409_CONFLICT: {"model": return_schema.ReturnError},
+}
+
+
+async def _run_transition(transition) -> TransitionResult:
+    """Executa a transição e converte as falhas do compare-and-set em erros HTTP"""
+    try:
+        result = await transition
+    except PickupNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coleta não encontrada")
+    except TransitionForbidden:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Coleta pertence a outro usuário")
+    except TransitionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Coleta está com status {e.current_status}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao atualizar coleta: {str(e)}"
+        )
+
+    pending_pickup_index.on_status_changed(result.pickup_id, result.status)
+    pickup_feed.publish_removed(result.pickup_id, result.status)
+    if result.status != "PENDENTE":
+        cluster_events.publish("pickup_status", id=result.pickup_id, status=result.status)
+    return result
+
+
+def _transition_out(result: TransitionResult):
+    return return_schema.ReturnTrueData(data=residue_schema.PickupTransitionOut(
+        id=result.pickup_id,
+        status=result.status,
+        collection_id=result.collection_id,
+    ))
+
+
+@router.post(
+    "/{pickup_id}/accept",
+    status_code=status.HTTP_200_OK,
+    summary="Aceitar uma coleta pendente",
+    response_model=return_schema.ReturnTrueData[residue_schema.PickupTransitionOut],
+    responses=TRANSITION_RESPONSES
+)
+async def accept_pickup(
+    pickup_id: UUIDStr,
+    current_user: Principal = Depends(require_role(["COLETOR"])),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint para o coletor aceitar uma coleta (PENDENTE -> ACEITA).
+    Apenas usuários com a função 'COLETOR' podem acessar este endpoint.
+
+    Se vários coletores aceitarem a mesma coleta ao mesmo tempo, apenas um
+    consegue; os demais recebem 409.
+
+    - **pickup_id**: Coleta a ser aceita.
+    - **current_user**: Usuário atualmente logado (deve ter função 'COLETOR').
+    - **session**: Sessão do banco de dados.
+
+    Retorna o novo status e o ID da Collection criada ou uma mensagem de erro.
+    """
+    result = await _run_transition(PickupTransitionService(session).accept(pickup_id, current_user.id))
+    return _transition_out(result)
+
+
+@router.post(
+    "/{pickup_id}/collect",
+    status_code=status.HTTP_200_OK,
+    summary="Marcar uma coleta aceita como coletada",
+    response_model=return_schema.ReturnTrueData[residue_schema.PickupTransitionOut],
+    responses=TRANSITION_RESPONSES
+)
+async def collect_pickup(
+    pickup_id: UUIDStr,
+    current_user: Principal = Depends(require_role(["COLETOR"])),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint para o coletor registrar que retirou os materiais (ACEITA -> COLETADA).
+    Apenas o coletor que aceitou a coleta pode acessar este endpoint.
+
+    - **pickup_id**: Coleta retirada.
+    - **current_user**: Usuário atualmente logado (deve ter função 'COLETOR').
+    - **session**: Sessão do banco de dados.
+
+    Retorna o novo status ou uma mensagem de erro.
+    """
+    result = await _run_transition(PickupTransitionService(session).collect(pickup_id, current_user.id))
+    return _transition_out(result)
+
+
+@router.post(
+    "/{pickup_id}/deliver",
+    status_code=status.HTTP_200_OK,
+    summary="Registrar a entrega de uma coleta na cooperativa",
+    response_model=return_schema.ReturnTrueData[residue_schema.PickupTransitionOut],
+    responses={
+        **TRANSITION_RESPONSES,
+        status.HTTP_400_BAD_REQUEST: {"model": return_schema.ReturnError},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": return_schema.ReturnError},
+    }
+)
+async def deliver_pickup(
+    pickup_id: UUIDStr,
+    delivery: residue_schema.PickupDeliveryIn,
+    current_user: Principal = Depends(require_role(["COLETOR"])),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint para o coletor registrar a entrega dos materiais na cooperativa (COLETADA -> ENTREGUE).
+    Apenas o coletor que aceitou a coleta pode acessar este endpoint.
+
+    A recompensa do produtor é calculada em segundo plano pelo worker de recompensas.
+
+    - **pickup_id**: Coleta entregue.
+    - **delivery**: Cooperativa que recebeu os materiais.
+    - **current_user**: Usuário atualmente logado (deve ter função 'COLETOR').
+    - **session**: Sessão do banco de dados.
+
+    Retorna o novo status ou uma mensagem de erro.
+    """
+    service = PickupTransitionService(session)
+    if not await service.is_cooperative(delivery.cooperative_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cooperativa não encontrada"
+        )
+
+    result = await _run_transition(service.deliver(pickup_id, current_user.id, delivery.cooperative_id))
+    if result.collection_id:
+        reward_worker.enqueue([result.collection_id])
+    return _transition_out(result)
+
+
+@router.post(
+    "/{pickup_id}/cancel",
+    status_code=status.HTTP_200_OK,
+    summary="Cancelar uma coleta",
+    response_model=return_schema.ReturnTrueData[residue_schema.PickupTransitionOut],
+    responses=TRANSITION_RESPONSES
+)
+async def cancel_pickup(
+    pickup_id: UUIDStr,
+    current_user: Principal = Depends(get_logged_user),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint para o produtor cancelar uma coleta ainda não retirada (PENDENTE ou ACEITA -> CANCELADA).
+    Apenas o produtor que solicitou a coleta pode acessar este endpoint.
+
+    - **pickup_id**: Coleta a ser cancelada.
+    - **current_user**: Usuário atualmente logado (produtor da coleta).
+    - **session**: Sessão do banco de dados.
+
+    Retorna o novo status ou uma mensagem de erro.
+    """
+    result = await _run_transition(PickupTransitionService(session).cancel(pickup_id, current_user.id))
+    return _transition_out(result)
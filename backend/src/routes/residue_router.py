@@ -1,15 +1,20 @@
-from fastapi import APIRouter, status, Depends, HTTPException
+from fastapi import APIRouter, status, Depends, HTTPException, Header, Query, Response
 from fastapi.responses import JSONResponse
+from pydantic import ValidationError
 from src.database.repository import user_repo, residue_repo
 from src.routes.utility_router import get_logged_user, require_role
 from src.schemas import return_schema, user_schema, residue_schema
-from sqlalchemy.orm import Session
-from src.database.connection import get_db
-from src.utils import hash_providers, token_providers
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.async_connection import get_async_db
+from src.utils import hash_providers, token_providers, cursor_providers
+from src.utils.json_providers import EnvelopeSerializer
+from src.cache.material_catalog import material_catalog
 
 
 router = APIRouter(prefix="/residue", tags=["Resíduos"])
 
+pickups_serializer = EnvelopeSerializer(residue_schema.PickupRequestOut)
+
 @router.post(
     "/register_material",
     status_code=status.HTTP_200_OK,
@@ -24,7 +29,7 @@ router = APIRouter(prefix="/residue", tags=["Resíduos"])
 async def register_material(
     material: residue_schema.RecyclableMaterial,
     current_user: user_schema.TokenUser = Depends(get_logged_user),
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """
     Endpoint para registrar um novo material reciclável no sistema.
@@ -37,7 +42,7 @@ async def register_material(
     Retorna uma confirmação de sucesso ou uma mensagem de erro.
     """
     try:
-        residue = residue_repo.ResidueRepo(session).register_recyclable_material(material)
+        residue = await residue_repo.AsyncResidueRepo(session).register_recyclable_material(material)
 
         return return_schema.ReturnTrueData(data=residue_schema.RecyclableMaterialOut.model_validate(residue))
     except Exception as e:
@@ -58,28 +63,36 @@ async def register_material(
     }
 )
 async def list_materials(
+    if_none_match: str | None = Header(default=None),
     current_user: user_schema.TokenUser = Depends(get_logged_user),
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """
     Endpoint para listar todos os materiais recicláveis registrados no sistema.
     Pode ser acessado por qualquer usuário autenticado.
 
+    A resposta vem de um cache já serializado e traz o header **ETag**. Enviando o
+    mesmo valor em **If-None-Match**, a API responde 304 sem corpo se o catálogo não mudou.
+
+    - **if_none_match**: ETag recebido na última consulta (opcional).
     - **current_user**: Usuário atualmente logado.
     - **session**: Sessão do banco de dados.
 
     Retorna uma lista de materiais recicláveis ou uma mensagem de erro.
     """
     try:
-        materials = residue_repo.ResidueRepo(session).get_all_recyclable_materials()
-        materials_out = [residue_schema.RecyclableMaterialOut.model_validate(material) for material in materials]
-
-        return return_schema.ReturnTrueData(data=materials_out)
+        catalog = await material_catalog.get(session)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao listar materiais: {str(e)}"
         )
+
+    headers = {"ETag": catalog.etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and catalog.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=catalog.body, media_type="application/json", headers=headers)
     
 @router.post(
     "/register_pickup",
@@ -95,7 +108,7 @@ async def list_materials(
 async def register_pickup(
     pickup: residue_schema.PickupRequest,
     current_user: user_schema.TokenUser = Depends(get_logged_user),
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """
     Endpoint para registrar uma nova coleta de material reciclável no sistema.
@@ -108,7 +121,7 @@ async def register_pickup(
     Retorna uma confirmação de sucesso ou uma mensagem de erro.
     """
     try:
-        pick_up_query = residue_repo.ResidueRepo(session).create_pickup_request(pickup, current_user.id)
+        pick_up_query = await residue_repo.AsyncResidueRepo(session).create_pickup_request(pickup, current_user.id)
         return return_schema.ReturnTrue()
     except Exception as e:
         raise HTTPException(
@@ -116,6 +129,86 @@ async def register_pickup(
             detail=f"Erro ao registrar coleta: {str(e)}"
         )
     
+@router.post(
+    "/register_pickups",
+    status_code=status.HTTP_200_OK,
+    summary="Registrar várias coletas de material reciclável de uma vez",
+    response_model=return_schema.ReturnTrueData[residue_schema.PickupBatchResult],
+    responses = {
+        status.HTTP_400_BAD_REQUEST: {"model": return_schema.ReturnError},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": return_schema.ReturnError},
+        status.HTTP_403_FORBIDDEN: {"model": return_schema.ReturnError},
+    }
+)
+async def register_pickups(
+    batch: residue_schema.PickupRequestBatch,
+    all_or_nothing: bool = Query(default=False, description="Se verdadeiro, nenhuma coleta é criada quando alguma for inválida"),
+    current_user: user_schema.TokenUser = Depends(get_logged_user),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint para registrar várias coletas de material reciclável em uma única transação.
+    Pode ser acessado por qualquer usuário autenticado.
+
+    Cada coleta é validada individualmente (formato, endereço do usuário e materiais existentes).
+    As coletas válidas são criadas e os erros são retornados com a posição da coleta na lista.
+
+    - **batch**: Lista de coletas no mesmo formato de /register_pickup.
+    - **all_or_nothing**: Não cria nenhuma coleta se alguma for inválida.
+    - **current_user**: Usuário atualmente logado.
+    - **session**: Sessão do banco de dados.
+
+    Retorna os IDs das coletas criadas e os erros por coleta.
+    """
+    valid_pickups: list[tuple[int, residue_schema.PickupRequest]] = []
+    errors: list[residue_schema.PickupBatchError] = []
+
+    for index, raw_pickup in enumerate(batch.pickups):
+        try:
+            valid_pickups.append((index, residue_schema.PickupRequest.model_validate(raw_pickup)))
+        except ValidationError as e:
+            errors.append(residue_schema.PickupBatchError(
+                index=index,
+                errors=[f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}" for error in e.errors()]
+            ))
+
+    try:
+        repo = residue_repo.AsyncResidueRepo(session)
+        found_addresses, found_materials = await repo.get_pickup_reference_ids(
+            current_user.id,
+            {pickup.address_id for _, pickup in valid_pickups},
+            {item.material_id for _, pickup in valid_pickups for item in pickup.items}
+        )
+
+        to_create: list[residue_schema.PickupRequest] = []
+        for index, pickup in valid_pickups:
+            pickup_errors = []
+            if pickup.address_id not in found_addresses:
+                pickup_errors.append(f"address_id: endereço {pickup.address_id} não encontrado para o usuário")
+            for item_index, item in enumerate(pickup.items):
+                if item.material_id not in found_materials:
+                    pickup_errors.append(f"items.{item_index}.material_id: material {item.material_id} não encontrado")
+
+            if pickup_errors:
+                errors.append(residue_schema.PickupBatchError(index=index, errors=pickup_errors))
+            else:
+                to_create.append(pickup)
+
+        errors.sort(key=lambda error: error.index)
+        if errors and all_or_nothing:
+            to_create = []
+
+        created_ids = await repo.create_pickup_requests_bulk(to_create, current_user.id) if to_create else []
+
+        return return_schema.ReturnTrueData(
+            data=residue_schema.PickupBatchResult(created_ids=created_ids, errors=errors)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao registrar coletas: {str(e)}"
+        )
+
 @router.get(
     "/my_pickups",
     status_code=status.HTTP_200_OK,
@@ -128,45 +221,42 @@ async def register_pickup(
     }
 )
 async def get_my_pickups(
+    cursor: str | None = Query(default=None, description="Cursor retornado no header X-Next-Cursor da página anterior"),
+    limit: int = Query(default=50, ge=1, le=200, description="Quantidade máxima de coletas por página"),
     current_user : user_schema.TokenUser = Depends(get_logged_user),
-    session: Session = Depends(get_db) 
+    session: AsyncSession = Depends(get_async_db) 
 ):
     """
-    Endpoint para listar todas as coletas de material reciclável do usuário logado.
+    Endpoint para listar as coletas de material reciclável do usuário logado.
     Pode ser acessado por qualquer usuário autenticado.
 
+    A listagem é paginada por cursor, da coleta mais recente para a mais antiga.
+    Quando houver mais resultados, o header **X-Next-Cursor** traz o cursor da próxima página.
+    As coletas são serializadas direto dos objetos do ORM, sem revalidação pelo response_model.
+
+    - **cursor**: Cursor da página anterior (opcional).
+    - **limit**: Quantidade máxima de coletas por página.
     - **current_user**: Usuário atualmente logado.
     - **session**: Sessão do banco de dados.
 
     Retorna uma lista de coletas ou uma mensagem de erro.
     """
+    decoded_cursor = cursor_providers.decode_cursor(cursor) if cursor else None
+
     try:
-        pickups = residue_repo.ResidueRepo(session).get_pickup_requests_by_producer(current_user.id)
-        pickups_out = []
+        pickups, has_more = await residue_repo.AsyncResidueRepo(session).get_pickup_requests_page(
+            current_user.id, limit, decoded_cursor
+        )
 
-        for pickup in pickups:
-            pickup_items = residue_repo.ResidueRepo(session).get_pickup_request_items(str(pickup.id))
-            pickup_items_out = [residue_schema.RecyclableMaterialItem.model_validate(item) for item in pickup_items]
-            pickup_out = residue_schema.PickupRequestOut.model_validate(pickup)
-            pickup_out.items = pickup_items_out
-            pickups_out.append(pickup_out)
+        headers = {}
+        if has_more:
+            last = pickups[-1]
+            headers["X-Next-Cursor"] = cursor_providers.encode_cursor(last.created_at, str(last.id))
 
-        return return_schema.ReturnTrueData(data=pickups_out)
-            
+        return pickups_serializer.response(pickups, headers=headers)
 
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao listar coletas: {str(e)}"
         )
-    
-    
-
-
-
-
-    
-    
-    
-
-
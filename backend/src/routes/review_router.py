@@ -0,0 +1,104 @@
+from fastapi import APIRouter, status, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.async_connection import get_async_db
+from src.routes.utility_router import get_logged_user
+from src.schemas import return_schema, review_schema
+from src.cache.principal_cache import Principal
+from src.database.repository import review_repo
+from src.utils.uuid_providers import UUIDStr
+
+
+router = APIRouter(prefix="/reviews", tags=["Avaliações"])
+
+
+@router.post(
+    "",
+    status_code=status.HTTP_200_OK,
+    summary="Avaliar um usuário",
+    response_model=return_schema.ReturnTrueData[review_schema.ReviewCreatedOut],
+    responses = {
+        status.HTTP_400_BAD_REQUEST: {"model": return_schema.ReturnError},
+        status.HTTP_404_NOT_FOUND: {"model": return_schema.ReturnError},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": return_schema.ReturnError},
+    }
+)
+async def create_review(
+    review: review_schema.ReviewIn,
+    current_user: Principal = Depends(get_logged_user),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint para registrar uma avaliação de outro usuário.
+    Pode ser acessado por qualquer usuário autenticado.
+
+    O resumo de reputação do usuário avaliado é atualizado na mesma transação
+    e retornado junto com a avaliação.
+
+    - **review**: Usuário avaliado, nota (1 a 5) e comentário opcional.
+    - **current_user**: Usuário atualmente logado (autor da avaliação).
+    - **session**: Sessão do banco de dados.
+
+    Retorna a avaliação criada e o resumo atualizado ou uma mensagem de erro.
+    """
+    if review.reviewed_user_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Não é possível avaliar a si mesmo"
+        )
+
+    repo = review_repo.AsyncReviewRepo(session)
+    if not await repo.user_exists(review.reviewed_user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuário avaliado não encontrado"
+        )
+
+    try:
+        created, summary = await repo.create_review(
+            current_user.id, review.reviewed_user_id, review.rating, review.comment
+        )
+        return return_schema.ReturnTrueData(data=review_schema.ReviewCreatedOut(
+            review=review_schema.ReviewOut.model_validate(created),
+            summary=review_schema.RatingSummaryOut.from_summary(review.reviewed_user_id, summary),
+        ))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao registrar avaliação: {str(e)}"
+        )
+
+
+@router.get(
+    "/summary/{user_id}",
+    status_code=status.HTTP_200_OK,
+    summary="Consultar o resumo de avaliações de um usuário",
+    response_model=return_schema.ReturnTrueData[review_schema.RatingSummaryOut],
+    responses = {
+        status.HTTP_400_BAD_REQUEST: {"model": return_schema.ReturnError},
+    }
+)
+async def get_rating_summary(
+    user_id: UUIDStr,
+    current_user: Principal = Depends(get_logged_user),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint para consultar quantidade, média e histograma das avaliações recebidas por um usuário.
+    Pode ser acessado por qualquer usuário autenticado.
+
+    O resumo é lido de uma única linha pré-calculada, sem agregar as avaliações.
+
+    - **user_id**: Usuário avaliado.
+    - **current_user**: Usuário atualmente logado.
+    - **session**: Sessão do banco de dados.
+
+    Retorna o resumo (vazio se o usuário ainda não foi avaliado) ou uma mensagem de erro.
+    """
+    try:
+        summary = await review_repo.AsyncReviewRepo(session).get_summary(user_id)
+        return return_schema.ReturnTrueData(data=review_schema.RatingSummaryOut.from_summary(user_id, summary))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao consultar avaliações: {str(e)}"
+        )
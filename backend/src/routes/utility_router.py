@@ -1,51 +1,71 @@
 from fastapi import Depends, status, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.utils import token_providers
 from src.database.repository import user_repo
-from src.database.connection import get_db
+from src.database.async_connection import get_async_db
 from src.models import models
+from src.cache.principal_cache import Principal, principal_cache
 
 # HTTPBearer é mais moderno que OAuth2PasswordBearer para APIs REST
 security = HTTPBearer()
 
 
-def get_logged_user(
+async def get_logged_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: Session = Depends(get_db)
-) -> models.User:
+    session: AsyncSession = Depends(get_async_db)
+) -> Principal:
     """
     Dependency para obter o usuário logado a partir do access token
+
+    O usuário é buscado primeiro no principal_cache; o banco só é consultado
+    em caso de miss (a AsyncSession não abre conexão se não for usada).
     
     Uso:
         @router.get("/me")
-        def get_me(current_user: User = Depends(get_logged_user)):
+        def get_me(current_user: Principal = Depends(get_logged_user)):
             return current_user
     """
-    token = credentials.credentials  # Extrai o token do header
-    
+    return await resolve_principal(credentials.credentials, session)
+
+
+async def resolve_principal(token: str, session: AsyncSession) -> Principal:
+    """
+    Valida o access token e retorna o Principal do usuário (principal_cache ou banco)
+
+    Usado por get_logged_user e por rotas que recebem o token fora do header
+    Authorization (ex.: WebSocket). Lança HTTPException 401 se o token ou o
+    usuário forem inválidos.
+    """
     # Verifica e decodifica o access token
     try:
         user_id = token_providers.verify_access_token(token)
     except HTTPException:
         raise  # Re-lança exceções do verify_access_token
     
-    # Busca o usuário no banco
-    user = user_repo.User(session).get_user_by_id(user_id)
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido: usuário não encontrado"
-        )
+    principal = principal_cache.get(user_id)
+
+    if principal is None:
+        # Geração lida antes do SELECT: um logout concorrente impede o set() abaixo
+        generation = principal_cache.generation(user_id)
+        user = await user_repo.AsyncUser(session).get_user_by_id(user_id)
+        
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token inválido: usuário não encontrado"
+            )
+
+        principal = Principal.from_user(user)
+        principal_cache.set(principal, generation)
     
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido: usuário inativo"
         )
     
-    return user
+    return principal
 
 
 def get_current_user_id(
@@ -76,17 +96,17 @@ def require_role(required_roles: list[str]):
     Uso:
         @router.post("/admin-only")
         def admin_endpoint(
-            current_user: User = Depends(require_role(["ADMIN"]))
+            current_user: Principal = Depends(require_role(["ADMIN"]))
         ):
             return {"message": "Admin access"}
         
         @router.post("/collector-or-coop")
         def collector_endpoint(
-            current_user: User = Depends(require_role(["COLETOR", "COOPERATIVA"]))
+            current_user: Principal = Depends(require_role(["COLETOR", "COOPERATIVA"]))
         ):
             return {"message": "Collector access"}
     """
-    def role_checker(current_user: models.User = Depends(get_logged_user)) -> models.User:
+    def role_checker(current_user: Principal = Depends(get_logged_user)) -> Principal:
         if current_user.role not in required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,101 @@
+from fastapi import APIRouter, status, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.async_connection import get_async_db
+from src.routes.utility_router import get_logged_user
+from src.schemas import return_schema, wallet_schema
+from src.cache.principal_cache import Principal
+from src.services.wallet_service import WalletService
+from src.utils import cursor_providers
+from src.utils.json_providers import EnvelopeSerializer
+
+
+router = APIRouter(prefix="/wallet", tags=["Carteira"])
+
+transactions_serializer = EnvelopeSerializer(wallet_schema.WalletTransactionOut)
+
+
+@router.get(
+    "/me",
+    status_code=status.HTTP_200_OK,
+    summary="Consultar o saldo da carteira do usuário logado",
+    response_model=return_schema.ReturnTrueData[wallet_schema.WalletOut],
+    responses = {
+        status.HTTP_400_BAD_REQUEST: {"model": return_schema.ReturnError},
+        status.HTTP_403_FORBIDDEN: {"model": return_schema.ReturnError},
+    }
+)
+async def get_my_wallet(
+    current_user: Principal = Depends(get_logged_user),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint para consultar o saldo da carteira do usuário logado.
+    Pode ser acessado por qualquer usuário autenticado.
+
+    O saldo é lido diretamente da carteira (mantido a cada transação), sem somar o extrato.
+
+    - **current_user**: Usuário atualmente logado.
+    - **session**: Sessão do banco de dados.
+
+    Retorna o saldo atual ou uma mensagem de erro.
+    """
+    try:
+        balance = await WalletService(session).get_balance(current_user.id)
+        return return_schema.ReturnTrueData(data=wallet_schema.WalletOut(user_id=current_user.id, balance=balance))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao consultar carteira: {str(e)}"
+        )
+
+
+@router.get(
+    "/me/transactions",
+    status_code=status.HTTP_200_OK,
+    summary="Listar o extrato da carteira do usuário logado",
+    response_model=return_schema.ReturnTrueData[list[wallet_schema.WalletTransactionOut]],
+    responses = {
+        status.HTTP_400_BAD_REQUEST: {"model": return_schema.ReturnError},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": return_schema.ReturnError},
+        status.HTTP_403_FORBIDDEN: {"model": return_schema.ReturnError},
+    }
+)
+async def get_my_transactions(
+    cursor: str | None = Query(default=None, description="Cursor retornado no header X-Next-Cursor da página anterior"),
+    limit: int = Query(default=50, ge=1, le=200, description="Quantidade máxima de transações por página"),
+    current_user: Principal = Depends(get_logged_user),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint para listar as transações da carteira do usuário logado.
+    Pode ser acessado por qualquer usuário autenticado.
+
+    A listagem é paginada por cursor, da transação mais recente para a mais antiga.
+    Quando houver mais resultados, o header **X-Next-Cursor** traz o cursor da próxima página.
+
+    - **cursor**: Cursor da página anterior (opcional).
+    - **limit**: Quantidade máxima de transações por página.
+    - **current_user**: Usuário atualmente logado.
+    - **session**: Sessão do banco de dados.
+
+    Retorna uma lista de transações ou uma mensagem de erro.
+    """
+    decoded_cursor = cursor_providers.decode_cursor(cursor) if cursor else None
+
+    try:
+        transactions, has_more = await WalletService(session).list_transactions(
+            current_user.id, limit, decoded_cursor
+        )
+
+        headers = {}
+        if has_more:
+            last = transactions[-1]
+            headers["X-Next-Cursor"] = cursor_providers.encode_cursor(last.created_at, str(last.id))
+
+        return transactions_serializer.response(transactions, headers=headers)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao listar transações: {str(e)}"
+        )
@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+from datetime import date
+
+
+class MaterialReportRowOut(BaseModel):
+    period_start: date = Field(..., description="Início do período (dia, segunda-feira da semana ou 1º dia do mês)")
+    material_id: str
+    material_type: str | None = None
+    city: str | None = Field(default=None, description="Cidade do endereço (nula quando by_city=false ou sem cidade)")
+    item_count: int = Field(..., description="Itens de coleta somados")
+    quantity: int = Field(..., description="Quantidade de unidades")
+    weight_kg: float = Field(..., description="Peso total em kg")
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class MaterialReportOut(BaseModel):
+    start: date
+    end: date
+    granularity: str
+    statuses: list[str]
+    rows: list[MaterialReportRowOut] = Field(default_factory=list)
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+class NearbyPickupOut(BaseModel):
+    id: str = Field(..., description="ID da coleta pendente")
+    address_id: str
+    city: str | None = None
+    latitude: float
+    longitude: float
+    scheduled_time: datetime | None = None
+    distance_km: float = Field(..., description="Distância em km até a posição informada")
+
+
+class RouteStopOut(BaseModel):
+    order: int = Field(..., description="Posição da parada na rota, começando em 1")
+    pickup_id: str
+    address_id: str
+    city: str | None = None
+    latitude: float
+    longitude: float
+    scheduled_time: datetime | None = None
+    leg_km: float = Field(..., description="Distância desde a parada anterior (ou da posição inicial)")
+
+
+class RoutePlanOut(BaseModel):
+    stops: list[RouteStopOut] = Field(default_factory=list)
+    destination_latitude: float
+    destination_longitude: float
+    destination_leg_km: float = Field(..., description="Distância da última parada até a cooperativa")
+    total_km: float
+    nearest_neighbour_km: float = Field(..., description="Distância da rota gulosa, antes do 2-opt")
+    unplaced_pickup_ids: list[str] = Field(default_factory=list, description="Coletas aceitas sem coordenadas no endereço")
@@ -1,9 +1,18 @@
 from pydantic import BaseModel,Field, field_validator
+from typing import Any
 from datetime import datetime
+from decimal import Decimal
+
+from src.utils.uuid_providers import UUIDStr
+
+# Quantidade máxima de coletas aceitas em uma única requisição de /register_pickups
+PICKUP_BATCH_MAX_SIZE = 500
 
 class RecyclableMaterial(BaseModel):
     type: str = Field(..., description="Type of recyclable material", examples=["plastic", "paper", "glass"])
     description: str | None = Field(default=None, description="Description of the recyclable material")
+    reward_per_kg: Decimal = Field(default=Decimal("0"), ge=0, max_digits=10, decimal_places=2, description="Reward paid per kg delivered")
+    reward_per_unit: Decimal = Field(default=Decimal("0"), ge=0, max_digits=10, decimal_places=2, description="Reward paid per unit delivered")
 
     model_config = {
         "from_attributes": True
@@ -13,13 +22,15 @@ class RecyclableMaterialOut(BaseModel):
     id: str
     type: str = Field(..., description="Type of recyclable material", examples=["plastic", "paper", "glass"])
     description: str | None = Field(default=None, description="Description of the recyclable material")
+    reward_per_kg: Decimal = Field(default=Decimal("0"), description="Reward paid per kg delivered")
+    reward_per_unit: Decimal = Field(default=Decimal("0"), description="Reward paid per unit delivered")
 
     model_config = {
         "from_attributes": True
     }
 
 class RecyclableMaterialItem(BaseModel):
-    material_id: str = Field(..., description="ID of the recyclable material")
+    material_id: UUIDStr = Field(..., description="ID of the recyclable material")
     quantity: int = Field(..., gt=0, description="Quantity of the material items")
     weight_kg: float | None = Field(default=None, description="Weight of the material items in kilograms")
 
@@ -29,7 +40,7 @@ class RecyclableMaterialItem(BaseModel):
 
 
 class PickupRequest(BaseModel):
-    address_id: str
+    address_id: UUIDStr
     scheduled_time: datetime
     items: list[RecyclableMaterialItem] = Field(default_factory=list)
 
@@ -51,4 +62,30 @@ class PickupRequestOut(BaseModel):
     }
 
 
+class PickupRequestBatch(BaseModel):
+    pickups: list[dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=PICKUP_BATCH_MAX_SIZE,
+        description="Coletas no mesmo formato de /register_pickup; cada uma é validada individualmente"
+    )
+
+
+class PickupBatchError(BaseModel):
+    index: int = Field(..., description="Posição da coleta na lista enviada")
+    errors: list[str]
+
+
+class PickupBatchResult(BaseModel):
+    created_ids: list[str] = Field(default_factory=list, description="IDs das coletas criadas, na ordem de envio")
+    errors: list[PickupBatchError] = Field(default_factory=list)
+
+
+class PickupDeliveryIn(BaseModel):
+    cooperative_id: UUIDStr = Field(..., description="ID of the cooperative receiving the materials")
+
 
+class PickupTransitionOut(BaseModel):
+    id: str = Field(..., description="ID of the pickup request")
+    status: str = Field(..., description="New status of the pickup request")
+    collection_id: str | None = Field(default=None, description="ID of the collection linked to the pickup")
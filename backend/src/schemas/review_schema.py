@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+from src.utils.uuid_providers import UUIDStr
+
+
+class ReviewIn(BaseModel):
+    reviewed_user_id: UUIDStr = Field(..., description="ID do usuário avaliado")
+    rating: int = Field(..., ge=1, le=5, description="Nota de 1 a 5")
+    comment: str | None = Field(default=None, max_length=1000)
+
+
+class ReviewOut(BaseModel):
+    id: str
+    reviewer_id: str
+    reviewed_user_id: str
+    rating: int
+    comment: str | None = None
+    created_at: datetime | None = None
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class RatingSummaryOut(BaseModel):
+    user_id: str
+    review_count: int = 0
+    average: float | None = Field(default=None, description="Média das notas (nula sem avaliações)")
+    histogram: dict[str, int] = Field(default_factory=dict, description="Quantidade de avaliações por nota, de 1 a 5")
+
+    @classmethod
+    def from_summary(cls, user_id: str, summary) -> "RatingSummaryOut":
+        if summary is None or not summary.review_count:
+            return cls(user_id=user_id, histogram={str(value): 0 for value in range(1, 6)})
+        return cls(
+            user_id=user_id,
+            review_count=summary.review_count,
+            average=round(summary.rating_sum / summary.review_count, 2),
+            histogram={str(value): getattr(summary, f"rating_{value}") for value in range(1, 6)},
+        )
+
+
+class ReviewCreatedOut(BaseModel):
+    review: ReviewOut
+    summary: RatingSummaryOut
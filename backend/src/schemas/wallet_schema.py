@@ -0,0 +1,18 @@
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+from decimal import Decimal
+
+
+class WalletOut(BaseModel):
+    user_id: str
+    balance: Decimal = Field(..., description="Saldo atual da carteira")
+
+
+class WalletTransactionOut(BaseModel):
+    id: str
+    amount: Decimal
+    type: str = Field(..., description="CREDITO ou DEBITO")
+    description: str | None = None
+    created_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,173 @@
+import asyncio
+import json
+import os
+import uuid
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+
+import dbg
+
+# Canal do LISTEN/NOTIFY do PostgreSQL compartilhado pelos workers
+CLUSTER_EVENTS_CHANNEL = os.getenv("CLUSTER_EVENTS_CHANNEL", "recicla_ai_events")
+# Espera entre tentativas de reconectar o LISTEN
+CLUSTER_EVENTS_RETRY_SECONDS = float(os.getenv("CLUSTER_EVENTS_RETRY_SECONDS", "2"))
+
+# O payload do NOTIFY é limitado a 8000 bytes: IDs de coletas vão em lotes
+_IDS_PER_MESSAGE = 150
+
+
+class ClusterEvents:
+    """
+    Eventos entre os workers da API via LISTEN/NOTIFY do PostgreSQL
+
+    Caches, índice espacial e feed de coletas vivem na memória de cada worker.
+    Quem altera o estado aplica a mudança no próprio worker e publica um
+    evento; os demais workers recebem pelo LISTEN e aplicam a mesma mudança:
+        - principal: invalida o usuário no cache de autenticação
+        - materials: invalida o catálogo de materiais
+        - pickups_created: adiciona as coletas ao índice e publica no feed
+        - pickup_status: remove a coleta do índice e avisa o feed
+
+    publish() não bloqueia e pode ser chamado de qualquer thread; o envio é
+    feito por uma task com uma conexão do pool. Fora do PostgreSQL (SQLite,
+    processo único) ou antes de start(), publish() não faz nada. Se o LISTEN
+    cair, os caches são limpos na reconexão e os TTLs cobrem a janela sem eventos.
+    """
+
+    def __init__(self, channel: str, retry_seconds: float):
+        self.channel = channel
+        self.retry_seconds = retry_seconds
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._outbox: asyncio.Queue[str] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self.published = 0
+        self.received = 0
+        self.reconnects = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self, database_url: str, async_engine):
+        url = make_url(database_url)
+        if url.get_backend_name() != "postgresql":
+            return
+        self._loop = asyncio.get_running_loop()
+        self._outbox = asyncio.Queue()
+        conninfo = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self._tasks = [
+            asyncio.create_task(self._listen(conninfo)),
+            asyncio.create_task(self._send(async_engine)),
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    def publish(self, kind: str, **data):
+        if self._loop is None:
+            return
+        payloads = []
+        if kind == "pickups_created":
+            ids = data["ids"]
+            for offset in range(0, len(ids), _IDS_PER_MESSAGE):
+                payloads.append({"origin": self.origin, "kind": kind, "data": {"ids": ids[offset:offset + _IDS_PER_MESSAGE]}})
+        else:
+            payloads.append({"origin": self.origin, "kind": kind, "data": data})
+        for payload in payloads:
+            self._loop.call_soon_threadsafe(self._outbox.put_nowait, json.dumps(payload, separators=(",", ":")))
+
+    async def _send(self, async_engine):
+        while True:
+            message = await self._outbox.get()
+            batch = [message]
+            while not self._outbox.empty():
+                batch.append(self._outbox.get_nowait())
+            try:
+                async with async_engine.connect() as connection:
+                    for payload in batch:
+                        await connection.execute(select(func.pg_notify(self.channel, payload)))
+                    await connection.commit()
+                self.published += len(batch)
+            except Exception as error:
+                dbg.log_error(f"Falha ao publicar eventos entre workers: {error}", events=len(batch))
+
+    async def _listen(self, conninfo: str):
+        import psycopg
+
+        connected_before = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as connection:
+                    await connection.execute(f'LISTEN "{self.channel}"')
+                    if connected_before:
+                        # Eventos perdidos enquanto desconectado: descarta o que pode estar velho
+                        self.reconnects += 1
+                        _reset_local_state()
+                    connected_before = True
+                    async for notify in connection.notifies():
+                        await self._dispatch(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                dbg.log_warn(f"LISTEN {self.channel} interrompido: {error}")
+            await asyncio.sleep(self.retry_seconds)
+
+    async def _dispatch(self, raw: str):
+        try:
+            event = json.loads(raw)
+            if event.get("origin") == self.origin:
+                return
+            self.received += 1
+            await _apply(event["kind"], event["data"])
+        except Exception as error:
+            dbg.log_error(f"Falha ao aplicar evento entre workers: {error}")
+
+    def snapshot(self) -> dict:
+        return {
+            "running": self.running,
+            "channel": self.channel,
+            "published": self.published,
+            "received": self.received,
+            "reconnects": self.reconnects,
+        }
+
+
+async def _apply(kind: str, data: dict):
+    from src.cache.material_catalog import material_catalog
+    from src.cache.principal_cache import principal_cache
+    from src.database.async_connection import AsyncSessionLocal
+    from src.services.pickup_feed import pickup_feed
+    from src.services.spatial_index import pending_pickup_index
+
+    if kind == "principal":
+        principal_cache.invalidate(data["user_id"], broadcast=False)
+    elif kind == "materials":
+        material_catalog.invalidate(broadcast=False)
+    elif kind == "pickups_created":
+        if not (pending_pickup_index.loaded or pickup_feed.has_subscribers):
+            return
+        async with AsyncSessionLocal() as session:
+            points = await pending_pickup_index.on_pickups_created(
+                session, data["ids"], load_points=pickup_feed.has_subscribers
+            )
+        pickup_feed.publish_created(points)
+    elif kind == "pickup_status":
+        pending_pickup_index.on_status_changed(data["id"], data["status"])
+        pickup_feed.publish_removed(data["id"], data["status"])
+
+
+def _reset_local_state():
+    from src.cache.material_catalog import material_catalog
+    from src.cache.principal_cache import principal_cache
+
+    principal_cache.clear()
+    material_catalog.invalidate(broadcast=False)
+
+
+cluster_events = ClusterEvents(CLUSTER_EVENTS_CHANNEL, CLUSTER_EVENTS_RETRY_SECONDS)
@@ -0,0 +1,186 @@
+import csv
+import io
+import os
+import zlib
+from datetime import date, datetime
+from typing import AsyncIterator
+
+from sqlalchemy import func, select
+
+import dbg
+from src.database.async_connection import AsyncSessionLocal
+from src.models import models
+from src.utils.json_providers import dumps
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+# Linhas buscadas do cursor do servidor por vez (e escritas em cada pedaço da resposta)
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "1000"))
+
+# Nível de compressão do gzip (1 = mais rápido, 9 = menor)
+EXPORT_GZIP_LEVEL = int(os.getenv("EXPORT_GZIP_LEVEL", "6"))
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+def pickup_export_select(
+    since: datetime | None = None,
+    until: datetime | None = None,
+    statuses: list[str] | None = None,
+    cooperative_id: str | None = None,
+):
+    """
+    Uma linha por item de coleta, com os dados da coleta, do endereço e do coletor
+
+    Coletas sem itens aparecem uma vez, com os campos do item vazios. O filtro
+    de datas usa created_at da coleta ([since, until)); cooperative_id restringe
+    às coletas entregues para a cooperativa.
+    """
+    pickup = models.PickupRequest
+    item = models.PickupRequestItem
+    collection = models.Collection
+
+    stmt = (
+        select(
+            pickup.id.label("pickup_id"),
+            pickup.created_at,
+            pickup.scheduled_time,
+            pickup.status,
+            pickup.producer_id,
+            models.Address.city,
+            collection.collector_id,
+            collection.destination_cooperative_id,
+            item.id.label("item_id"),
+            item.material_id,
+            models.RecyclableMaterial.type.label("material_type"),
+            item.quantity,
+            item.weight_kg,
+        )
+        .select_from(pickup)
+        .outerjoin(models.Address, models.Address.id == pickup.address_id)
+        .outerjoin(collection, collection.request_id == pickup.id)
+        .outerjoin(item, item.request_id == pickup.id)
+        .outerjoin(models.RecyclableMaterial, models.RecyclableMaterial.id == item.material_id)
+        .order_by(pickup.created_at, pickup.id, item.id)
+    )
+    if since is not None:
+        stmt = stmt.where(pickup.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(pickup.created_at < until)
+    if statuses:
+        stmt = stmt.where(pickup.status.in_(statuses))
+    if cooperative_id is not None:
+        stmt = stmt.where(collection.destination_cooperative_id == cooperative_id)
+    return stmt
+
+
+def collection_export_select(
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cooperative_id: str | None = None,
+):
+    """
+    Uma linha por coleta entregue, com os totais dos itens
+
+    O filtro de datas usa delivered_at ([since, until)); cooperative_id
+    restringe às entregas para a cooperativa.
+    """
+    pickup = models.PickupRequest
+    item = models.PickupRequestItem
+    collection = models.Collection
+
+    stmt = (
+        select(
+            collection.id.label("collection_id"),
+            collection.request_id.label("pickup_id"),
+            collection.collector_id,
+            collection.destination_cooperative_id,
+            collection.collected_at,
+            collection.delivered_at,
+            pickup.producer_id,
+            models.Address.city,
+            func.count(item.id).label("item_count"),
+            func.coalesce(func.sum(item.quantity), 0).label("quantity"),
+            func.coalesce(func.sum(item.weight_kg), 0).label("weight_kg"),
+        )
+        .select_from(collection)
+        .join(pickup, pickup.id == collection.request_id)
+        .outerjoin(models.Address, models.Address.id == pickup.address_id)
+        .outerjoin(item, item.request_id == pickup.id)
+        .where(collection.delivered_at.is_not(None))
+        .group_by(
+            collection.id, collection.request_id, collection.collector_id, collection.destination_cooperative_id,
+            collection.collected_at, collection.delivered_at, pickup.producer_id, models.Address.city,
+        )
+        .order_by(collection.delivered_at, collection.id)
+    )
+    if since is not None:
+        stmt = stmt.where(collection.delivered_at >= since)
+    if until is not None:
+        stmt = stmt.where(collection.delivered_at < until)
+    if cooperative_id is not None:
+        stmt = stmt.where(collection.destination_cooperative_id == cooperative_id)
+    return stmt
+
+
+def _csv_writer():
+    buffer = io.StringIO()
+    return buffer, csv.writer(buffer, lineterminator="\n")
+
+
+def encode_rows(rows, columns: list[str], export_format: str) -> bytes:
+    """Converte um pedaço de linhas para CSV (sem cabeçalho) ou NDJSON"""
+    if export_format == "ndjson":
+        return b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+    buffer, writer = _csv_writer()
+    # Datas em ISO 8601, como no NDJSON (o csv usaria str(): "2026-10-18 14:17:01")
+    writer.writerows(
+        [value.isoformat() if isinstance(value, (date, datetime)) else value for value in row]
+        for row in rows
+    )
+    return buffer.getvalue().encode("utf-8")
+
+
+def _csv_header(columns: list[str]) -> bytes:
+    buffer, writer = _csv_writer()
+    writer.writerow(columns)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_export(stmt, export_format: str, compress: bool = False, chunk_rows: int = EXPORT_CHUNK_ROWS) -> AsyncIterator[bytes]:
+    """
+    Executa stmt com cursor no servidor e gera o arquivo em pedaços de bytes
+
+    A sessão é aberta aqui (e não pela dependency da rota) porque o corpo da
+    StreamingResponse é gerado depois que a rota retorna. Com yield_per, o
+    driver busca chunk_rows linhas por vez (cursor nomeado no PostgreSQL) e
+    cada lote é escrito e enviado antes do próximo, então a memória não cresce
+    com o tamanho do export. Com compress, a saída passa por um compressor
+    gzip incremental.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Formato inválido: {export_format}. Use um de: {', '.join(EXPORT_FORMATS)}")
+
+    columns = [column.name for column in stmt.selected_columns]
+    compressor = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31) if compress else None
+
+    def output(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+
+    rows = 0
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(stmt.execution_options(yield_per=chunk_rows))
+            if export_format == "csv":
+                yield output(_csv_header(columns))
+            async for partition in result.partitions():
+                rows += len(partition)
+                chunk = output(encode_rows(partition, columns, export_format))
+                if chunk:
+                    yield chunk
+        if compressor:
+            yield compressor.flush()
+    except Exception:
+        # O status 200 já foi enviado: o erro só pode interromper a resposta
+        dbg.log_error("Erro ao gerar export", rows=rows, export_format=export_format, exc_info=True)
+        raise
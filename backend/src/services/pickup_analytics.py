@@ -0,0 +1,223 @@
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import String, cast, delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.dialects import dialect_insert
+from src.models import models
+
+GRANULARITIES = ("day", "week", "month")
+
+_ROLLUP_KEY = ("bucket_date", "material_id", "city", "status")
+_ROLLUP_COLUMNS = _ROLLUP_KEY + ("item_count", "quantity", "weight_kg")
+
+
+def rollup_source_select(*conditions, status=None, sign: int = 1):
+    """
+    Agrega os itens de coleta no formato de pickup_rollups, a partir das tabelas de origem
+
+    Args:
+        conditions: Filtros sobre PickupRequest (ex.: id da coleta)
+        status: Status gravado nas linhas; por padrão o status atual da coleta
+        sign: -1 gera os totais negativos usados para retirar a coleta do status anterior
+    """
+    pickup = models.PickupRequest
+    item = models.PickupRequestItem
+    bucket = func.date(func.coalesce(pickup.scheduled_time, pickup.created_at))
+    # material_id da rollup é texto ('' para itens sem material); no PostgreSQL a origem é uuid
+    material = func.coalesce(cast(item.material_id, String), "")
+    city = func.coalesce(models.Address.city, "")
+    status_column = pickup.status if status is None else literal(status, type_=pickup.status.type)
+
+    return (
+        select(
+            bucket.label("bucket_date"),
+            material.label("material_id"),
+            city.label("city"),
+            status_column.label("status"),
+            (sign * func.count(item.id)).label("item_count"),
+            (sign * func.coalesce(func.sum(item.quantity), 0)).label("quantity"),
+            (sign * func.coalesce(func.sum(item.weight_kg), 0)).label("weight_kg"),
+        )
+        .select_from(item)
+        .join(pickup, pickup.id == item.request_id)
+        .outerjoin(models.Address, models.Address.id == pickup.address_id)
+        .where(pickup.status.is_not(None), func.coalesce(pickup.scheduled_time, pickup.created_at).is_not(None), *conditions)
+        .group_by(bucket, material, city, *([pickup.status] if status is None else []))
+        # Ordem fixa das chaves: coletas concorrentes travam as linhas do rollup na mesma ordem
+        .order_by(bucket, material, city)
+    )
+
+
+@dataclass(frozen=True)
+class ReportRow:
+    period_start: date
+    material_id: str
+    material_type: str | None
+    city: str | None
+    item_count: int
+    quantity: int
+    weight_kg: float
+
+
+class PickupRollupService:
+    """
+    Tabela pickup_rollups: totais diários por (dia, material, cidade, status)
+
+    Os totais são mantidos na mesma transação que altera as coletas: a criação
+    soma os itens no status PENDENTE e cada transição retira os itens do status
+    anterior e soma no novo, com INSERT ... SELECT ... ON CONFLICT DO UPDATE
+    (nenhuma leitura em Python). Os relatórios leem apenas os rollups.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _upsert(self, source):
+        table = models.PickupRollup
+        stmt = dialect_insert(self.db, table).from_select(list(_ROLLUP_COLUMNS), source)
+        await self.db.execute(stmt.on_conflict_do_update(
+            index_elements=list(_ROLLUP_KEY),
+            set_={
+                "item_count": table.item_count + stmt.excluded.item_count,
+                "quantity": table.quantity + stmt.excluded.quantity,
+                "weight_kg": table.weight_kg + stmt.excluded.weight_kg,
+            },
+        ))
+
+    async def add_pickups(self, pickup_ids: list[str]):
+        """Soma os itens de coletas recém-criadas (sem commit)"""
+        if pickup_ids:
+            await self._upsert(rollup_source_select(models.PickupRequest.id.in_(pickup_ids)))
+
+    async def move(self, pickup_id: str, previous_status: str):
+        """
+        Move os itens da coleta de previous_status para o status atual (sem commit)
+
+        Deve rodar depois do UPDATE da transição, na mesma transação. As linhas do
+        status anterior são travadas antes das do novo; como as transições seguem
+        a ordem PENDENTE -> ACEITA -> COLETADA -> ENTREGUE (ou CANCELADA), não há
+        ciclo de espera entre transições concorrentes.
+        """
+        await self._upsert(rollup_source_select(
+            models.PickupRequest.id == pickup_id, status=previous_status, sign=-1
+        ))
+        await self._upsert(rollup_source_select(models.PickupRequest.id == pickup_id))
+
+    async def rebuild(self) -> int:
+        """Recalcula todos os rollups a partir das coletas (backfill); retorna a quantidade de linhas"""
+        await self.db.execute(delete(models.PickupRollup))
+        await self.db.execute(
+            insert(models.PickupRollup).from_select(list(_ROLLUP_COLUMNS), rollup_source_select())
+        )
+        await self.db.commit()
+        return (await self.db.execute(select(func.count()).select_from(models.PickupRollup))).scalar_one()
+
+    async def load(
+        self,
+        start: date,
+        end: date,
+        statuses: list[str],
+        city: str | None = None,
+        material_id: str | None = None,
+    ) -> list:
+        """Linhas diárias do intervalo [start, end] com o tipo do material, somando os status pedidos"""
+        rollup = models.PickupRollup
+        stmt = (
+            select(
+                rollup.bucket_date, rollup.material_id, models.RecyclableMaterial.type, rollup.city,
+                func.sum(rollup.item_count).label("item_count"),
+                func.sum(rollup.quantity).label("quantity"),
+                func.sum(rollup.weight_kg).label("weight_kg"),
+            )
+            .outerjoin(models.RecyclableMaterial, cast(models.RecyclableMaterial.id, String) == rollup.material_id)
+            .where(
+                rollup.bucket_date >= start,
+                rollup.bucket_date <= end,
+                rollup.status.in_(statuses),
+                rollup.item_count > 0,
+            )
+            .group_by(rollup.bucket_date, rollup.material_id, models.RecyclableMaterial.type, rollup.city)
+        )
+        if city is not None:
+            stmt = stmt.where(rollup.city == city)
+        if material_id is not None:
+            stmt = stmt.where(rollup.material_id == material_id)
+        return list((await self.db.execute(stmt)).all())
+
+
+def _factorize(values) -> tuple[list, dict]:
+    """Valores distintos em ordem e o código (posição) de cada um"""
+    uniques = sorted(set(values), key=lambda value: (value is None, value))
+    return uniques, {value: code for code, value in enumerate(uniques)}
+
+
+def aggregate_report(rows: list, granularity: str, by_city: bool = True) -> list[ReportRow]:
+    """
+    Agrega as linhas diárias por (período, material, cidade) com NumPy
+
+    Dias, materiais e cidades viram códigos inteiros (poucos valores distintos),
+    os dias distintos são convertidos em início de semana (segunda-feira) ou de
+    mês por aritmética de datetime64 e cada linha recebe uma chave int64 única
+    para (período, material, cidade). Os totais são somados com np.bincount
+    sobre o np.unique das chaves, sem laços Python por grupo.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Granularidade inválida: {granularity}. Use uma de: {', '.join(GRANULARITIES)}")
+    if not rows:
+        return []
+
+    import numpy as np
+
+    days, material_ids, types, cities, item_counts, quantities, weights = zip(*rows)
+
+    unique_days, day_codes = _factorize(days)
+    day_values = np.array(unique_days, dtype="datetime64[D]")
+    if granularity == "week":
+        ordinal = day_values.astype(np.int64)
+        day_values = (ordinal - (ordinal + 3) % 7).astype("datetime64[D]")  # 1970-01-01 foi uma quinta-feira
+    elif granularity == "month":
+        day_values = day_values.astype("datetime64[M]").astype("datetime64[D]")
+    period_of_day = day_values.astype(np.int64)
+
+    unique_materials, material_codes = _factorize(material_ids)
+    unique_cities, city_codes = _factorize(cities) if by_city else ([None], {})
+    material_types = dict(zip(material_ids, types))
+
+    material_count, city_count = len(unique_materials), len(unique_cities)
+    period = period_of_day[np.fromiter((day_codes[day] for day in days), dtype=np.int64, count=len(rows))]
+    material = np.fromiter((material_codes[value] for value in material_ids), dtype=np.int64, count=len(rows))
+    city = (
+        np.fromiter((city_codes[value] for value in cities), dtype=np.int64, count=len(rows))
+        if by_city else np.zeros(len(rows), dtype=np.int64)
+    )
+
+    keys = (period * material_count + material) * city_count + city
+    groups, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    size = len(groups)
+
+    item_count = np.bincount(inverse, weights=np.asarray(item_counts, dtype=np.float64), minlength=size)
+    quantity = np.bincount(inverse, weights=np.asarray(quantities, dtype=np.float64), minlength=size)
+    weight = np.bincount(inverse, weights=np.asarray(weights, dtype=np.float64), minlength=size)
+
+    group_city = groups % city_count
+    group_material = (groups // city_count) % material_count
+    group_period = (groups // (city_count * material_count)).astype("datetime64[D]").tolist()
+
+    return [
+        ReportRow(
+            period_start=period_start,
+            material_id=unique_materials[material_code],
+            material_type=material_types.get(unique_materials[material_code]),
+            city=unique_cities[city_code] or None,
+            item_count=int(items),
+            quantity=int(units),
+            weight_kg=round(kg, 2),
+        )
+        for period_start, material_code, city_code, items, units, kg in zip(
+            group_period, group_material.tolist(), group_city.tolist(),
+            item_count.tolist(), quantity.tolist(), weight.tolist(),
+        )
+    ]
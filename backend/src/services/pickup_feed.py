@@ -0,0 +1,164 @@
+import asyncio
+import json
+import math
+import os
+from dataclasses import dataclass, field
+
+from src.services.spatial_index import KM_PER_DEGREE, PickupPoint, haversine_km
+
+# Mensagens pendentes por assinante antes de ele ser desconectado por lentidão
+PICKUP_FEED_QUEUE_SIZE = int(os.getenv("PICKUP_FEED_QUEUE_SIZE", "100"))
+# Quantidade máxima de assinantes por worker (0 = sem limite)
+PICKUP_FEED_MAX_SUBSCRIBERS = int(os.getenv("PICKUP_FEED_MAX_SUBSCRIBERS", "10000"))
+
+
+class FeedFull(Exception):
+    """Lançada quando o worker já atingiu PICKUP_FEED_MAX_SUBSCRIBERS"""
+
+
+@dataclass(frozen=True)
+class FeedArea:
+    """Área de interesse do coletor: círculo com pré-filtro por caixa de latitude/longitude"""
+    latitude: float
+    longitude: float
+    radius_km: float
+    min_lat: float = field(init=False)
+    max_lat: float = field(init=False)
+    min_lon: float = field(init=False)
+    max_lon: float = field(init=False)
+
+    def __post_init__(self):
+        lat_delta = self.radius_km / KM_PER_DEGREE
+        cos_lat = max(math.cos(math.radians(self.latitude)), 1e-6)
+        lon_delta = min(180.0, self.radius_km / (KM_PER_DEGREE * cos_lat))
+        object.__setattr__(self, "min_lat", self.latitude - lat_delta)
+        object.__setattr__(self, "max_lat", self.latitude + lat_delta)
+        object.__setattr__(self, "min_lon", self.longitude - lon_delta)
+        object.__setattr__(self, "max_lon", self.longitude + lon_delta)
+
+    def contains(self, point: PickupPoint) -> bool:
+        if not (self.min_lat <= point.latitude <= self.max_lat and self.min_lon <= point.longitude <= self.max_lon):
+            return False
+        return haversine_km(self.latitude, self.longitude, point.latitude, point.longitude) <= self.radius_km
+
+
+class Subscription:
+    """Fila limitada de mensagens já serializadas de um assinante"""
+
+    def __init__(self, user_id: str, area: FeedArea | None, queue_size: int):
+        self.user_id = user_id
+        self.area = area
+        self.queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def offer(self, message: str) -> bool:
+        """Enfileira sem bloquear; retorna False se a fila estiver cheia"""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def close(self):
+        """Acorda o consumidor com o marcador de fim, descartando o que estiver pendente"""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class PickupFeed:
+    """
+    Broadcaster em memória de coletas pendentes recém-criadas
+
+    Cada evento é serializado uma única vez e colocado, sem bloquear, na fila
+    limitada de cada assinante cuja área contém a coleta. Quem publica (a
+    rota que criou a coleta) nunca espera por conexões lentas: se a fila de um
+    assinante enche, ele é desconectado e deve ressincronizar via
+    /collector/nearby_pickups ao reconectar.
+
+    O broadcaster é por processo; com vários workers, as coletas criadas e
+    removidas em outro worker chegam por cluster_events (LISTEN/NOTIFY do
+    PostgreSQL). Sem o PostgreSQL, cada conexão só recebe as coletas do
+    próprio worker.
+    """
+
+    def __init__(self, queue_size: int, max_subscribers: int):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: set[Subscription] = set()
+        self.published = 0
+        self.delivered = 0
+        self.dropped_subscribers = 0
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, user_id: str, area: FeedArea | None = None) -> Subscription:
+        if self.max_subscribers and len(self._subscribers) >= self.max_subscribers:
+            raise FeedFull()
+        subscription = Subscription(user_id, area, self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def _fan_out(self, message: str, targets):
+        for subscription in targets:
+            if subscription.offer(message):
+                self.delivered += 1
+            else:
+                subscription.overflowed = True
+                subscription.close()
+                self._subscribers.discard(subscription)
+                self.dropped_subscribers += 1
+
+    def publish_created(self, points: list[PickupPoint]):
+        """Envia cada coleta nova aos assinantes sem filtro ou cuja área a contém"""
+        if not self._subscribers:
+            return
+        for point in points:
+            message = json.dumps({
+                "type": "pickup_created",
+                "data": {
+                    "id": point.pickup_id,
+                    "address_id": point.address_id,
+                    "city": point.city,
+                    "latitude": point.latitude,
+                    "longitude": point.longitude,
+                    "scheduled_time": point.scheduled_time.isoformat() if point.scheduled_time else None,
+                },
+            })
+            self.published += 1
+            self._fan_out(message, [
+                subscription for subscription in self._subscribers
+                if subscription.area is None or subscription.area.contains(point)
+            ])
+
+    def publish_removed(self, pickup_id: str, status: str):
+        """Avisa que a coleta deixou de estar PENDENTE (aceita por outro coletor ou cancelada)"""
+        if not self._subscribers or status == "PENDENTE":
+            return
+        message = json.dumps({"type": "pickup_removed", "data": {"id": pickup_id, "status": status}})
+        self.published += 1
+        self._fan_out(message, list(self._subscribers))
+
+    def close_all(self):
+        """Desconecta todos os assinantes (encerramento do worker)"""
+        for subscription in list(self._subscribers):
+            subscription.close()
+        self._subscribers.clear()
+
+    def snapshot(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "queue_size": self.queue_size,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped_subscribers": self.dropped_subscribers,
+        }
+
+
+pickup_feed = PickupFeed(PICKUP_FEED_QUEUE_SIZE, PICKUP_FEED_MAX_SUBSCRIBERS)
@@ -0,0 +1,183 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import exists, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import models
+from src.services.pickup_analytics import PickupRollupService
+
+# Estados de origem aceitos por cada transição e o estado de destino
+TRANSITIONS = {
+    "accept": (("PENDENTE",), "ACEITA"),
+    "collect": (("ACEITA",), "COLETADA"),
+    "deliver": (("COLETADA",), "ENTREGUE"),
+    "cancel": (("PENDENTE", "ACEITA"), "CANCELADA"),
+}
+
+# Todos os status possíveis de uma coleta (o inicial e os destinos das transições)
+PICKUP_STATUSES = frozenset({"PENDENTE"} | {target for _, target in TRANSITIONS.values()})
+
+
+class PickupNotFound(Exception):
+    """Lançada quando a coleta não existe"""
+
+
+class TransitionForbidden(Exception):
+    """Lançada quando o usuário não é o produtor ou o coletor responsável pela coleta"""
+
+
+class TransitionConflict(Exception):
+    """Lançada quando a coleta não está em um estado que permite a transição"""
+
+    def __init__(self, action: str, current_status: str):
+        self.action = action
+        self.current_status = current_status
+        super().__init__(f"Transição '{action}' não permitida a partir de {current_status}")
+
+
+@dataclass(frozen=True)
+class TransitionResult:
+    pickup_id: str
+    status: str
+    collection_id: str | None = None
+
+
+class PickupTransitionService:
+    """
+    Máquina de estados do status de PickupRequest
+
+    Cada transição é um compare-and-set em um único comando:
+    UPDATE pickup_requests SET status = :novo WHERE id = :id AND status = :esperado ... RETURNING id.
+    Com vários coletores aceitando a mesma coleta ao mesmo tempo, só um UPDATE
+    encontra a linha no estado esperado; os demais não alteram nada e recebem
+    TransitionConflict, sem leitura prévia nem retentativas. O estado atual só
+    é consultado quando a transição falha, para montar a mensagem de erro.
+    Os totais de pickup_rollups (analytics) são movidos na mesma transação.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _compare_and_set(self, pickup_id: str, action: str, *conditions) -> str | None:
+        """
+        Aplica a transição e retorna o status anterior da coleta, ou None se nada mudou
+
+        Transições com mais de um estado de origem tentam um UPDATE por estado, para
+        saber de qual status a coleta saiu (usado pelos rollups de analytics).
+        """
+        expected, target = TRANSITIONS[action]
+        for source in expected:
+            result = await self.db.execute(
+                update(models.PickupRequest)
+                .where(
+                    models.PickupRequest.id == pickup_id,
+                    models.PickupRequest.status == source,
+                    *conditions
+                )
+                .values(status=target)
+                .returning(models.PickupRequest.id)
+                .execution_options(synchronize_session=False)
+            )
+            if result.scalar_one_or_none() is not None:
+                await PickupRollupService(self.db).move(pickup_id, source)
+                return source
+        return None
+
+    def _collector_owns(self, pickup_id: str, collector_id: str):
+        return exists().where(
+            models.Collection.request_id == pickup_id,
+            models.Collection.collector_id == collector_id,
+            models.Collection.delivered_at.is_(None),
+        )
+
+    async def _fail(self, pickup_id: str, action: str, ownership=None):
+        """Desfaz a transação e lança a exceção que explica por que o compare-and-set falhou"""
+        await self.db.rollback()
+        current_status = (await self.db.execute(
+            select(models.PickupRequest.status).where(models.PickupRequest.id == pickup_id)
+        )).scalar_one_or_none()
+        if current_status is None:
+            raise PickupNotFound()
+
+        expected, _ = TRANSITIONS[action]
+        if current_status in expected and ownership is not None:
+            owns = (await self.db.execute(select(ownership))).scalar()
+            if not owns:
+                raise TransitionForbidden()
+        raise TransitionConflict(action, current_status)
+
+    async def accept(self, pickup_id: str, collector_id: str) -> TransitionResult:
+        """PENDENTE -> ACEITA, criando a Collection do coletor"""
+        if not await self._compare_and_set(pickup_id, "accept"):
+            await self._fail(pickup_id, "accept")
+
+        collection_id = models.generate_uuid()
+        await self.db.execute(insert(models.Collection).values(
+            id=collection_id,
+            request_id=pickup_id,
+            collector_id=collector_id,
+        ))
+        await self.db.commit()
+        return TransitionResult(pickup_id, "ACEITA", collection_id)
+
+    async def collect(self, pickup_id: str, collector_id: str) -> TransitionResult:
+        """ACEITA -> COLETADA, apenas pelo coletor que aceitou"""
+        ownership = self._collector_owns(pickup_id, collector_id)
+        if not await self._compare_and_set(pickup_id, "collect", ownership):
+            await self._fail(pickup_id, "collect", ownership)
+
+        collection_id = (await self.db.execute(
+            update(models.Collection)
+            .where(
+                models.Collection.request_id == pickup_id,
+                models.Collection.collector_id == collector_id,
+                models.Collection.delivered_at.is_(None),
+            )
+            .values(collected_at=datetime.now())
+            .returning(models.Collection.id)
+            .execution_options(synchronize_session=False)
+        )).scalars().first()
+        await self.db.commit()
+        return TransitionResult(pickup_id, "COLETADA", collection_id)
+
+    async def deliver(self, pickup_id: str, collector_id: str, cooperative_id: str) -> TransitionResult:
+        """COLETADA -> ENTREGUE na cooperativa, apenas pelo coletor que aceitou"""
+        ownership = self._collector_owns(pickup_id, collector_id)
+        if not await self._compare_and_set(pickup_id, "deliver", ownership):
+            await self._fail(pickup_id, "deliver", ownership)
+
+        collection_id = (await self.db.execute(
+            update(models.Collection)
+            .where(
+                models.Collection.request_id == pickup_id,
+                models.Collection.collector_id == collector_id,
+                models.Collection.delivered_at.is_(None),
+            )
+            .values(delivered_at=datetime.now(), destination_cooperative_id=cooperative_id)
+            .returning(models.Collection.id)
+            .execution_options(synchronize_session=False)
+        )).scalars().first()
+        await self.db.commit()
+        return TransitionResult(pickup_id, "ENTREGUE", collection_id)
+
+    async def cancel(self, pickup_id: str, producer_id: str) -> TransitionResult:
+        """PENDENTE ou ACEITA -> CANCELADA, apenas pelo produtor da coleta"""
+        ownership = exists().where(
+            models.PickupRequest.id == pickup_id,
+            models.PickupRequest.producer_id == producer_id,
+        )
+        if not await self._compare_and_set(pickup_id, "cancel", models.PickupRequest.producer_id == producer_id):
+            await self._fail(pickup_id, "cancel", ownership)
+
+        await self.db.commit()
+        return TransitionResult(pickup_id, "CANCELADA")
+
+    async def is_cooperative(self, user_id: str) -> bool:
+        result = await self.db.execute(
+            select(models.User.id).where(
+                models.User.id == user_id,
+                models.User.role == "COOPERATIVA",
+            )
+        )
+        return result.scalar_one_or_none() is not None
@@ -0,0 +1,246 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import dbg
+from src.database.dialects import dialect_insert
+from src.models import models
+from src.services.wallet_service import CENT, LedgerEntry, WalletService
+
+# Quantidade máxima de coletas processadas em uma única transação
+REWARD_BATCH_SIZE = int(os.getenv("REWARD_BATCH_SIZE", "200"))
+# Tempo máximo que uma coleta entregue espera na fila antes do lote ser processado
+REWARD_FLUSH_SECONDS = float(os.getenv("REWARD_FLUSH_SECONDS", "1"))
+
+
+async def compute_rewards(session: AsyncSession, collection_ids: list[str]) -> list[tuple[str, str, Decimal]]:
+    """
+    Calcula a recompensa do produtor de cada coleta entregue e ainda não recompensada
+
+    Soma, para cada item da coleta, weight_kg * reward_per_kg + quantity * reward_per_unit
+    do material, em uma única consulta agregada.
+
+    Returns:
+        Lista de (collection_id, producer_id, valor)
+    """
+    item_reward = (
+        func.coalesce(models.PickupRequestItem.weight_kg, 0) * models.RecyclableMaterial.reward_per_kg
+        + func.coalesce(models.PickupRequestItem.quantity, 0) * models.RecyclableMaterial.reward_per_unit
+    )
+    already_rewarded = select(models.Reward.id).where(
+        models.Reward.collection_id == models.Collection.id,
+        models.Reward.user_id == models.PickupRequest.producer_id,
+    ).exists()
+
+    result = await session.execute(
+        select(
+            models.Collection.id,
+            models.PickupRequest.producer_id,
+            func.coalesce(func.sum(item_reward), 0),
+        )
+        .select_from(models.Collection)
+        .join(models.PickupRequest, models.PickupRequest.id == models.Collection.request_id)
+        .outerjoin(models.PickupRequestItem, models.PickupRequestItem.request_id == models.PickupRequest.id)
+        .outerjoin(models.RecyclableMaterial, models.RecyclableMaterial.id == models.PickupRequestItem.material_id)
+        .where(
+            models.Collection.id.in_(collection_ids),
+            models.Collection.delivered_at.is_not(None),
+            models.PickupRequest.producer_id.is_not(None),
+            ~already_rewarded,
+        )
+        .group_by(models.Collection.id, models.PickupRequest.producer_id)
+    )
+    return [
+        (str(collection_id), str(producer_id), Decimal(str(amount)).quantize(CENT))
+        for collection_id, producer_id, amount in result.all()
+    ]
+
+
+async def process_collections(session: AsyncSession, collection_ids: list[str]) -> int:
+    """
+    Gera as recompensas e os créditos em carteira de um lote de coletas entregues
+
+    Tudo acontece em uma transação: um INSERT multi-linha em rewards com
+    ON CONFLICT DO NOTHING e os créditos em lote na carteira apenas das
+    recompensas realmente inseridas. Coletas já recompensadas (inclusive por
+    outro worker ao mesmo tempo) são ignoradas, então reprocessar é seguro.
+
+    Returns:
+        Quantidade de recompensas criadas
+    """
+    collection_ids = list(dict.fromkeys(collection_ids))
+    if not collection_ids:
+        return 0
+
+    rewards = await compute_rewards(session, collection_ids)
+    if not rewards:
+        await session.rollback()
+        return 0
+
+    now = datetime.now()
+    stmt = (
+        dialect_insert(session, models.Reward)
+        .values([
+            {
+                "id": models.generate_uuid(),
+                "user_id": producer_id,
+                "collection_id": collection_id,
+                "amount": amount,
+                "created_at": now,
+            }
+            for collection_id, producer_id, amount in rewards
+        ])
+        .on_conflict_do_nothing(index_elements=["collection_id", "user_id"])
+        .returning(models.Reward.collection_id, models.Reward.user_id, models.Reward.amount)
+    )
+    inserted = (await session.execute(stmt)).all()
+
+    await WalletService(session).credit_many([
+        LedgerEntry(str(user_id), Decimal(str(amount)), "CREDITO", f"Recompensa da coleta {collection_id}")
+        for collection_id, user_id, amount in inserted
+    ], commit=False)
+    await session.commit()
+    return len(inserted)
+
+
+async def pending_collections(
+    session: AsyncSession, limit: int, after: tuple[datetime, str] | None = None
+) -> list[tuple[str, datetime]]:
+    """
+    (id, delivered_at) de coletas entregues que ainda não têm recompensa (usado no reprocessamento)
+
+    Paginado por (delivered_at, id): coletas que não geram recompensa (ex.: sem
+    produtor) continuam pendentes, então o chamador passa a chave da última
+    linha em after para seguir adiante em vez de reler as mesmas.
+    """
+    query = (
+        select(models.Collection.id, models.Collection.delivered_at)
+        .outerjoin(models.Reward, models.Reward.collection_id == models.Collection.id)
+        .where(models.Collection.delivered_at.is_not(None), models.Reward.id.is_(None))
+    )
+    if after:
+        delivered_at, collection_id = after
+        query = query.where(
+            or_(
+                models.Collection.delivered_at > delivered_at,
+                and_(models.Collection.delivered_at == delivered_at, models.Collection.id > collection_id),
+            )
+        )
+    result = await session.execute(
+        query.order_by(models.Collection.delivered_at, models.Collection.id).limit(limit)
+    )
+    return [(str(collection_id), delivered_at) for collection_id, delivered_at in result.all()]
+
+
+class RewardWorker:
+    """
+    Worker em segundo plano que processa recompensas a partir de uma fila
+
+    A entrega de uma coleta só enfileira o collection_id; o worker junta até
+    batch_size IDs (ou o que chegar em flush_seconds) e processa o lote em uma
+    transação. Como o processamento é idempotente, um lote que falhar pode ser
+    refeito depois com `python manage.py rewards-backfill`.
+    """
+
+    def __init__(self, batch_size: int, flush_seconds: float, session_factory=None):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._session_factory = session_factory
+        self._queue: asyncio.Queue[str] | None = None
+        self._task: asyncio.Task | None = None
+        self.enqueued = 0
+        self.processed = 0
+        self.rewarded = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.last_batch_ms = 0.0
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._task = asyncio.create_task(self._run(), name="reward-worker")
+
+    def enqueue(self, collection_ids: list[str]):
+        """Agenda coletas entregues para recompensa (não bloqueia a requisição)"""
+        self._ensure_started()
+        for collection_id in collection_ids:
+            self._queue.put_nowait(collection_id)
+        self.enqueued += len(collection_ids)
+
+    async def _next_batch(self) -> list[str]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.flush_seconds
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def process_batch(self, batch: list[str]) -> int:
+        if self._session_factory is None:
+            from src.database.async_connection import AsyncSessionLocal
+            self._session_factory = AsyncSessionLocal
+
+        start = time.perf_counter()
+        async with self._session_factory() as session:
+            rewarded = await process_collections(session, batch)
+        self.last_batch_ms = (time.perf_counter() - start) * 1000
+        self.batches += 1
+        self.processed += len(batch)
+        self.rewarded += rewarded
+        return rewarded
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self.process_batch(batch)
+            except Exception as error:
+                self.failed_batches += 1
+                dbg.log_error(f"Error: falha ao processar recompensas de {len(batch)} coletas: {error}", exc_info=True)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def drain(self):
+        """Aguarda até que todas as coletas enfileiradas tenham sido processadas"""
+        if self._queue is not None and self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def stop(self):
+        """Processa o que estiver na fila e encerra o worker"""
+        await self.drain()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._queue = None
+
+    def snapshot(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batch_size": self.batch_size,
+            "flush_seconds": self.flush_seconds,
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "rewarded": self.rewarded,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "last_batch_ms": round(self.last_batch_ms, 3),
+        }
+
+
+reward_worker = RewardWorker(REWARD_BATCH_SIZE, REWARD_FLUSH_SECONDS)
@@ -0,0 +1,123 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def distance_matrix_km(coordinates: np.ndarray) -> np.ndarray:
+    """
+    Matriz de distâncias haversine entre todos os pares de pontos
+
+    Args:
+        coordinates: array (n, 2) com latitude e longitude em graus
+
+    Returns:
+        Array (n, n) de distâncias em km
+    """
+    radians = np.radians(coordinates)
+    lat = radians[:, 0][:, None]
+    lon = radians[:, 1][:, None]
+    dlat = lat - lat.T
+    dlon = lon - lon.T
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def path_length(distances: np.ndarray, path: np.ndarray) -> float:
+    return float(distances[path[:-1], path[1:]].sum())
+
+
+def nearest_neighbour_path(distances: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Caminho guloso de start até end visitando todos os outros nós pelo vizinho mais próximo"""
+    n = len(distances)
+    unvisited = np.ones(n, dtype=bool)
+    unvisited[[start, end]] = False
+    path = [start]
+    current = start
+    for _ in range(n - 2):
+        candidates = np.where(unvisited, distances[current], np.inf)
+        current = int(np.argmin(candidates))
+        unvisited[current] = False
+        path.append(current)
+    path.append(end)
+    return np.array(path)
+
+
+def two_opt(distances: np.ndarray, path: np.ndarray, max_iterations: int = 10000) -> np.ndarray:
+    """
+    Melhora um caminho com extremidades fixas pelo 2-opt (best improvement)
+
+    A cada iteração calcula, de forma vetorizada, o ganho de inverter cada
+    segmento path[i..j] (1 <= i < j <= n-2) e aplica a melhor inversão, até
+    não haver melhora.
+    """
+    path = path.copy()
+    n = len(path)
+    if n < 4:
+        return path
+
+    i_idx, j_idx = np.triu_indices(n - 2, k=1)
+    i_idx = i_idx + 1
+    j_idx = j_idx + 1
+
+    for _ in range(max_iterations):
+        edges = distances[path[:-1], path[1:]]
+        a, b = path[i_idx - 1], path[i_idx]
+        c, d = path[j_idx], path[j_idx + 1]
+        delta = distances[a, c] + distances[b, d] - edges[i_idx - 1] - edges[j_idx]
+        best = int(np.argmin(delta))
+        if delta[best] >= -1e-9:
+            break
+        i, j = i_idx[best], j_idx[best]
+        path[i:j + 1] = path[i:j + 1][::-1]
+    return path
+
+
+@dataclass(frozen=True)
+class RoutePlan:
+    order: list[int]            # índices das paradas na ordem de visita
+    leg_km: list[float]         # distância até cada parada (mesma ordem de order)
+    destination_leg_km: float   # distância da última parada até o destino
+    total_km: float
+    nearest_neighbour_km: float
+
+
+def plan_route(
+    stops: np.ndarray,
+    destination: tuple[float, float],
+    start: tuple[float, float] | None = None
+) -> RoutePlan:
+    """
+    Ordena as paradas de uma rota de coleta que termina no destino
+
+    Usa vizinho mais próximo seguido de 2-opt sobre a matriz de distâncias.
+    Sem start, a rota pode começar em qualquer parada: um nó fictício com
+    distância zero para todos faz o papel do ponto de partida.
+
+    Args:
+        stops: array (n, 2) com latitude e longitude das paradas
+        destination: latitude e longitude do destino (cooperativa)
+        start: posição inicial do coletor (opcional)
+    """
+    stops = np.asarray(stops, dtype=float).reshape(-1, 2)
+    n = len(stops)
+    origin = start if start is not None else destination
+    coordinates = np.vstack([np.array([origin], dtype=float), stops, np.array([destination], dtype=float)])
+    distances = distance_matrix_km(coordinates)
+    if start is None:
+        distances[0, :] = 0.0
+        distances[:, 0] = 0.0
+
+    end = n + 1
+    nn_path = nearest_neighbour_path(distances, 0, end)
+    path = two_opt(distances, nn_path)
+
+    legs = distances[path[:-1], path[1:]]
+    return RoutePlan(
+        order=[int(node) - 1 for node in path[1:-1]],
+        leg_km=[float(leg) for leg in legs[:-1]],
+        destination_leg_km=float(legs[-1]),
+        total_km=float(legs.sum()),
+        nearest_neighbour_km=path_length(distances, nn_path),
+    )
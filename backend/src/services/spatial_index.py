@@ -0,0 +1,276 @@
+import asyncio
+import heapq
+import math
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import models
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+# Tamanho da célula da grade em graus (~1,1 km no equador)
+SPATIAL_INDEX_CELL_DEGREES = float(os.getenv("SPATIAL_INDEX_CELL_DEGREES", "0.01"))
+# Intervalo máximo entre recargas completas do índice (cobre mudanças feitas em outros workers)
+SPATIAL_INDEX_REFRESH_SECONDS = float(os.getenv("SPATIAL_INDEX_REFRESH_SECONDS", "300"))
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distância em km entre dois pontos na superfície da Terra"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+@dataclass(frozen=True)
+class PickupPoint:
+    """Coleta pendente posicionada pelas coordenadas do endereço"""
+    pickup_id: str
+    address_id: str
+    latitude: float
+    longitude: float
+    city: str | None
+    scheduled_time: datetime | None
+
+
+class GridSpatialIndex:
+    """
+    Índice espacial em grade regular de latitude/longitude
+
+    Cada ponto fica na célula (floor(lat / cell), floor(lon / cell)). Consultas
+    por raio visitam só as células que cobrem o círculo; k-vizinhos expande
+    anéis de células até que nenhum anel ainda não visitado possa conter um
+    ponto mais próximo que o k-ésimo encontrado. Se um anel tiver mais células
+    que os pontos ainda não visitados (poucos pontos ou muito distantes), a
+    busca troca a expansão por uma ordenação direta de todos os pontos.
+    """
+
+    def __init__(self, cell_degrees: float):
+        self.cell_degrees = cell_degrees
+        self._cells: dict[tuple[int, int], dict[str, PickupPoint]] = {}
+        self._points: dict[str, PickupPoint] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return math.floor(latitude / self.cell_degrees), math.floor(longitude / self.cell_degrees)
+
+    def insert(self, point: PickupPoint):
+        self.remove(point.pickup_id)
+        self._points[point.pickup_id] = point
+        self._cells.setdefault(self._cell(point.latitude, point.longitude), {})[point.pickup_id] = point
+
+    def remove(self, pickup_id: str):
+        point = self._points.pop(pickup_id, None)
+        if point is None:
+            return
+        cell = self._cell(point.latitude, point.longitude)
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.pop(pickup_id, None)
+            if not bucket:
+                del self._cells[cell]
+
+    def _min_cell_km(self, latitude: float, radius_cells: int) -> float:
+        # Largura mínima de uma célula em km perto da latitude consultada (longitude encolhe com cos(lat))
+        edge_latitude = min(89.0, abs(latitude) + (radius_cells + 1) * self.cell_degrees)
+        return self.cell_degrees * KM_PER_DEGREE * math.cos(math.radians(edge_latitude))
+
+    def _ring(self, center: tuple[int, int], ring: int):
+        row, col = center
+        if ring == 0:
+            yield center
+            return
+        for d in range(-ring, ring + 1):
+            yield row - ring, col + d
+            yield row + ring, col + d
+        for d in range(-ring + 1, ring):
+            yield row + d, col - ring
+            yield row + d, col + ring
+
+    def within_radius(self, latitude: float, longitude: float, radius_km: float, limit: int | None = None) -> list[tuple[PickupPoint, float]]:
+        """Pontos a até radius_km do centro, do mais próximo ao mais distante"""
+        lat_cells = math.ceil(radius_km / (self.cell_degrees * KM_PER_DEGREE))
+        lon_cells = math.ceil(radius_km / max(self._min_cell_km(latitude, lat_cells), 1e-9))
+        center_row, center_col = self._cell(latitude, longitude)
+
+        found = []
+        for row in range(center_row - lat_cells, center_row + lat_cells + 1):
+            for col in range(center_col - lon_cells, center_col + lon_cells + 1):
+                for point in self._cells.get((row, col), {}).values():
+                    distance = haversine_km(latitude, longitude, point.latitude, point.longitude)
+                    if distance <= radius_km:
+                        found.append((point, distance))
+
+        found.sort(key=lambda item: item[1])
+        return found[:limit] if limit is not None else found
+
+    def nearest(self, latitude: float, longitude: float, k: int, max_radius_km: float | None = None) -> list[tuple[PickupPoint, float]]:
+        """Os k pontos mais próximos do centro (opcionalmente limitados a max_radius_km)"""
+        if not self._points or k <= 0:
+            return []
+
+        center = self._cell(latitude, longitude)
+        found: list[tuple[PickupPoint, float]] = []
+        visited = 0
+        ring = 0
+
+        while visited < len(self._points):
+            if 8 * ring > len(self._points) - visited:
+                # Anel mais caro que varrer o que falta: evita O(anéis²) para pontos distantes
+                return self._nearest_scan(latitude, longitude, k, max_radius_km)
+            for cell in self._ring(center, ring):
+                bucket = self._cells.get(cell)
+                if not bucket:
+                    continue
+                visited += len(bucket)
+                for point in bucket.values():
+                    distance = haversine_km(latitude, longitude, point.latitude, point.longitude)
+                    if max_radius_km is None or distance <= max_radius_km:
+                        found.append((point, distance))
+
+            # Qualquer ponto de um anel ainda não visitado está a pelo menos ring * célula de distância
+            reach_km = ring * self._min_cell_km(latitude, ring + 1)
+            if max_radius_km is not None and reach_km > max_radius_km:
+                break
+            if len(found) >= k:
+                found.sort(key=lambda item: item[1])
+                found = found[:k]
+                if found[-1][1] <= reach_km:
+                    break
+            ring += 1
+
+        found.sort(key=lambda item: item[1])
+        return found[:k]
+
+    def _nearest_scan(self, latitude: float, longitude: float, k: int, max_radius_km: float | None) -> list[tuple[PickupPoint, float]]:
+        candidates = (
+            (point, haversine_km(latitude, longitude, point.latitude, point.longitude))
+            for point in self._points.values()
+        )
+        if max_radius_km is not None:
+            candidates = (item for item in candidates if item[1] <= max_radius_km)
+        return heapq.nsmallest(k, candidates, key=lambda item: item[1])
+
+
+class PendingPickupIndex:
+    """
+    Índice espacial das coletas PENDENTE, mantido em memória por worker
+
+    Carregado do banco na primeira consulta e atualizado incrementalmente
+    quando coletas são criadas ou mudam de status. Uma recarga completa a cada
+    SPATIAL_INDEX_REFRESH_SECONDS incorpora mudanças feitas por outros workers.
+    """
+
+    def __init__(self, cell_degrees: float, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._cell_degrees = cell_degrees
+        self._grid = GridSpatialIndex(cell_degrees)
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    @staticmethod
+    def _pending_points_query():
+        return (
+            select(
+                models.PickupRequest.id,
+                models.PickupRequest.address_id,
+                models.PickupRequest.scheduled_time,
+                models.Address.latitude,
+                models.Address.longitude,
+                models.Address.city,
+            )
+            .join(models.Address, models.Address.id == models.PickupRequest.address_id)
+            .where(
+                models.PickupRequest.status == "PENDENTE",
+                models.Address.latitude.is_not(None),
+                models.Address.longitude.is_not(None),
+            )
+        )
+
+    @staticmethod
+    def _to_point(row) -> PickupPoint:
+        return PickupPoint(
+            pickup_id=str(row.id),
+            address_id=str(row.address_id),
+            latitude=float(row.latitude),
+            longitude=float(row.longitude),
+            city=row.city,
+            scheduled_time=row.scheduled_time,
+        )
+
+    async def _ensure_loaded(self, session: AsyncSession):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds:
+            return
+        async with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds:
+                return
+            loaded_at = time.monotonic()
+            grid = GridSpatialIndex(self._cell_degrees)
+            result = await session.execute(self._pending_points_query())
+            for row in result:
+                grid.insert(self._to_point(row))
+            self._grid = grid
+            self._loaded_at = loaded_at
+
+    async def nearest(self, session: AsyncSession, latitude: float, longitude: float, k: int, max_radius_km: float | None = None):
+        await self._ensure_loaded(session)
+        return self._grid.nearest(latitude, longitude, k, max_radius_km)
+
+    async def within_radius(self, session: AsyncSession, latitude: float, longitude: float, radius_km: float, limit: int | None = None):
+        await self._ensure_loaded(session)
+        return self._grid.within_radius(latitude, longitude, radius_km, limit)
+
+    async def on_pickups_created(
+        self,
+        session: AsyncSession,
+        pickup_ids: list[str],
+        load_points: bool = False
+    ) -> list[PickupPoint]:
+        """
+        Adiciona coletas recém-criadas ao índice (só se ele já foi carregado)
+
+        Com load_points=True as coletas são consultadas mesmo com o índice
+        vazio, para quem precisar delas (ex.: o feed de coletas).
+
+        Returns:
+            Coletas pendentes com coordenadas (vazio se nada foi consultado)
+        """
+        if not pickup_ids or not (self.loaded or load_points):
+            return []
+        result = await session.execute(
+            self._pending_points_query().where(models.PickupRequest.id.in_(pickup_ids))
+        )
+        points = [self._to_point(row) for row in result]
+        if self.loaded:
+            for point in points:
+                self._grid.insert(point)
+        return points
+
+    def on_status_changed(self, pickup_id: str, status: str):
+        """Remove do índice coletas que deixaram de estar PENDENTE"""
+        if status != "PENDENTE":
+            self._grid.remove(str(pickup_id))
+
+    def snapshot(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "size": len(self._grid),
+            "cell_degrees": self._cell_degrees,
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self.loaded else None,
+        }
+
+
+pending_pickup_index = PendingPickupIndex(SPATIAL_INDEX_CELL_DEGREES, SPATIAL_INDEX_REFRESH_SECONDS)
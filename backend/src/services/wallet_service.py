@@ -0,0 +1,297 @@
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import and_, case, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.dialects import dialect_insert
+from src.models import models
+
+TRANSACTION_TYPES = ("CREDITO", "DEBITO")
+CENT = Decimal("0.01")
+
+# Transações mais novas que isso não entram em checkpoints (podem estar em transações ainda abertas)
+WALLET_CHECKPOINT_LAG_SECONDS = int(os.getenv("WALLET_CHECKPOINT_LAG_SECONDS", "600"))
+
+
+class InsufficientBalance(Exception):
+    """Lançada quando um débito deixaria o saldo negativo"""
+
+
+@dataclass(frozen=True)
+class LedgerEntry:
+    user_id: str
+    amount: Decimal
+    type: str
+    description: str | None = None
+
+
+@dataclass(frozen=True)
+class ReconciliationResult:
+    wallet_id: str
+    balance: Decimal
+    expected_balance: Decimal
+
+    @property
+    def consistent(self) -> bool:
+        return self.balance == self.expected_balance
+
+
+def _signed_amount():
+    return case(
+        (models.WalletTransaction.type == "CREDITO", models.WalletTransaction.amount),
+        else_=-models.WalletTransaction.amount,
+    )
+
+
+class WalletService:
+    """
+    Carteira com saldo mantido incrementalmente sobre um extrato append-only
+
+    Cada transação é gravada em wallet_transactions e aplicada ao saldo com um
+    único UPDATE condicional (balance = balance + delta WHERE balance + delta >= 0),
+    que trava só a linha da carteira até o commit. Leitura de saldo é O(1).
+
+    Checkpoints periódicos guardam o saldo do extrato até um instante, de modo
+    que a reconciliação só precisa somar as transações posteriores.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_wallet(self, user_id: str) -> models.Wallet | None:
+        result = await self.db.execute(select(models.Wallet).where(models.Wallet.user_id == user_id))
+        return result.scalars().first()
+
+    async def ensure_wallets(self, user_ids: set[str]) -> dict[str, str]:
+        """
+        Garante uma carteira por usuário (INSERT ... ON CONFLICT DO NOTHING)
+
+        Returns:
+            Mapa user_id -> wallet_id
+        """
+        if not user_ids:
+            return {}
+        stmt = dialect_insert(self.db, models.Wallet).on_conflict_do_nothing(index_elements=["user_id"])
+        await self.db.execute(stmt, [
+            {"id": models.generate_uuid(), "user_id": user_id, "balance": Decimal("0")}
+            for user_id in user_ids
+        ])
+        result = await self.db.execute(
+            select(models.Wallet.user_id, models.Wallet.id).where(models.Wallet.user_id.in_(user_ids))
+        )
+        return {str(user_id): str(wallet_id) for user_id, wallet_id in result.all()}
+
+    async def apply(self, entry: LedgerEntry, commit: bool = True) -> Decimal:
+        """
+        Aplica uma transação de crédito ou débito e retorna o novo saldo
+
+        Lança InsufficientBalance se for um débito maior que o saldo. Com
+        commit=False a transação do chamador fica intacta e cabe a ele desfazê-la.
+        """
+        if entry.type not in TRANSACTION_TYPES:
+            raise ValueError(f"Tipo de transação inválido: {entry.type}")
+        if entry.amount <= 0:
+            raise ValueError("O valor da transação deve ser positivo")
+
+        wallet_id = (await self.ensure_wallets({entry.user_id}))[entry.user_id]
+        delta = entry.amount if entry.type == "CREDITO" else -entry.amount
+
+        result = await self.db.execute(
+            update(models.Wallet)
+            .where(models.Wallet.id == wallet_id, models.Wallet.balance + delta >= 0)
+            .values(balance=models.Wallet.balance + delta)
+            .returning(models.Wallet.balance)
+        )
+        balance = result.scalar_one_or_none()
+        if balance is None:
+            if commit:
+                await self.db.rollback()
+            raise InsufficientBalance()
+
+        await self.db.execute(insert(models.WalletTransaction).values(
+            id=models.generate_uuid(),
+            wallet_id=wallet_id,
+            amount=entry.amount,
+            type=entry.type,
+            description=entry.description,
+            created_at=datetime.now(),
+        ))
+        if commit:
+            await self.db.commit()
+        return balance
+
+    async def credit_many(self, entries: list[LedgerEntry], commit: bool = True) -> int:
+        """
+        Aplica vários créditos em lote: um INSERT multi-linha no extrato e um UPDATE por carteira
+
+        Returns:
+            Quantidade de transações gravadas
+        """
+        entries = [entry for entry in entries if entry.amount > 0]
+        if not entries:
+            return 0
+        if any(entry.type != "CREDITO" for entry in entries):
+            raise ValueError("credit_many aceita apenas créditos")
+
+        wallet_ids = await self.ensure_wallets({entry.user_id for entry in entries})
+        now = datetime.now()
+
+        deltas: dict[str, Decimal] = {}
+        for entry in entries:
+            wallet_id = wallet_ids[entry.user_id]
+            deltas[wallet_id] = deltas.get(wallet_id, Decimal("0")) + entry.amount
+
+        await self.db.execute(insert(models.WalletTransaction), [
+            {
+                "id": models.generate_uuid(),
+                "wallet_id": wallet_ids[entry.user_id],
+                "amount": entry.amount,
+                "type": "CREDITO",
+                "description": entry.description,
+                "created_at": now,
+            }
+            for entry in entries
+        ])
+        # Ordem fixa de carteiras evita deadlock entre lotes concorrentes
+        for wallet_id in sorted(deltas):
+            await self.db.execute(
+                update(models.Wallet)
+                .where(models.Wallet.id == wallet_id)
+                .values(balance=models.Wallet.balance + deltas[wallet_id])
+            )
+        if commit:
+            await self.db.commit()
+        return len(entries)
+
+    async def get_balance(self, user_id: str) -> Decimal:
+        result = await self.db.execute(select(models.Wallet.balance).where(models.Wallet.user_id == user_id))
+        balance = result.scalar_one_or_none()
+        return balance if balance is not None else Decimal("0")
+
+    async def list_transactions(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: tuple[datetime, str] | None = None
+    ) -> tuple[list[models.WalletTransaction], bool]:
+        """
+        Extrato da carteira do mais recente para o mais antigo, paginado por (created_at, id)
+
+        Returns:
+            Tupla (transações da página, existe próxima página)
+        """
+        stmt = (
+            select(models.WalletTransaction)
+            .join(models.Wallet, models.Wallet.id == models.WalletTransaction.wallet_id)
+            .where(models.Wallet.user_id == user_id)
+        )
+        if cursor:
+            created_at, transaction_id = cursor
+            stmt = stmt.where(or_(
+                models.WalletTransaction.created_at < created_at,
+                and_(
+                    models.WalletTransaction.created_at == created_at,
+                    models.WalletTransaction.id < transaction_id
+                )
+            ))
+        stmt = stmt.order_by(
+            models.WalletTransaction.created_at.desc(), models.WalletTransaction.id.desc()
+        ).limit(limit + 1)
+        transactions = list((await self.db.execute(stmt)).scalars().all())
+        return transactions[:limit], len(transactions) > limit
+
+    def _latest_checkpoints(self):
+        ranked = select(
+            models.WalletCheckpoint.wallet_id,
+            models.WalletCheckpoint.balance,
+            models.WalletCheckpoint.as_of,
+            func.row_number().over(
+                partition_by=models.WalletCheckpoint.wallet_id,
+                order_by=models.WalletCheckpoint.as_of.desc()
+            ).label("position"),
+        ).subquery()
+        return select(ranked.c.wallet_id, ranked.c.balance, ranked.c.as_of).where(ranked.c.position == 1).subquery()
+
+    async def checkpoint(self, lag_seconds: int | None = None) -> int:
+        """
+        Grava um checkpoint para cada carteira com transações desde o último
+
+        O saldo do checkpoint é calculado só a partir do extrato (checkpoint
+        anterior + transações até as_of), nunca a partir de wallet.balance.
+
+        Returns:
+            Quantidade de checkpoints criados
+        """
+        if lag_seconds is None:
+            lag_seconds = WALLET_CHECKPOINT_LAG_SECONDS
+        as_of = datetime.now() - timedelta(seconds=lag_seconds)
+        latest = self._latest_checkpoints()
+
+        result = await self.db.execute(
+            select(
+                models.WalletTransaction.wallet_id,
+                func.coalesce(func.max(latest.c.balance), 0),
+                func.sum(_signed_amount()),
+            )
+            .outerjoin(latest, latest.c.wallet_id == models.WalletTransaction.wallet_id)
+            .where(
+                models.WalletTransaction.created_at <= as_of,
+                or_(latest.c.as_of.is_(None), models.WalletTransaction.created_at > latest.c.as_of),
+            )
+            .group_by(models.WalletTransaction.wallet_id)
+        )
+        rows = [
+            {
+                "id": models.generate_uuid(),
+                "wallet_id": wallet_id,
+                "balance": (Decimal(str(previous)) + Decimal(str(delta))).quantize(CENT),
+                "as_of": as_of,
+                "created_at": datetime.now(),
+            }
+            for wallet_id, previous, delta in result.all()
+        ]
+        if rows:
+            await self.db.execute(insert(models.WalletCheckpoint), rows)
+        await self.db.commit()
+        return len(rows)
+
+    async def reconcile(self) -> list[ReconciliationResult]:
+        """
+        Compara o saldo de cada carteira com o último checkpoint + transações posteriores
+
+        Returns:
+            Apenas as carteiras inconsistentes
+        """
+        latest = self._latest_checkpoints()
+        recent = (
+            select(
+                models.WalletTransaction.wallet_id,
+                func.sum(_signed_amount()).label("delta"),
+            )
+            .outerjoin(latest, latest.c.wallet_id == models.WalletTransaction.wallet_id)
+            .where(or_(latest.c.as_of.is_(None), models.WalletTransaction.created_at > latest.c.as_of))
+            .group_by(models.WalletTransaction.wallet_id)
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(
+                models.Wallet.id,
+                models.Wallet.balance,
+                func.coalesce(latest.c.balance, 0) + func.coalesce(recent.c.delta, 0),
+            )
+            .outerjoin(latest, latest.c.wallet_id == models.Wallet.id)
+            .outerjoin(recent, recent.c.wallet_id == models.Wallet.id)
+        )
+        mismatches = []
+        for wallet_id, balance, expected in result.all():
+            item = ReconciliationResult(
+                str(wallet_id),
+                Decimal(str(balance or 0)).quantize(CENT),
+                Decimal(str(expected or 0)).quantize(CENT),
+            )
+            if not item.consistent:
+                mismatches.append(item)
+        return mismatches
@@ -0,0 +1,35 @@
+import base64
+import binascii
+import uuid
+from datetime import datetime
+
+from fastapi import HTTPException
+
+
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    """
+    Gera um cursor opaco a partir da chave de ordenação (created_at, id)
+
+    Args:
+        created_at: Data de criação do último item da página
+        item_id: ID do último item da página
+
+    Returns:
+        Cursor em base64 url-safe
+    """
+    raw = f"{created_at.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decodifica um cursor gerado por encode_cursor
+    Lança HTTPException 400 se o cursor for inválido
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, item_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), str(uuid.UUID(item_id))
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
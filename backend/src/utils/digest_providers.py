@@ -0,0 +1,38 @@
+import hashlib
+import hmac
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Chave do HMAC; se não for definida, usa a mesma chave dos JWTs
+TOKEN_DIGEST_KEY = os.getenv("TOKEN_DIGEST_KEY") or os.getenv("API_KEY") or ""
+
+# Prefixo que identifica o formato do digest armazenado
+DIGEST_PREFIX = "hmac-sha256$"
+
+
+def digest_token(token: str) -> str:
+    """
+    Gera o digest HMAC-SHA256 de um token de alta entropia (e.g. refresh token JWT)
+
+    Tokens aleatórios longos não precisam de um KDF lento como o bcrypt: o HMAC
+    com chave do servidor impede que um vazamento da tabela users permita
+    validar tokens sem a chave, e custa microssegundos.
+
+    Returns:
+        "hmac-sha256$" seguido do digest em hexadecimal
+    """
+    mac = hmac.new(TOKEN_DIGEST_KEY.encode(), token.encode(), hashlib.sha256)
+    return DIGEST_PREFIX + mac.hexdigest()
+
+
+def verify_token_digest(token: str, stored_digest: str) -> bool:
+    """Compara o digest do token com o armazenado em tempo constante"""
+    return hmac.compare_digest(digest_token(token), stored_digest)
+
+
+def is_legacy_hash(stored_value: str) -> bool:
+    """Indica se o valor armazenado é um hash bcrypt do formato antigo"""
+    return stored_value.startswith("$2")
@@ -1,11 +1,93 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Limites do executor de hashing (bcrypt libera o GIL, então threads paralelizam de verdade)
+HASH_MAX_WORKERS = int(os.getenv("HASH_MAX_WORKERS", "4"))
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", "64"))
+
 
 def generate_hash(text):
     return pwd_context.hash(text)
 
 
 def verify_hash(text, hashed_text):
-    return pwd_context.verify(text, hashed_text)
\ No newline at end of file
+    return pwd_context.verify(text, hashed_text)
+
+
+class HashExecutorBusy(Exception):
+    """Lançada quando a fila do executor de hashing está cheia"""
+
+
+class HashExecutor:
+    """
+    Executor limitado para operações de hash lentas (bcrypt)
+
+    Tira o bcrypt do event loop e limita quantas operações podem estar
+    pendentes ao mesmo tempo. Acima do limite a operação é rejeitada na hora,
+    de forma que uma rajada de logins degrada com erros 503 em vez de
+    congelar o worker inteiro.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hash")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _track(self, fn, *args):
+        with self._lock:
+            self.running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HashExecutorBusy()
+            self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._track, fn, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "running": self.running,
+                "queue_depth": self.pending - self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+hash_executor = HashExecutor(HASH_MAX_WORKERS, HASH_MAX_PENDING)
+
+
+async def generate_hash_async(text):
+    """Versão de generate_hash que roda no executor de hashing"""
+    return await hash_executor.run(generate_hash, text)
+
+
+async def verify_hash_async(text, hashed_text):
+    """Versão de verify_hash que roda no executor de hashing"""
+    return await hash_executor.run(verify_hash, text, hashed_text)
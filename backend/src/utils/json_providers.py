@@ -0,0 +1,73 @@
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional
+    orjson = None
+
+# Usa orjson quando instalado (JSON_USE_ORJSON=false força o json da stdlib)
+JSON_USE_ORJSON = orjson is not None and os.getenv("JSON_USE_ORJSON", "true").strip().lower() in ("1", "true", "yes", "on")
+
+ENVELOPE_PREFIX = b'{"success":true,"errors":null,"data":'
+ENVELOPE_SUFFIX = b"}"
+
+
+def _default(value: Any):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável em JSON: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serializa dados Python (dict, list, datetime, Decimal) para JSON em bytes"""
+    if JSON_USE_ORJSON:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse que serializa com orjson quando disponível"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class EnvelopeSerializer:
+    """
+    Serializa objetos (linhas do ORM) direto para o envelope ReturnTrueData em bytes
+
+    Cada objeto é lido por atributos e validado uma única vez pelo schema e o
+    JSON é gerado pelo pydantic-core, sem criar ReturnTrueData nem passar pela
+    revalidação do response_model e pelo jsonable_encoder do FastAPI.
+
+    Uso:
+        pickups_serializer = EnvelopeSerializer(residue_schema.PickupRequestOut)
+
+        @router.get("/...", response_model=ReturnTrueData[list[PickupRequestOut]])
+        async def endpoint(...):
+            return pickups_serializer.response(rows)  # response_model fica só para a documentação
+    """
+
+    def __init__(self, schema: type, many: bool = True):
+        self._adapter = TypeAdapter(list[schema] if many else schema)
+
+    def render(self, data: Any) -> bytes:
+        validated = self._adapter.validate_python(data, from_attributes=True)
+        return ENVELOPE_PREFIX + self._adapter.dump_json(validated) + ENVELOPE_SUFFIX
+
+    def response(self, data: Any, status_code: int = 200, headers: dict | None = None) -> Response:
+        return Response(
+            content=self.render(data),
+            status_code=status_code,
+            media_type="application/json",
+            headers=headers,
+        )
@@ -1,12 +1,12 @@
 from datetime import datetime, timedelta
 import hashlib
-import logging
+import dbg
 from fastapi import HTTPException
 from jose import JWTError, jwt
 import os
 from dotenv import load_dotenv
 
-from src.utils import hash_providers
+from src.utils import digest_providers
 
 # config
 
@@ -58,15 +58,25 @@ def create_refresh_token(data: dict) -> str:
 
 def hash_token(token: str) -> str:
     """
-    Cria um hash SHA256 do token para armazenamento seguro
+    Cria um digest HMAC-SHA256 do token para armazenamento seguro
     
     Args:
         token: Token JWT em texto plano
         
     Returns:
-        Hash SHA256 do token em hexadecimal
+        Digest HMAC-SHA256 do token (ver digest_providers.digest_token)
     """
-    return hash_providers.generate_hash(token)
+    return digest_providers.digest_token(token)
+
+
+def verify_token_hash(token: str, stored_hash: str) -> bool:
+    """
+    Verifica um token contra o digest armazenado
+
+    Valores no formato bcrypt antigo devem ser verificados com
+    hash_providers.verify_hash (ver digest_providers.is_legacy_hash)
+    """
+    return digest_providers.verify_token_digest(token, stored_hash)
 
 
 
@@ -91,7 +101,7 @@ def verify_access_token(token: str) -> str:
         return user_id
         
     except JWTError as e:
-        logging.error(f"Erro ao verificar access token: {e}")
+        dbg.log_error(f"Erro ao verificar access token: {e}")
         raise HTTPException(status_code=401, detail="Token inválido ou expirado")
 
     return user_id
@@ -118,7 +128,7 @@ def verify_refresh_token(token: str) -> str:
         return user_id
         
     except JWTError as e:
-        logging.error(f"Erro ao verificar refresh token: {e}")
+        dbg.log_error(f"Erro ao verificar refresh token: {e}")
         raise HTTPException(status_code=401, detail="Refresh token inválido ou expirado")
     
 def decode_token(token: str) -> dict:
@@ -128,5 +138,5 @@ def decode_token(token: str) -> dict:
     try:
         return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError as e:
-        logging.error(f"Erro ao decodificar token: {e}")
+        dbg.log_error(f"Erro ao decodificar token: {e}")
         return {}
\ No newline at end of file
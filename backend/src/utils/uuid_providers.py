@@ -0,0 +1,53 @@
+import os
+import threading
+import time
+import uuid
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+_lock = threading.Lock()
+_last_timestamp_ms = 0
+_last_counter = 0
+
+
+def uuid7() -> str:
+    """
+    Gera um UUID versão 7 (RFC 9562) como string
+
+    Os 48 bits iniciais são o instante em milissegundos, então IDs novos são
+    sempre maiores que os antigos e os INSERTs caem no fim do índice B-tree
+    (uuid4 espalha as escritas por todas as páginas). Dentro do mesmo
+    milissegundo, os 12 bits seguintes funcionam como contador, mantendo a
+    ordem de geração no processo; os 62 bits finais são aleatórios.
+    """
+    global _last_timestamp_ms, _last_counter
+
+    timestamp_ms = time.time_ns() // 1_000_000
+    with _lock:
+        if timestamp_ms <= _last_timestamp_ms:
+            timestamp_ms = _last_timestamp_ms
+            counter = _last_counter + 1
+            if counter > 0xFFF:
+                # contador esgotado: avança o timestamp em 1 ms
+                timestamp_ms += 1
+                counter = 0
+        else:
+            counter = int.from_bytes(os.urandom(2), "big") & 0x3FF  # metade baixa: espaço para incrementar
+        _last_timestamp_ms, _last_counter = timestamp_ms, counter
+
+    random_bits = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (timestamp_ms & ((1 << 48) - 1)) << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | random_bits
+    return str(uuid.UUID(int=value))
+
+
+def _canonical_uuid(value: str) -> str:
+    try:
+        return str(uuid.UUID(value))
+    except (ValueError, AttributeError, TypeError):
+        raise ValueError("ID inválido, esperado um UUID")
+
+
+# ID recebido do cliente (path, query ou corpo): valida o formato e normaliza para
+# minúsculas com hífens, evitando erro de conversão na coluna UUID do PostgreSQL
+UUIDStr = Annotated[str, AfterValidator(_canonical_uuid)]
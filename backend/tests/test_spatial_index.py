@@ -0,0 +1,32 @@
+import time
+
+from src.services.spatial_index import GridSpatialIndex, PickupPoint
+
+
+def _point(pickup_id: str, latitude: float, longitude: float) -> PickupPoint:
+    return PickupPoint(pickup_id, "endereco", latitude, longitude, None, None)
+
+
+def test_nearest_single_distant_point_falls_back_to_scan():
+    # Único ponto em (0, 0), a ~4800 km do coletor em Teresina: sem o fallback,
+    # a expansão de anéis visitaria centenas de milhares de anéis
+    index = GridSpatialIndex(0.01)
+    index.insert(_point("longe", 0.0, 0.0))
+
+    begin = time.perf_counter()
+    found = index.nearest(-5.08, -42.8, 20)
+    elapsed = time.perf_counter() - begin
+
+    assert [point.pickup_id for point, _ in found] == ["longe"]
+    assert 4700 < found[0][1] < 4900
+    assert elapsed < 0.1
+
+
+def test_nearest_respects_radius_after_fallback():
+    index = GridSpatialIndex(0.01)
+    index.insert(_point("perto", -5.081, -42.801))
+    index.insert(_point("longe", 0.0, 0.0))
+
+    found = index.nearest(-5.08, -42.8, 20, max_radius_km=50)
+
+    assert [point.pickup_id for point, _ in found] == ["perto"]